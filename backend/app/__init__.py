@@ -1,19 +1,35 @@
 from flask import Flask, request
 from flask_cors import CORS
 from flask_security import Security, SQLAlchemySessionUserDatastore
+from sqlalchemy.engine import make_url
 
 from backend.app.models import db, init_db
+from backend.app.models import data_version  # noqa: F401 注册版本号表及 flush 监听
+from backend.app.models import idempotency_key  # noqa: F401 注册幂等键表
 from backend.app.models.auth_obj.user import User, Role
+from backend.app.utils.compression import Compress
+from backend.app.utils.memory_diagnostics import memory_diagnostics
+from backend.app.utils.profiling import RequestProfiler
+from backend.app.utils.write_coordinator import write_coordinator
 from backend.config.config import AppConfig
 
 
-def create_app():
+def create_app(config_overrides=None):
     app = Flask(__name__)
     app.config.from_object(AppConfig)
+    # 测试 / 压测等场景覆盖默认配置（数据库地址、日志路径等）
+    if config_overrides:
+        app.config.update(config_overrides)
 
     # 启用跨域支持，允许携带 Cookie 或 token
     CORS(app, supports_credentials=True)
 
+    # 响应压缩：须先于其它 after_request 注册，保证在最后一步执行
+    Compress(app)
+
+    # 按需请求剖析：管理员请求带 X-Profile: 1 时采样并保存火焰图
+    RequestProfiler(app)
+
     # 初始化日志
     loggers = setup_logger(app.config)
     app_logger = loggers['app_logger']
@@ -25,13 +41,18 @@ def create_app():
 
     @app.after_request
     def after_request(response):
+        # send_file 等直通响应不能读取响应体
+        data = None if response.direct_passthrough else response.get_json(silent=True)
         app_logger.info(f"Response: {response.status}"
-                        + f" with data: {response.get_json(silent=True)}")
+                        + f" with data: {data}")
         return response
 
     # 初始化数据库（延迟绑定）
     init_db(app)
-    print("Database initialized.")
+    write_coordinator.init_app(app)
+    memory_diagnostics.init_app(app)
+    app_logger.info(f"App initialized | 环境: {app.config['ENV']} | 数据库: {make_url(app.config['SQLALCHEMY_DATABASE_URI'])!r}"
+                    f" | 上传目录: {app.config['UPLOAD_FOLDER']}")
 
     # 初始化 Flask-Security-Too
     security = Security()
@@ -51,9 +72,9 @@ def create_app():
     app.register_blueprint(standard_form)
     app.register_blueprint(admin_bp)
 
-    print("✅ 当前所有 app 路由:")
-    for rule in app.url_map.iter_rules():
-        print("➡", rule)
+    if app.config.get("LOG_URL_MAP"):
+        for rule in app.url_map.iter_rules():
+            app_logger.debug(f"Route: {rule}")
 
     return app
 
@@ -87,6 +108,11 @@ def create_logger(name, filepath, level, max_bytes, backup_count):
     logger.setLevel(level)
     logger.propagate = False
 
+    # 同一进程多次 create_app（测试、脚本）时替换旧的 handler，避免重复输出和文件句柄泄漏
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
     formatter = logging.Formatter(
         '%(asctime)s [%(levelname)s] %(name)s [%(filename)s:%(lineno)d]: %(message)s'
     )
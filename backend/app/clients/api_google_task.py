@@ -1,46 +1,83 @@
 import logging
 import os
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-
 from backend.config.config import GoogleTasksConfig
 
 app_logger = logging.getLogger('app_logger')
 
+# 本进程已加载的凭据（按需刷新），避免每次创建任务都读取 token 文件。
+# 不加锁：并发刷新最多多刷新一次；模块级锁在 gunicorn preload 时会先于 gevent monkey patch 创建
+_credentials = {}
 
-def authenticate_google_tasks():
-    creds = None
+
+def new_http():
+    """
+    Google API 请求使用的 HTTP 传输
+    httplib2 基于标准库 socket，gevent / eventlet monkey patch 后等待响应时自动让出，不阻塞其它请求；
+    测试和基准中可替换为模拟传输（见 build_tasks_service 的 http 参数）
+    """
+    import httplib2
+
+    return httplib2.Http(timeout=GoogleTasksConfig.HTTP_TIMEOUT)
+
+
+def load_credentials():
+    """读取并按需刷新 token，token 不可用时仅在允许交互授权的环境中打开浏览器授权"""
+    # Google 客户端库导入较慢（约 0.2s），只在实际创建任务时导入，不拖慢 worker 启动
+    from google.oauth2.credentials import Credentials
+    from google_auth_httplib2 import Request
+
+    creds = _credentials.get("creds")
     CREDENTIALS_FILE = GoogleTasksConfig.SERVICE_ACCOUNT_FILE
     TOKEN_FILE = GoogleTasksConfig.TOKEN_FILE
     SCOPES = GoogleTasksConfig.SCOPES
 
-    # Ensure the directory for the token file exists
-    os.makedirs(os.path.dirname(TOKEN_FILE), exist_ok=True)
-
     """ 尝试加载存储的 Token """
-    if os.path.exists(TOKEN_FILE):
+    if creds is None and os.path.exists(TOKEN_FILE):
         creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
         app_logger.info("Token loaded.")
 
-    # 令牌过期时自动刷新
+    # 令牌过期时自动刷新（刷新请求同样走 httplib2 传输）
     if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
+        creds.refresh(Request(new_http()))
         app_logger.info("Token refreshed.")
         with open(TOKEN_FILE, "w") as token_file:
             token_file.write(creds.to_json())
 
     """ 使用 OAuth 2.0 认证用户 """
     if not creds or not creds.valid:
+        # 浏览器授权会一直阻塞到用户完成操作，服务进程中不能执行
+        if not GoogleTasksConfig.INTERACTIVE_AUTH:
+            raise RuntimeError(f"Google Tasks token invalid, re-authorize and update {TOKEN_FILE}")
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         app_logger.info("Token invalid. Requesting new token.")
+        os.makedirs(os.path.dirname(TOKEN_FILE), exist_ok=True)
         flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, scopes=SCOPES)
         creds = flow.run_local_server(port=0)
         with open(TOKEN_FILE, "w") as token_file:
             token_file.write(creds.to_json())
 
-    return build("tasks", "v1", credentials=creds)
+    _credentials["creds"] = creds
+    return creds
+
+
+def build_tasks_service(credentials, http=None):
+    """
+    创建 Tasks API 客户端
+    :param http: 底层 HTTP 传输，默认 new_http()；httplib2.Http 不是线程安全的，每个客户端使用独立实例
+    """
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+
+    authorized_http = AuthorizedHttp(credentials, http=http or new_http())
+    client_options = {"api_endpoint": GoogleTasksConfig.API_ENDPOINT} if GoogleTasksConfig.API_ENDPOINT else None
+    return build("tasks", "v1", http=authorized_http, client_options=client_options,
+                 cache_discovery=False, static_discovery=True)
+
+
+def authenticate_google_tasks():
+    return build_tasks_service(load_credentials())
 
 
 def create_google_task(task_body: dict):
@@ -52,7 +89,9 @@ def create_google_task(task_body: dict):
     service = authenticate_google_tasks()
 
     # Create task
-    result = service.tasks().insert(tasklist=GoogleTasksConfig.TASKS_LIST_ID, body=task_body).execute()
+    result = service.tasks().insert(tasklist=GoogleTasksConfig.TASKS_LIST_ID, body=task_body).execute(
+        num_retries=GoogleTasksConfig.NUM_RETRIES
+    )
     app_logger.info(f'Google Task created. Result: {result}')
 
     return result
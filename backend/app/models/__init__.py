@@ -1,7 +1,10 @@
+import os
+
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from sqlalchemy import MetaData
 
+from backend.app.utils.db_utils import configure_engine
+
 
 convention = {
     "ix": "ix_%(column_0_label)s",
@@ -12,9 +15,17 @@ convention = {
 }
 metadata = MetaData(naming_convention=convention)
 db = SQLAlchemy(metadata=metadata)
-migrate = Migrate()  # 不要传 app，先创建空的 migrate 实例
 
 
 def init_db(app):
     db.init_app(app)
-    migrate.init_app(app, db)
+
+    # Flask-Migrate 依赖 alembic（导入约 0.1s），只有 flask 命令行（flask db upgrade 等）需要，
+    # gunicorn worker / 测试 / 脚本启动时不加载
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true" or app.config.get("MIGRATE_ENABLED"):
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    # 引擎在 init_app 时已创建，连接建立前挂载 PRAGMA 等设置
+    with app.app_context():
+        configure_engine(db.engine, app.config)
@@ -3,6 +3,7 @@ import json
 import datetime
 
 from backend.app import db
+from backend.app.utils.write_coordinator import run_write
 
 db_logger = logging.getLogger('db_logger')
 db_logger.propagate = False  # 防止日志消息传播到根日志记录器
@@ -42,12 +43,10 @@ class BaseModel(db.Model):
         return f"<{self.__class__.__name__} {self.to_dict()}>"
 
     def save(self):
-        db.session.add(self)
         try:
-            db.session.commit()
+            run_write(lambda session: session.add(self))
             db_logger.info(f"Data inserted into database: {self}")
             return True
         except Exception as e:
-            db.session.rollback()
             db_logger.error(f"Database insertion failed: {str(e)}")
             return False
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+数据版本号
+每个作用域（某个用户的数据 / 全部角色）维护一个单调递增的版本号，
+在同一事务中随数据修改自动递增，供 ETag 等条件请求使用
+"""
+
+import datetime
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.models import db
+from backend.app.models.basemodel import BaseModel
+
+ROLES_SCOPE = "roles"
+
+
+def user_scope(email: str) -> str:
+    """某个用户的数据（个人信息、表单、订单）对应的作用域"""
+    return f"user:{email}"
+
+
+class DataVersion(BaseModel):
+    __tablename__ = 'data_version'
+
+    scope = db.Column(db.String(160), unique=True, nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+
+def get_versions(scopes):
+    """
+    批量读取版本号
+    :return: dict，scope -> (version, updated_gmt)；从未修改过的作用域不在结果中
+    """
+    table = DataVersion.__table__
+    rows = db.session.execute(
+        select(table.c.scope, table.c.version, table.c.updated_gmt).where(table.c.scope.in_(scopes))
+    ).all()
+    return {row.scope: (row.version, row.updated_gmt) for row in rows}
+
+
+def bump_versions(connection, scopes):
+    """在当前事务中递增版本号（不存在则创建）"""
+    table = DataVersion.__table__
+    now = datetime.datetime.utcnow()
+    dialect = connection.dialect.name
+
+    for scope in sorted(scopes):
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as upsert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as upsert
+            stmt = upsert(table).values(scope=scope, version=1, created_gmt=now, updated_gmt=now)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.scope],
+                set_={"version": table.c.version + 1, "updated_gmt": now},
+            )
+            connection.execute(stmt)
+        else:
+            result = connection.execute(
+                update(table).where(table.c.scope == scope)
+                .values(version=table.c.version + 1, updated_gmt=now)
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(scope=scope, version=1, created_gmt=now, updated_gmt=now))
+
+
+def _changed_scopes(session):
+    from backend.app.models.auth_obj.user import User, Role
+    from backend.app.models.service_obj.standard_form import StandardForm
+
+    scopes = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, (StandardForm, User)):
+            scopes.add(user_scope(obj.email))
+        elif isinstance(obj, Role):
+            scopes.add(ROLES_SCOPE)
+
+    for obj in session.dirty:
+        if not session.is_modified(obj):
+            continue
+        if isinstance(obj, (StandardForm, User)):
+            scopes.add(user_scope(obj.email))
+        elif isinstance(obj, Role):
+            scopes.add(ROLES_SCOPE)
+    return scopes
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions_after_flush(session, flush_context):
+    # after_flush 时 session.new / dirty / deleted 仍是本次 flush 前的状态
+    scopes = _changed_scopes(session)
+    if scopes:
+        bump_versions(session.connection(), scopes)
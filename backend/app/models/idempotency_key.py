@@ -0,0 +1,22 @@
+"""
+幂等键
+客户端通过 Idempotency-Key 请求头标识一次逻辑请求，首次执行的结果保存在此表中，
+过期前重试同一个键直接返回保存的结果（见 backend/app/utils/idempotency_utils.py）
+"""
+
+from backend.app.models import db
+from backend.app.models.basemodel import BaseModel
+
+
+class IdempotencyKey(BaseModel):
+    __tablename__ = 'idempotency_key'
+    # 幂等键按用户隔离，不同用户使用相同的键互不影响
+    __table_args__ = (db.UniqueConstraint('email', 'key'),)
+
+    email = db.Column(db.String(120), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)  # 请求指纹（sha256），同一个键只能用于同一个请求
+    status_code = db.Column(db.Integer)                      # 为空表示首次请求仍在处理中（created_gmt 为占位时间）
+    response_body = db.Column(db.Text)
+    # 处理中为占位租约到期时间（IDEMPOTENCY_LOCK_TIMEOUT），保存结果后为结果保留期限（IDEMPOTENCY_KEY_TTL）
+    expires_at = db.Column(db.DateTime, nullable=False)
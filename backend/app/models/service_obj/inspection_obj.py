@@ -1,48 +1,49 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from backend.app.models.basemodel import BaseModel
 import json
 
+from backend.app.models import db
+from backend.app.models.basemodel import BaseModel
+
 
 class RegisterInfo(BaseModel):
+    """看房预约（inspection 表单的类型化投影，见 backend/app/services/schedule_handler.py）"""
     __tablename__ = 'register_info'
 
-    __field_map__ = {
-        "publisher_id": Column(Integer, nullable=True),
-        "property_add": Column(String(255), nullable=False),
-        "appointment_date": Column(DateTime, nullable=True),
-        "wxid": Column(String(128), nullable=True),
-        "name": Column(String(128), nullable=True),
-        "email": Column(String(128), nullable=True),
-        "phone": Column(String(32), nullable=True),
-        "checklist": Column(Text, nullable=True),
-        "remarks": Column(Text, nullable=True),
-    }
+    standard_form_id = db.Column(db.Integer, db.ForeignKey('standard_form.id', ondelete='CASCADE'),
+                                 unique=True, nullable=False)
+    publisher_id = db.Column(db.Integer, nullable=True)
+    property_add = db.Column(db.String(255), nullable=False)
+    appointment_date = db.Column(db.DateTime, nullable=False, index=True)
+    wxid = db.Column(db.String(128), nullable=True)
+    name = db.Column(db.String(128), nullable=True)
+    email = db.Column(db.String(128), nullable=True)
+    phone = db.Column(db.String(32), nullable=True)
+    checklist = db.Column(db.Text, nullable=True)
+    remarks = db.Column(db.Text, nullable=True)
 
     def __init__(self, data):
-        super().__init__()
-        self.publisher_id = data.get("publisher_id")
-        self.property_add = data.get("address")
-        self.wxid = data.get("wxid", "")
-        self.name = data.get("name")
-        self.email = data.get("email")
-        self.phone = data.get("phone")
-        self.remarks = data.get("remarks", "")
+        super().__init__(**self.columns_from_values(data))
 
+    @staticmethod
+    def columns_from_values(data):
+        """规整后的表单字段（form_schema.NormalizedForm.values）-> 列值"""
         checklist = data.get("checklist")
         if isinstance(checklist, list):
-            self.checklist = json.dumps(checklist)
-        elif isinstance(checklist, str):
-            self.checklist = checklist
-        else:
-            self.checklist = "[]"
+            checklist = json.dumps(checklist, ensure_ascii=False)
+        elif not isinstance(checklist, str):
+            checklist = "[]"
 
-        date_str = data.get("appointmentDate")
-        if date_str:
-            try:
-                self.appointment_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%M")
-            except ValueError:
-                self.appointment_date = None
+        return {
+            "publisher_id": data.get("publisher_id"),
+            "property_add": data.get("address"),
+            # 已由 form_schema 解析为 datetime
+            "appointment_date": data.get("appointmentDate"),
+            "wxid": data.get("wxid", ""),
+            "name": data.get("name"),
+            "email": data.get("email"),
+            "phone": data.get("phone"),
+            "checklist": checklist,
+            "remarks": data.get("remarks", ""),
+        }
 
     def __repr__(self):
         return f"<RegisterInfo {self.to_dict()}>"
@@ -50,6 +51,7 @@ class RegisterInfo(BaseModel):
     def to_dict(self):
         return {
             "id": self.id,
+            "standard_form_id": self.standard_form_id,
             "publisher_id": self.publisher_id,
             "property_add": self.property_add,
             "appointment_date": self.appointment_date.isoformat() if self.appointment_date else None,
@@ -1,6 +1,7 @@
 from enum import Enum
 from backend.app.models import db
 from backend.app.models.basemodel import BaseModel
+from backend.app.utils.compressed_text import CompressedText
 
 
 class FormStatus(Enum):
@@ -57,18 +58,51 @@ class FormType(Enum):
 
 class StandardForm(BaseModel):
     __tablename__ = "standard_form"
+    # 归档后 id 保留在 standard_form_archive：SQLite 默认会复用已删除的最大 rowid，新表单与归档表单 id 冲突，
+    # AUTOINCREMENT 保证 id 不回退（PostgreSQL 序列本身不复用，不受影响）
+    __table_args__ = {"sqlite_autoincrement": True}
 
     email = db.Column(db.String(120), nullable=False)
     form_type = db.Column(db.String(50), nullable=False)  # student / worker
-    form_data = db.Column(db.Text, nullable=False)  # JSON string
-    files = db.Column(db.Text, nullable=True)  # JSON mapping of file keys to paths
+    form_data = db.Column(CompressedText(), nullable=False)  # JSON string（超过阈值压缩存储）
+    files = db.Column(CompressedText(), nullable=True)  # JSON mapping of file keys to paths
     remark = db.Column(db.String(255), nullable=True)  # 可选备注
     status = db.Column(db.String(20), nullable=False, default='pending')  # 表单状态
 
-    def __init__(self, email, form_type, form_data, files=None, remark=None, status='pending'):
+    # 从 form_data 提取的常用筛选字段（映射关系见 form_schema.INDEXED_FIELDS），写入时填充
+    contact_name = db.Column(db.String(128), nullable=True, index=True)
+    contact_phone = db.Column(db.String(32), nullable=True, index=True)
+    address = db.Column(db.String(255), nullable=True, index=True)
+    service_date = db.Column(db.DateTime, nullable=True, index=True)
+
+    def __init__(self, email, form_type, form_data, files=None, remark=None, status='pending', **indexed):
         self.email = email
         self.form_type = form_type
         self.form_data = form_data
         self.files = files
         self.remark = remark
         self.status = status
+        for column, value in indexed.items():
+            setattr(self, column, value)
+
+
+class StandardFormArchive(BaseModel):
+    """
+    已归档表单（见 backend/app/services/archive_handler.py）
+    结束状态且长期未更新的表单按原 id 整行移入此表，standard_form 及其索引只保留活跃数据
+    """
+    __tablename__ = "standard_form_archive"
+
+    email = db.Column(db.String(120), nullable=False, index=True)
+    form_type = db.Column(db.String(50), nullable=False)
+    form_data = db.Column(CompressedText(), nullable=False)
+    files = db.Column(CompressedText(), nullable=True)
+    remark = db.Column(db.String(255), nullable=True)
+    status = db.Column(db.String(20), nullable=False)
+
+    contact_name = db.Column(db.String(128), nullable=True)
+    contact_phone = db.Column(db.String(32), nullable=True)
+    address = db.Column(db.String(255), nullable=True)
+    service_date = db.Column(db.DateTime, nullable=True)
+
+    archived_gmt = db.Column(db.DateTime, server_default=db.func.now())
@@ -1,38 +1,37 @@
-from datetime import datetime
-
-from sqlalchemy import Column, String, Text, DateTime
-
+from backend.app.models import db
 from backend.app.models.basemodel import BaseModel
 
 
 class AirportPickupInfo(BaseModel):
+    """接机预约（airportPickup 表单的类型化投影，见 backend/app/services/schedule_handler.py）"""
     __tablename__ = 'airport_pickup_info'
 
-    __field_map__ = {
-        "wx_name": Column(String(100), nullable=False),
-        "flight_number": Column(String(50), nullable=False),
-        "pickup_time": Column(DateTime, nullable=False),
-        "contact_phone": Column(String(32), nullable=False),
-        "destination": Column(String(255), nullable=False),
-        "luggage_info": Column(Text, nullable=True),
-        "note": Column(Text, nullable=True),
-    }
+    standard_form_id = db.Column(db.Integer, db.ForeignKey('standard_form.id', ondelete='CASCADE'),
+                                 unique=True, nullable=False)
+    wx_name = db.Column(db.String(100), nullable=True)
+    flight_number = db.Column(db.String(50), nullable=False)
+    pickup_time = db.Column(db.DateTime, nullable=False, index=True)
+    contact_phone = db.Column(db.String(32), nullable=True)
+    destination = db.Column(db.String(255), nullable=True)
+    luggage_info = db.Column(db.Text, nullable=True)
+    note = db.Column(db.Text, nullable=True)
 
     def __init__(self, data):
-        super().__init__()
-        self.wx_name = data.get("wx_name")
-        self.flight_number = data.get("flight_number")
-        self.contact_phone = data.get("contact_phone")
-        self.destination = data.get("destination")
-        self.luggage_info = data.get("luggage_info")
-        self.note = data.get("note")
+        super().__init__(**self.columns_from_values(data))
 
-        pickup_time_str = data.get("pickup_time")
-        if pickup_time_str:
-            try:
-                self.pickup_time = datetime.strptime(pickup_time_str, "%Y-%m-%dT%H:%M")
-            except ValueError:
-                self.pickup_time = None
+    @staticmethod
+    def columns_from_values(data):
+        """规整后的表单字段（form_schema.NormalizedForm.values）-> 列值"""
+        return {
+            "wx_name": data.get("wx_name"),
+            "flight_number": data.get("flight_number"),
+            # 已由 form_schema 解析为 datetime
+            "pickup_time": data.get("pickup_time"),
+            "contact_phone": data.get("contact_phone"),
+            "destination": data.get("destination"),
+            "luggage_info": data.get("luggage_info"),
+            "note": data.get("note"),
+        }
 
     def __repr__(self):
         return f"<AirportPickupInfo {self.to_dict()}>"
@@ -40,6 +39,7 @@ class AirportPickupInfo(BaseModel):
     def to_dict(self):
         return {
             "id": self.id,
+            "standard_form_id": self.standard_form_id,
             "wx_name": self.wx_name,
             "flight_number": self.flight_number,
             "pickup_time": self.pickup_time.isoformat() if self.pickup_time else None,
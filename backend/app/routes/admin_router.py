@@ -1,8 +1,10 @@
-from flask import Blueprint, request, jsonify
+import os
+
+from flask import Blueprint, request, jsonify, abort, send_file
 from flask_security import roles_required
 from datetime import datetime, timedelta
 
-from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.models.service_obj.standard_form import StandardForm, StandardFormArchive
 from backend.app.services.admin_handler import (
     force_reset_password,
     get_all_users,
@@ -17,25 +19,45 @@ from backend.app.services.admin_handler import (
     bulk_update_user_roles,
     get_role_hierarchy_tree
 )
+from backend.app.services.archive_handler import FormArchived, find_form, get_active_form, is_archived
+from backend.app.services.form_reader import ADMIN_LIST_COLUMNS, fetch_rows, select_forms, select_forms_with_archive
+from backend.app.services.order_handler import (FILTER_COLUMNS, INDEXED_FILTER_PARAMS, apply_indexed_filters,
+                                                apply_sort)
+from backend.app.services.schedule_handler import PROJECTIONS, get_schedule
+from backend.app.utils.memory_diagnostics import GROUP_BY, TracingNotStarted, memory_diagnostics
 from backend.app.utils.permission_utils import require_permission, require_admin
+from backend.app.utils.profiling import list_profiles, profile_path
+from backend.app.utils.write_coordinator import run_write
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
 @admin_bp.route("/forms", methods=["GET"])
 @roles_required('admin')
 def get_standard_forms():
+    """表单列表，include_archived=1 时同时列出已归档表单（导出完整历史）"""
     email = request.args.get("email", "").strip()
     form_type = request.args.get("form_type", "").strip()
+    include_archived = request.args.get("include_archived") == "1"
 
-    query = StandardForm.query
+    if include_archived:
+        query, columns = select_forms_with_archive(ADMIN_LIST_COLUMNS, FILTER_COLUMNS)
+    else:
+        query, columns = select_forms(ADMIN_LIST_COLUMNS), StandardForm.__table__.c
 
     if email:
-        query = query.filter(StandardForm.email.ilike(f"%{email}%"))
+        query = query.filter(columns.email.ilike(f"%{email}%"))
     if form_type:
-        query = query.filter_by(form_type=form_type)
+        query = query.filter(columns.form_type == form_type)
+
+    # 姓名 / 电话 / 地址 / 服务日期筛选和排序，使用写入时提取的索引列
+    filters = {key: request.args[key].strip() for key in INDEXED_FILTER_PARAMS if request.args.get(key)}
+    try:
+        query = apply_indexed_filters(query, filters, columns)
+        query = apply_sort(query, request.args.get("sort"), columns)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
-    query = query.order_by(StandardForm.created_gmt.desc())
-    results = query.all()
+    results = fetch_rows(query)
 
     data = [
         {
@@ -43,8 +65,13 @@ def get_standard_forms():
             "email": item.email,
             "form_type": item.form_type,
             "status": item.status or 'pending',
+            "contact_name": item.contact_name,
+            "contact_phone": item.contact_phone,
+            "address": item.address,
+            "service_date": item.service_date.isoformat() if item.service_date else None,
             "created_gmt": item.created_gmt.isoformat() if item.created_gmt else None,
-            "updated_gmt": item.updated_gmt.isoformat() if item.updated_gmt else None
+            "updated_gmt": item.updated_gmt.isoformat() if item.updated_gmt else None,
+            "archived": include_archived and bool(item.archived)
         }
         for item in results
     ]
@@ -55,7 +82,9 @@ def get_standard_forms():
 @admin_bp.route("/forms/<int:id>", methods=["GET"])
 @roles_required('admin')
 def get_form_detail(id):
-    form = StandardForm.query.get_or_404(id)
+    form = find_form(id)
+    if form is None:
+        abort(404)
 
     return jsonify({
         "id": form.id,
@@ -65,6 +94,7 @@ def get_form_detail(id):
         "files": form.files,
         "remark": form.remark,
         "status": form.status or 'pending',
+        "archived": is_archived(form),
         "created_gmt": form.created_gmt.isoformat() if form.created_gmt else None,
         "updated_gmt": form.updated_gmt.isoformat() if form.updated_gmt else None
     })
@@ -223,15 +253,21 @@ def update_form_status(form_id):
     if status not in valid_statuses:
         return jsonify({"success": False, "message": "无效的状态值"}), 400
     
-    try:
-        form = StandardForm.query.get_or_404(form_id)
+    def _update_status(session):
+        form = get_active_form(session, form_id)
+        if not form:
+            return False
         form.status = status
         form.updated_gmt = datetime.utcnow()
-        
-        from backend.app import db
-        db.session.commit()
-        
+        return True
+
+    try:
+        if not run_write(_update_status):
+            return jsonify({"success": False, "message": "表单不存在"}), 404
+
         return jsonify({"success": True, "message": "状态更新成功"})
+    except FormArchived as e:
+        return jsonify({"success": False, "message": str(e)}), 409
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
@@ -243,15 +279,21 @@ def update_form_remark(form_id):
     data = request.get_json()
     remark = data.get("remark", "")
     
-    try:
-        form = StandardForm.query.get_or_404(form_id)
+    def _update_remark(session):
+        form = get_active_form(session, form_id)
+        if not form:
+            return False
         form.remark = remark
         form.updated_gmt = datetime.utcnow()
-        
-        from backend.app import db
-        db.session.commit()
-        
+        return True
+
+    try:
+        if not run_write(_update_remark):
+            return jsonify({"success": False, "message": "表单不存在"}), 404
+
         return jsonify({"success": True, "message": "备注更新成功"})
+    except FormArchived as e:
+        return jsonify({"success": False, "message": str(e)}), 409
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
@@ -267,8 +309,8 @@ def get_dashboard_stats():
         users_data = get_all_users()
         total_users = len(users_data)
         
-        # 获取表单统计
-        total_forms = StandardForm.query.count()
+        # 获取表单统计（总数包含已归档表单）
+        total_forms = StandardForm.query.count() + StandardFormArchive.query.count()
         pending_forms = StandardForm.query.filter_by(status='pending').count()
         
         # 获取今日新增
@@ -292,6 +334,38 @@ def get_dashboard_stats():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+@admin_bp.route("/schedule", methods=["GET"])
+@roles_required('admin')
+def get_schedule_api():
+    """
+    按日期范围查询看房 / 接机日程
+    参数: start, end（YYYY-MM-DD，包含 end 当天，默认今天起 7 天），
+         type（inspection / airportPickup，默认全部），status（默认排除已取消）
+    """
+    try:
+        start = datetime.strptime(request.args["start"], "%Y-%m-%d") if request.args.get("start") \
+            else datetime.combine(datetime.now().date(), datetime.min.time())
+        end = datetime.strptime(request.args["end"], "%Y-%m-%d") + timedelta(days=1) if request.args.get("end") \
+            else start + timedelta(days=7)
+    except ValueError:
+        return jsonify({"success": False, "message": "日期格式应为 YYYY-MM-DD"}), 400
+
+    if end <= start or end - start > timedelta(days=366):
+        return jsonify({"success": False, "message": "日期范围无效"}), 400
+
+    form_type = request.args.get("type")
+    if form_type and form_type not in PROJECTIONS:
+        return jsonify({"success": False, "message": "无效的日程类型"}), 400
+
+    items = get_schedule(start, end, form_types=[form_type] if form_type else None,
+                         status=request.args.get("status"))
+    return jsonify({
+        "success": True,
+        "data": items,
+        "range": {"start": start.isoformat(), "end": end.isoformat()},
+    })
+
+
 @admin_bp.route("/roles", methods=["GET"])
 @require_permission('admin')
 def get_roles_list():
@@ -348,4 +422,127 @@ def delete_role_api(role_code):
         result = delete_role(role_code)
         return jsonify(result), 200 if result["success"] else 400
     except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"success": False, "message": str(e)}), 500
+
+@admin_bp.route("/profiles", methods=["GET"])
+@require_permission('admin')
+def list_profiles_api():
+    """最近的请求剖析（管理员请求带 X-Profile: 1 或 ?__profile=1 时生成），参数: limit（默认 50）"""
+    limit = request.args.get("limit", 50, type=int)
+    return jsonify({"success": True, "data": list_profiles(limit)})
+
+
+@admin_bp.route("/profiles/<profile_id>", methods=["GET"])
+@require_permission('admin')
+def download_profile_api(profile_id):
+    """下载剖析文件，参数: format（speedscope / collapsed，默认 speedscope）"""
+    fmt = request.args.get("format", "speedscope")
+    path = profile_path(profile_id, fmt)
+    if path is None:
+        return jsonify({"success": False, "message": "剖析不存在"}), 404
+    mimetype = "application/json" if fmt == "speedscope" else "text/plain"
+    return send_file(path, mimetype=mimetype, as_attachment=True, download_name=os.path.basename(path))
+
+
+def _positive_int(value, name, default=None):
+    """查询参数 / JSON 中的正整数（JSON 中的数字或数字字符串），缺省时返回 default，不合法时抛出 ValueError"""
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{name} 必须为正整数")
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} 必须为正整数")
+    if number <= 0:
+        raise ValueError(f"{name} 必须为正整数")
+    return number
+
+
+def _memory_stat_params(params):
+    """快照统计参数 group_by（lineno / filename / traceback）和 limit"""
+    group_by = params.get("group_by") or "lineno"
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by 只支持 {', '.join(GROUP_BY)}")
+    return group_by, _positive_int(params.get("limit"), "limit", 20)
+
+
+@admin_bp.route("/diagnostics/memory", methods=["GET"])
+@require_permission('admin')
+def memory_status_api():
+    """
+    当前 worker 的内存概况（RSS、tracemalloc、已有快照）
+    参数: objects=1 时统计各 ORM 模型存活实例数（遍历整个堆），dump=1 时写入诊断目录
+    """
+    result = memory_diagnostics.status(include_objects=request.args.get("objects") == "1")
+    if request.args.get("dump") == "1":
+        result["files"] = memory_diagnostics.dump("status", result)
+    return jsonify({"success": True, "data": result})
+
+
+@admin_bp.route("/diagnostics/memory/tracing", methods=["POST", "DELETE"])
+@require_permission('admin')
+def memory_tracing_api():
+    """POST 开始追踪分配（参数: frames，每次分配记录的栈帧数）；DELETE 停止追踪并丢弃快照"""
+    if request.method == "DELETE":
+        memory_diagnostics.stop()
+    else:
+        try:
+            frames = _positive_int((request.get_json(silent=True) or {}).get("frames"), "frames")
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        memory_diagnostics.start(frames)
+    return jsonify({"success": True, "data": memory_diagnostics.status()})
+
+
+@admin_bp.route("/diagnostics/memory/snapshots", methods=["POST"])
+@require_permission('admin')
+def take_memory_snapshot_api():
+    """拍摄快照并返回分配最多的位置，参数: label, group_by, limit, dump（同时写入原始快照）"""
+    data = request.get_json(silent=True) or {}
+    try:
+        group_by, limit = _memory_stat_params(data)
+        meta = memory_diagnostics.take_snapshot(data.get("label"))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except TracingNotStarted as e:
+        return jsonify({"success": False, "message": str(e)}), 409
+
+    result = memory_diagnostics.top(meta["id"], group_by, limit)
+    if data.get("dump"):
+        result["files"] = memory_diagnostics.dump(f"snapshot-{meta['id']}", result, meta["id"])
+    return jsonify({"success": True, "data": result})
+
+
+@admin_bp.route("/diagnostics/memory/snapshots/<snapshot_id>", methods=["GET"])
+@require_permission('admin')
+def memory_snapshot_api(snapshot_id):
+    """已有快照的分配统计，参数: group_by, limit, dump"""
+    try:
+        group_by, limit = _memory_stat_params(request.args)
+        result = memory_diagnostics.top(snapshot_id, group_by, limit)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except LookupError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+
+    if request.args.get("dump") == "1":
+        result["files"] = memory_diagnostics.dump(f"snapshot-{snapshot_id}", result, snapshot_id)
+    return jsonify({"success": True, "data": result})
+
+
+@admin_bp.route("/diagnostics/memory/diff", methods=["GET"])
+@require_permission('admin')
+def memory_diff_api():
+    """两个快照之间的分配变化（按增长量排序），参数: from, to（快照 id）, group_by, limit, dump"""
+    try:
+        group_by, limit = _memory_stat_params(request.args)
+        result = memory_diagnostics.diff(request.args.get("from", ""), request.args.get("to", ""), group_by, limit)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except LookupError as e:
+        return jsonify({"success": False, "message": str(e)}), 404
+
+    if request.args.get("dump") == "1":
+        result["files"] = memory_diagnostics.dump(f"diff-{result['from']['id']}-{result['to']['id']}", result)
+    return jsonify({"success": True, "data": result})
@@ -1,12 +1,14 @@
 # backend/routes/auth.py
 import random
 
-from captcha.image import ImageCaptcha
 from flask import Blueprint, request, jsonify, session, send_file, g
 from flask_security import logout_user
 
+from backend.app.models.data_version import user_scope, ROLES_SCOPE
 from backend.app.services.auth_handler import handle_login, handle_register, handle_update_profile, handle_change_password
 from backend.app.utils.auth_utils import token_required, optional_token
+from backend.app.utils.conditional_utils import conditional
+from backend.app.utils.offload import run_blocking
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api')
 
@@ -33,11 +35,15 @@ def logout():
 # 验证码生成接口
 @auth_bp.route("/captcha", methods=["GET"])
 def get_captcha():
+    # captcha 依赖 Pillow，按需导入
+    from captcha.image import ImageCaptcha
+
     image = ImageCaptcha()
     code = str(random.randint(1000, 9999))
     session["captcha_code"] = code
 
-    image_data = image.generate(code)
+    # 绘制验证码为纯 CPU 计算，协作式 worker 中放到线程池执行
+    image_data = run_blocking(image.generate, code)
     return send_file(image_data, mimetype="image/png")
 
 
@@ -54,8 +60,17 @@ def register():
     return jsonify(result), status
 
 
+def profile_scopes():
+    """个人信息依赖用户本身和角色定义；未登录时不做条件处理"""
+    user = g.current_user
+    if not user:
+        return None
+    return [user_scope(user.email), ROLES_SCOPE]
+
+
 @auth_bp.route("/profile", methods=["GET"])
 @optional_token
+@conditional(profile_scopes)
 def profile():
     user = g.current_user
     if user:
@@ -1,16 +1,28 @@
 import logging
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, request, jsonify, g, current_app
 
+from backend.app.models.data_version import user_scope
 from backend.app.models.service_obj.standard_form import FormType
 from backend.app.services import standard_form_handler, inspection_handler, transfer_handler, order_handler
+from backend.app.services.form_reader import resolve_fields, to_dict
+from backend.app.services.form_schema import NormalizedForm, normalize_request
 from backend.app.utils.auth_utils import token_required
+from backend.app.utils.conditional_utils import conditional
+from backend.app.utils.idempotency_utils import idempotent
+from backend.app.utils.unit_of_work import UnitOfWork
 
 standard_form = Blueprint('standard_form', __name__, url_prefix='/api')
 app_logger = logging.getLogger('app_logger')
 
 
+def current_user_scopes():
+    """当前用户表单/订单数据对应的版本作用域"""
+    return [user_scope(g.current_user.email)]
+
+
 @standard_form.route('/form-submit', methods=['POST'])
 @token_required
+@idempotent
 def standard_submit():
     form_type_str = request.form.get('formType') 
 
@@ -27,26 +39,95 @@ def standard_submit():
         app_logger.info("[SUBMIT] 无上传文件")
 
     try:
-        # 保存数据库记录（每次都创建新记录）
-        action = standard_form_handler.save_form(request)
-
-        # Post-Save Hook：针对部分表单执行额外操作
-        if FormType.is_valid(form_type_str):
-            form_type = FormType.from_str(form_type_str)
-            if form_type == FormType.INSPECTION:
-                inspection_handler.handle(request)
-            elif form_type == FormType.AIRPORT_PICKUP:
-                transfer_handler.handle(request)
-
-        app_logger.info(f"[SUBMIT] 表单处理成功：{action}")
-        return jsonify({'status': 'success', 'action': action})
+        # 按表单类型规整并校验，结果同时用于保存和 post-save hook
+        form = normalize_request(request)
+    except ValueError as e:
+        app_logger.error(f"[SUBMIT] 表单校验失败: {e}")
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        # 表单记录和日程投影在同一个事务中提交；Post-Save Hook（Google 任务）延迟到提交之后执行，
+        # 失败不影响已保存的表单
+        uow = UnitOfWork()
+        action = standard_form_handler.save_form(form, uow)
+        uow.after_commit(run_post_save_hook, form)
+        uow.commit()
     except Exception as e:
         app_logger.exception(f"[SUBMIT] 表单保存失败: {e}")
         return jsonify({'error': 'Server error'}), 500
 
+    if uow.after_commit_errors:
+        app_logger.warning(f"[SUBMIT] 表单已保存，post-save hook 失败: {uow.after_commit_errors}")
+    app_logger.info(f"[SUBMIT] 表单处理成功：{action}")
+    return jsonify({'status': 'success', 'action': action})
+
+
+def run_post_save_hook(form: NormalizedForm) -> str:
+    """针对部分表单执行额外操作（创建 Google 任务），返回执行结果"""
+    if form.form_type == FormType.INSPECTION.value:
+        inspection_handler.handle_data(form.values)
+        return "done"
+    if form.form_type == FormType.AIRPORT_PICKUP.value:
+        transfer_handler.handle_data(form.values)
+        return "done"
+    return "skipped"
+
+
+@standard_form.route('/uploads', methods=['POST'])
+@token_required
+def upload_files():
+    """预上传文件，返回的文件引用可在批量提交中使用"""
+    if not request.files:
+        return jsonify({'error': 'No files uploaded'}), 400
+
+    try:
+        refs = standard_form_handler.save_uploads(request.files, g.current_user.email)
+        app_logger.info(f"[UPLOAD] 上传文件: {list(refs.values())} | 用户邮箱: {g.current_user.email}")
+        return jsonify({'status': 'success', 'files': refs})
+    except Exception as e:
+        app_logger.exception(f"[UPLOAD] 文件保存失败: {e}")
+        return jsonify({'error': 'Server error'}), 500
+
+
+@standard_form.route('/form-submit/batch', methods=['POST'])
+@token_required
+def batch_submit():
+    """
+    批量提交表单（JSON）
+    {"forms": [{"formType": "...", "formData": {...}, "files": {"field": "<文件引用>"}, "remark": "..."}]}
+    """
+    payload = request.get_json(silent=True) or {}
+    forms = payload.get('forms')
+    email = g.current_user.email
+
+    if not isinstance(forms, list) or not forms:
+        return jsonify({'error': 'forms must be a non-empty list'}), 400
+    if len(forms) > current_app.config['BATCH_SUBMIT_MAX']:
+        return jsonify({'error': f"At most {current_app.config['BATCH_SUBMIT_MAX']} forms per batch"}), 400
+
+    app_logger.info(f"[BATCH_SUBMIT] 批量提交 {len(forms)} 个表单 | 用户邮箱: {email}")
+
+    try:
+        results, saved = standard_form_handler.save_forms_batch(email, forms)
+    except Exception as e:
+        app_logger.exception(f"[BATCH_SUBMIT] 批量保存失败: {e}")
+        return jsonify({'error': 'Server error'}), 500
+
+    # Post-Save Hook 延迟到整批提交之后逐个执行，单个失败不影响其它表单
+    for index, form in saved:
+        try:
+            results[index]['hook'] = run_post_save_hook(form)
+        except Exception as e:
+            app_logger.exception(f"[BATCH_SUBMIT] 第 {index} 个表单 post-save hook 失败: {e}")
+            results[index]['hook'] = 'failed'
+
+    app_logger.info(f"[BATCH_SUBMIT] 成功保存 {len(saved)}/{len(forms)} 个表单")
+    return jsonify({'status': 'success' if saved else 'failed', 'results': results}), 200 if saved else 400
+
 
 @standard_form.route('/form-latest', methods=['GET'])
 @token_required
+@conditional(current_user_scopes)
 def get_latest_form():
     form_type = request.args.get('type')
     email = g.current_user.email
@@ -67,6 +148,7 @@ def get_latest_form():
 
 @standard_form.route('/form-query', methods=['GET'])
 @token_required
+@conditional(current_user_scopes)
 def query_forms():
     # 获取查询参数
     form_type = request.args.get('type')
@@ -85,20 +167,15 @@ def query_forms():
         if status:
             query_params['status'] = status
 
-        # 调用 handler 执行查询
-        forms = standard_form_handler.query_forms(query_params)
+        # fields= / view=summary|full：只查询并返回需要的字段
+        fields = resolve_fields(standard_form_handler.QUERY_FIELDS, standard_form_handler.QUERY_SUMMARY_FIELDS,
+                                request.args.get('fields'), request.args.get('view'))
+
+        # 调用 handler 执行查询（用户的完整表单历史，包含已归档表单）
+        forms = standard_form_handler.query_forms(query_params, include_archived=True, fields=fields)
 
         # 转换为前端所需格式
-        result = []
-        for form in forms:
-            result.append({
-                'id': form.id,
-                'formType': form.form_type,
-                # 'status': form.status,
-                'createTime': form.created_gmt.isoformat(),
-                'updateTime': form.updated_gmt.isoformat() if form.updated_gmt else None,
-                'formData': form.form_data
-            })
+        result = [to_dict(form, standard_form_handler.QUERY_FIELDS, fields) for form in forms]
 
         app_logger.info(f"[QUERY] 查询成功，返回 {len(result)} 条记录")
         return jsonify({
@@ -106,6 +183,8 @@ def query_forms():
             'data': result
         })
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app_logger.exception(f"[QUERY] 查询失败: {e}")
         return jsonify({'error': 'Server error'}), 500
@@ -115,6 +194,7 @@ def query_forms():
 
 @standard_form.route('/orders', methods=['GET'])
 @token_required
+@conditional(current_user_scopes)
 def get_orders():
     """获取用户订单列表"""
     try:
@@ -124,6 +204,12 @@ def get_orders():
         status = request.args.get('status')  # all, pending, processing, completed, cancelled
         order_type = request.args.get('type')  # all, inspection, transfer, application, other
         search = request.args.get('search', '').strip()
+        filters = {key: request.args[key].strip() for key in order_handler.INDEXED_FILTER_PARAMS
+                   if request.args.get(key)}
+        sort = request.args.get('sort')
+        # fields= / view=summary|full：只查询并返回需要的字段
+        fields = resolve_fields(order_handler.ORDER_FIELDS, order_handler.ORDER_SUMMARY_FIELDS,
+                                request.args.get('fields'), request.args.get('view'))
         
         email = g.current_user.email
         
@@ -136,7 +222,10 @@ def get_orders():
             per_page=per_page,
             status_filter=status,
             type_filter=order_type,
-            search=search
+            search=search,
+            filters=filters,
+            sort=sort,
+            fields=fields
         )
         
         app_logger.info(f"[ORDERS] 获取成功，返回 {len(result['orders'])} 条订单")
@@ -146,7 +235,9 @@ def get_orders():
             'data': result['orders'],
             'pagination': result['pagination']
         })
-        
+
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         app_logger.exception(f"[ORDERS] 获取订单列表失败: {e}")
         return jsonify({'success': False, 'message': 'Server error'}), 500
@@ -181,6 +272,7 @@ def get_order_detail(order_id):
 
 @standard_form.route('/orders/<int:order_id>/cancel', methods=['POST'])
 @token_required
+@idempotent
 def cancel_order(order_id):
     """取消订单"""
     try:
@@ -208,6 +300,7 @@ def cancel_order(order_id):
 
 @standard_form.route('/orders/stats', methods=['GET'])
 @token_required
+@conditional(current_user_scopes)
 def get_order_stats():
     """获取订单统计数据"""
     try:
@@ -1,8 +1,10 @@
 from flask import current_app
 from flask_security.utils import hash_password
 from flask_security import current_user
+from sqlalchemy.orm import selectinload
 from backend.app.models import db
 from backend.app.models.auth_obj.user import User, Role
+from backend.app.utils.offload import run_blocking
 from backend.app.utils.permission_utils import can_manage_user, check_role_operation_permission
 
 
@@ -10,7 +12,7 @@ def force_reset_password(email, new_password):
     user = current_app.user_datastore.find_user(email=email)
     if not user:
         return {"success": False, "message": "用户不存在"}
-    user.password = hash_password(new_password)
+    user.password = run_blocking(hash_password, new_password)
     db.session.commit()
     return {"success": True, "message": "密码已重置"}
 
@@ -45,7 +47,8 @@ def get_all_users(email_query=None, name_query=None, phone_query=None, wechat_qu
     if role:
         query = query.join(User.roles).filter(Role.code == role)
     
-    users = query.order_by(User.id.asc()).all()
+    # to_dict 会访问 roles，一次性预加载，避免每个用户一条查询
+    users = query.options(selectinload(User.roles)).order_by(User.id.asc()).all()
     result = []
     for user in users:
         user_dict = user.to_dict()
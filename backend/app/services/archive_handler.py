@@ -0,0 +1,123 @@
+"""
+表单归档
+结束状态（已完成 / 已取消 / 已拒绝）且超过 FORM_ARCHIVE_AFTER_DAYS 天未更新的表单，
+按 id 分批整行移入 standard_form_archive（保留原 id，压缩内容按原字节复制），
+同时删除其日程投影。读取透明包含归档表：
+- 按 id 读取详情：find_form 回查归档表
+- 用户订单列表 / 统计、/api/form-query：合并归档表（form_reader.select_forms_with_archive）
+- 管理员列表默认只查 standard_form，include_archived=1 时合并归档表
+归档表只读，修改状态 / 备注时 get_active_form 抛出 FormArchived
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+
+from backend.app.models import db
+from backend.app.models.data_version import bump_versions, user_scope
+from backend.app.models.service_obj.standard_form import StandardForm, StandardFormArchive, FormStatus
+from backend.app.services.schedule_handler import PROJECTIONS
+from backend.app.utils.write_coordinator import run_write
+
+db_logger = logging.getLogger('db_logger')
+
+ARCHIVABLE_STATUSES = (FormStatus.COMPLETED.value, FormStatus.CANCELLED.value, FormStatus.REJECTED.value)
+
+# 两张表共有的列（archived_gmt 由归档表默认值填充）
+_COPIED_COLUMNS = [column.name for column in StandardForm.__table__.columns]
+
+
+def archive_cutoff(days: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+def archive_batch(session, cutoff: datetime, limit: int = 500):
+    """
+    在调用方事务中归档一批表单
+    :return: 本批归档的表单数；0 表示没有可归档的表单
+    """
+    hot = StandardForm.__table__
+    archive = StandardFormArchive.__table__
+
+    rows = session.execute(
+        select(hot.c.id, hot.c.email)
+        .where(hot.c.status.in_(ARCHIVABLE_STATUSES),
+               func.coalesce(hot.c.updated_gmt, hot.c.created_gmt) < cutoff)
+        .order_by(hot.c.id)
+        .limit(limit)
+    ).all()
+    if not rows:
+        return 0
+    ids = [row.id for row in rows]
+
+    session.execute(
+        insert(archive).from_select(
+            _COPIED_COLUMNS + ["archived_gmt"],
+            select(*[hot.c[name] for name in _COPIED_COLUMNS], literal(datetime.utcnow()))
+            .where(hot.c.id.in_(ids)),
+        )
+    )
+    for model, _ in PROJECTIONS.values():
+        session.execute(delete(model).where(model.standard_form_id.in_(ids)))
+    session.execute(delete(hot).where(hot.c.id.in_(ids)))
+
+    # Core 删除不经过 ORM flush，需手动递增版本号，使订单列表的 ETag 失效
+    bump_versions(session.connection(), {user_scope(row.email) for row in rows})
+    return len(ids)
+
+
+def archive_forms(days: int = None, batch_size: int = None, max_batches: int = None):
+    """
+    分批归档，每批一个独立事务，避免长时间持有写锁
+    :return: 归档的表单总数
+    """
+    from flask import current_app
+
+    days = current_app.config["FORM_ARCHIVE_AFTER_DAYS"] if days is None else days
+    batch_size = batch_size or current_app.config["FORM_ARCHIVE_BATCH_SIZE"]
+    cutoff = archive_cutoff(days)
+
+    total, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        archived = run_write(archive_batch, cutoff, batch_size)
+        if not archived:
+            break
+        total += archived
+        batches += 1
+        db_logger.info(f"[ARCHIVE] 已归档 {archived} 条表单（累计 {total}）")
+    return total
+
+
+def find_form(form_id: int, email: str = None):
+    """
+    按 id 读取表单，standard_form 中不存在时回查归档表
+    返回 StandardForm 或 StandardFormArchive（字段相同，可直接用于 form_to_order 等）
+    """
+    for model in (StandardForm, StandardFormArchive):
+        query = db.session.query(model).filter_by(id=form_id)
+        if email is not None:
+            query = query.filter_by(email=email)
+        form = query.first()
+        if form is not None:
+            return form
+    return None
+
+
+class FormArchived(Exception):
+    """表单已归档：归档表只读，不能修改状态 / 备注"""
+
+
+def get_active_form(session, form_id: int):
+    """
+    按 id 读取待修改的表单（只在 standard_form 中查找）
+    不存在返回 None，已归档时抛出 FormArchived
+    """
+    form = session.get(StandardForm, form_id)
+    if form is None and session.get(StandardFormArchive, form_id) is not None:
+        raise FormArchived(f"表单 {form_id} 已归档，不能修改")
+    return form
+
+
+def is_archived(form) -> bool:
+    return isinstance(form, StandardFormArchive)
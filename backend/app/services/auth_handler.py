@@ -1,6 +1,7 @@
 from flask import session, current_app
 from flask_security import verify_password, hash_password, login_user
 from backend.app.models import db
+from backend.app.utils.offload import run_blocking
 
 def handle_login(email, password, code):
     if not email or not password or not code:
@@ -11,7 +12,7 @@ def handle_login(email, password, code):
     session.pop("captcha_code", None)
 
     user = current_app.user_datastore.find_user(email=email)
-    if not user or not verify_password(password, user.password):
+    if not user or not run_blocking(verify_password, password, user.password):
         return {"success": False, "message": "账号或密码错误", "status": 401}
 
     if not user.active:
@@ -53,7 +54,7 @@ def handle_register(email, password, code):
     try:
         user = current_app.user_datastore.create_user(
             email=email,
-            password=hash_password(password),
+            password=run_blocking(hash_password, password),
             active=True
         )
         db.session.flush()  # 确保用户ID被生成
@@ -114,7 +115,7 @@ def handle_change_password(user, current_password, new_password):
     
     try:
         # 验证当前密码
-        if not verify_password(current_password, user.password):
+        if not run_blocking(verify_password, current_password, user.password):
             return {
                 "success": False,
                 "message": "当前密码不正确",
@@ -122,7 +123,7 @@ def handle_change_password(user, current_password, new_password):
             }
         
         # 更新密码
-        user.password = hash_password(new_password)
+        user.password = run_blocking(hash_password, new_password)
         
         # 保存到数据库
         db.session.commit()
@@ -0,0 +1,125 @@
+"""
+表单只读查询
+列表接口只需要少量字段拼成 dict，不需要 ORM 实例（identity map、属性变更跟踪、逐行构造对象）。
+这里用 Core select() 只查询需要的列，结果为 SQLAlchemy Row（基于 tuple，支持 row.email 属性访问），
+可直接交给 form_to_order 等转换函数。筛选 / 排序沿用 order_handler.apply_indexed_filters / apply_sort
+（Select 同样支持 filter / order_by）。写入和需要修改的读取仍使用 ORM
+性能对比见 backend/benchmarks/bench_read_path.py
+"""
+
+from math import ceil
+
+from sqlalchemy import func, literal, select, union_all
+
+from backend.app.models import db
+from backend.app.models.service_obj.standard_form import StandardForm, StandardFormArchive
+
+# 订单列表（form_to_order）
+ORDER_COLUMNS = ('id', 'email', 'form_type', 'form_data', 'files', 'remark', 'status', 'created_gmt', 'updated_gmt')
+# /admin/forms（不含 form_data / files）
+ADMIN_LIST_COLUMNS = ('id', 'email', 'form_type', 'status', 'contact_name', 'contact_phone', 'address',
+                      'service_date', 'created_gmt', 'updated_gmt')
+
+# 列表接口的 view 参数：summary 不返回 form_data / files 等大字段，full 为完整内容（默认）
+VIEWS = ('summary', 'full')
+
+
+def isoformat(value):
+    return value.isoformat() if value else None
+
+
+def resolve_fields(field_specs: dict, summary_fields, fields: str = None, view: str = None):
+    """
+    解析列表接口的 fields= / view= 参数，返回要输出的字段名列表（保持 field_specs 中的顺序）
+    - fields：逗号分隔的字段名，优先于 view；id 总是返回
+    - view：summary 返回 summary_fields，full（默认）返回全部字段
+    :param field_specs: 输出字段名 -> (列名, 转换函数或 None)
+    字段名或 view 不合法时抛出 ValueError
+    """
+    if fields:
+        requested = {name.strip() for name in fields.split(',') if name.strip()}
+        unknown = requested - field_specs.keys()
+        if unknown:
+            raise ValueError(f"Invalid fields: {', '.join(sorted(unknown))}")
+        requested.add('id')
+    elif view in (None, '', 'full'):
+        requested = field_specs.keys()
+    elif view == 'summary':
+        requested = set(summary_fields)
+    else:
+        raise ValueError(f"Invalid view: {view}, expected one of {', '.join(VIEWS)}")
+    return [name for name in field_specs if name in requested]
+
+
+def columns_for(field_specs: dict, fields):
+    """输出字段对应的列（去重，保持顺序），用于 select_forms，只查询需要的列"""
+    return list(dict.fromkeys(field_specs[name][0] for name in fields))
+
+
+def to_dict(row, field_specs: dict, fields=None) -> dict:
+    """按 field_specs 把 Row / ORM 实例转换为输出 dict，fields 默认全部字段"""
+    result = {}
+    for name in fields or field_specs:
+        column, convert = field_specs[name]
+        value = getattr(row, column)
+        result[name] = convert(value) if convert else value
+    return result
+
+
+def select_forms(columns, model=StandardForm):
+    """只查询指定列的 select()，model 为 StandardForm 或 StandardFormArchive"""
+    table = model.__table__
+    return select(*[table.c[name] for name in columns])
+
+
+def select_forms_with_archive(columns, filter_columns=()):
+    """
+    standard_form 与归档表的 UNION ALL（两表列相同），列表 / 统计透明包含已归档表单
+    返回 (select, 列集合)：select 输出 columns 和 archived（是否已归档）；列集合用于外层筛选 / 排序，
+    用到的列需列在 filter_columns 中。外层条件由 SQLite / PostgreSQL 下推到两个分支，各自使用本表的索引
+    """
+    names = list(dict.fromkeys([*columns, *filter_columns]))
+    forms = union_all(*[
+        select_forms(names, model).add_columns(literal(model is StandardFormArchive).label('archived'))
+        for model in (StandardForm, StandardFormArchive)
+    ]).subquery('forms')
+    return select(*[forms.c[name] for name in columns], forms.c.archived), forms.c
+
+
+def fetch_rows(stmt):
+    return db.session.execute(stmt).all()
+
+
+def paginate_rows(stmt, page: int, per_page: int):
+    """
+    分页查询，返回 (rows, pagination)；pagination 字段与 Flask-SQLAlchemy Pagination 一致
+    page / per_page 不合法时按 Flask-SQLAlchemy error_out=False 的规则处理
+    """
+    page = page if page > 0 else 1
+    per_page = per_page if per_page > 0 else 20
+
+    total = db.session.execute(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    ).scalar()
+    rows = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).all()
+    pages = ceil(total / per_page) if total else 0
+    return rows, {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': pages,
+        'has_next': page < pages,
+        'has_prev': page > 1,
+    }
+
+
+def query_form_rows(params: dict, columns, include_archived=False):
+    """按等值条件查询表单（最新在前）；include_archived 时合并归档表"""
+    models = (StandardForm, StandardFormArchive) if include_archived else (StandardForm,)
+    rows = []
+    for model in models:
+        stmt = select_forms(columns, model).filter_by(**params)
+        rows += fetch_rows(stmt.order_by(model.__table__.c.created_gmt.desc()))
+    if include_archived:
+        rows.sort(key=lambda row: row.created_gmt, reverse=True)
+    return rows
@@ -0,0 +1,243 @@
+"""
+表单结构定义
+每种 FormType 声明字段类型（字符串 / 多值 / 日期时间 / 文件）和是否必填，
+模块加载时编译为规整函数，一次完成：
+- 通用处理：单值展开、name[] 保持列表、去掉空字段、去掉 formType / remark
+- 类型转换与校验：日期时间解析、必填字段检查
+规整结果同时供通用存储（StandardForm.form_data）和各类型 handler 使用，每次提交只解析一次
+"""
+
+from datetime import datetime
+
+from werkzeug.datastructures import MultiDict
+
+from backend.app.models.service_obj.standard_form import FormType
+
+STR = "str"
+LIST = "list"
+DATETIME = "datetime"
+FILE = "file"
+
+# 提交时带上但不属于表单内容的字段
+RESERVED_FIELDS = {"formType", "remark"}
+
+
+class FormValidationError(ValueError):
+    """表单内容不合法（缺少必填字段、格式错误等）"""
+
+
+class Field:
+    __slots__ = ("name", "kind", "required", "multiple")
+
+    def __init__(self, name, kind=STR, required=False, multiple=False):
+        self.name = name          # 规整后 values 中使用的字段名
+        self.kind = kind
+        self.required = required
+        # 多值字段（LIST，或 multiple=True 的文件字段）在表单中以 name[] 提交
+        self.multiple = multiple or kind == LIST
+
+    @property
+    def key(self):
+        """表单提交 / 存储时使用的字段名"""
+        return f"{self.name}[]" if self.multiple else self.name
+
+
+FORM_SCHEMAS = {
+    FormType.INSPECTION: [
+        Field("address", required=True),
+        Field("appointmentDate", DATETIME, required=True),
+        Field("checklist", LIST),
+    ],
+    FormType.AIRPORT_PICKUP: [
+        Field("flight_number", required=True),
+        Field("pickup_time", DATETIME, required=True),
+    ],
+    FormType.RENTAL_APPLICATION: [
+        Field("passport", FILE),
+        Field("visa", FILE),
+        Field("bank_statement", FILE, multiple=True),
+        Field("balance_proof", FILE, multiple=True),
+        Field("rental_agreement", FILE, multiple=True),
+        Field("rental_ledger", FILE, multiple=True),
+        Field("pay_slips", FILE, multiple=True),
+        Field("other_files", FILE, multiple=True),
+    ],
+    FormType.COVERLETTER: [],
+    FormType.Test: [],
+}
+
+
+# 常用筛选 / 排序字段：StandardForm 上的索引列 -> 各表单类型 form_data 中对应的字段（JSON path）
+# 写入时提取到索引列，查询时无需加载解析 form_data（见 order_handler.apply_indexed_filters）
+INDEXED_FIELDS = {
+    "contact_name": {
+        FormType.INSPECTION: "name",
+        FormType.AIRPORT_PICKUP: "wx_name",
+        FormType.RENTAL_APPLICATION: "name",
+        FormType.COVERLETTER: "fullName",
+    },
+    "contact_phone": {
+        FormType.INSPECTION: "phone",
+        FormType.AIRPORT_PICKUP: "contact_phone",
+        FormType.RENTAL_APPLICATION: "phone",
+    },
+    "address": {
+        FormType.INSPECTION: "address",
+        FormType.AIRPORT_PICKUP: "destination",
+        FormType.RENTAL_APPLICATION: "preferred_area",
+    },
+    # 看房时间 / 接机时间 / 到澳（入住）日期
+    "service_date": {
+        FormType.INSPECTION: "appointmentDate",
+        FormType.AIRPORT_PICKUP: "pickup_time",
+        FormType.COVERLETTER: "arrivalDate",
+    },
+}
+DATE_COLUMNS = {"service_date"}
+INDEXED_COLUMN_LENGTHS = {"contact_name": 128, "contact_phone": 32, "address": 255}
+
+
+class NormalizedForm:
+    """
+    规整后的表单
+    - data: 存入 StandardForm.form_data 的内容（保持提交时的字段名和字符串格式）
+    - values: 按字段名取值、已完成类型转换的内容（日期时间为 datetime，多值字段为 list），供各类型 handler 使用
+    - files: 文件字段 -> 文件（多值文件字段为列表）
+    """
+    __slots__ = ("form_type", "data", "values", "files", "remark")
+
+    def __init__(self, form_type, data, values, files, remark):
+        self.form_type = form_type
+        self.data = data
+        self.values = values
+        self.files = files
+        self.remark = remark
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and value.strip() == "")
+
+
+def _parse_datetime(name, value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        # 前端 datetime-local 格式：2024-12-01T12:00（也接受带秒的 ISO 8601）
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise FormValidationError(f"Invalid datetime for {name}: {value}")
+
+
+def _iter_lists(raw):
+    """统一遍历 MultiDict（multipart 表单）和普通 dict（JSON），值均为列表"""
+    if isinstance(raw, MultiDict):
+        return raw.lists()
+    return ((key, value if isinstance(value, list) else [value]) for key, value in raw.items())
+
+
+def compile_schema(fields):
+    """将字段声明编译为规整函数 normalizer(raw_fields, raw_files) -> (data, values, files)"""
+    # 字段名和 name[] 都映射到同一个声明，JSON 提交时两种写法都接受
+    specs = {}
+    file_specs = {}
+    for field in fields:
+        target = file_specs if field.kind == FILE else specs
+        target[field.name] = field
+        target[field.key] = field
+    required = [field for field in fields if field.required and field.kind != FILE]
+    required_files = [field for field in fields if field.required and field.kind == FILE]
+
+    def normalizer(raw_fields, raw_files):
+        data, values = {}, {}
+
+        for key, value_list in _iter_lists(raw_fields):
+            if key in RESERVED_FIELDS:
+                continue
+            field = specs.get(key)
+
+            if field is None:
+                # 未声明字段：name[] 保持列表，单值展开
+                value = value_list if key.endswith("[]") or len(value_list) != 1 else value_list[0]
+                if not _is_blank(value):
+                    data[key] = values[key] = value
+            elif field.kind == LIST:
+                data[field.key] = values[field.name] = list(value_list)
+            else:
+                value = value_list[0] if value_list else None
+                if _is_blank(value):
+                    continue
+                data[field.key] = value
+                values[field.name] = _parse_datetime(field.name, value) if field.kind == DATETIME else value
+
+        files = {}
+        for key, file_list in _iter_lists(raw_files or {}):
+            file_list = [file for file in file_list if file]
+            if not file_list:
+                continue
+            field = file_specs.get(key)
+            if field is not None and field.multiple:
+                files[field.key] = file_list
+            else:
+                files[key] = file_list[0]
+
+        missing = [field.key for field in required if field.name not in values]
+        missing += [field.key for field in required_files if field.key not in files]
+        if missing:
+            raise FormValidationError(f"Missing required fields: {', '.join(missing)}")
+
+        return data, values, files
+
+    return normalizer
+
+
+_NORMALIZERS = {form_type.value: compile_schema(fields) for form_type, fields in FORM_SCHEMAS.items()}
+
+
+def _compile_indexed_paths():
+    paths = {form_type.value: [] for form_type in FormType}
+    for column, keys in INDEXED_FIELDS.items():
+        for form_type, key in keys.items():
+            paths[form_type.value].append((column, key))
+    return paths
+
+
+_INDEXED_PATHS = _compile_indexed_paths()
+
+
+def indexed_columns(form_type: str, data: dict) -> dict:
+    """
+    从 form_data（存储格式）提取索引列的值，所有索引列都会出现在结果中（缺失为 None）
+    日期字段解析失败时置空，不影响表单保存
+    """
+    columns = dict.fromkeys(INDEXED_FIELDS)
+    for column, key in _INDEXED_PATHS.get(form_type, ()):
+        value = data.get(key)
+        if not isinstance(value, str) or not value.strip():
+            continue
+        if column in DATE_COLUMNS:
+            try:
+                columns[column] = datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        else:
+            columns[column] = value.strip()[:INDEXED_COLUMN_LENGTHS[column]]
+    return columns
+
+
+def normalize_form(form_type: str, raw_fields, raw_files=None, remark=None) -> NormalizedForm:
+    """
+    按表单类型规整提交内容，不合法时抛出 FormValidationError
+    :param raw_fields: request.form（MultiDict）或 JSON 对象
+    :param raw_files: request.files（MultiDict）或 字段 -> 文件引用 的 dict
+    """
+    normalizer = _NORMALIZERS.get(form_type)
+    if normalizer is None:
+        raise FormValidationError(f"Invalid form type: {form_type}")
+    data, values, files = normalizer(raw_fields, raw_files)
+    return NormalizedForm(form_type, data, values, files, remark)
+
+
+def normalize_request(request) -> NormalizedForm:
+    """规整 multipart 表单请求"""
+    return normalize_form(request.form.get('formType'), request.form, request.files,
+                          remark=request.form.get('remark'))
@@ -1,86 +1,164 @@
 import json
 import logging
+from collections import Counter
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
 
 from backend.app.models import db
-from backend.app.models.service_obj.standard_form import StandardForm, FormType
+from backend.app.models.service_obj.standard_form import StandardForm, StandardFormArchive, FormType
+from backend.app.services.archive_handler import find_form
+from backend.app.services.form_reader import (columns_for, isoformat, paginate_rows, select_forms_with_archive,
+                                              to_dict)
+from backend.app.utils.write_coordinator import run_write
 
 app_logger = logging.getLogger('app_logger')
 
 
-def form_to_order(standard_form: StandardForm) -> Dict[str, Any]:
-    """将StandardForm转换为返回格式，只返回StandardForm实际拥有的字段"""
-    return {
-        # StandardForm的所有字段
-        'id': str(standard_form.id),
-        'email': standard_form.email,
-        'formType': standard_form.form_type,
-        'formData': standard_form.form_data,  # 原始JSON字符串，由前端解析
-        'files': standard_form.files,
-        'remark': standard_form.remark,
-        'status': standard_form.status or 'pending',
-        'createdAt': standard_form.created_gmt.isoformat(),
-        'updatedAt': standard_form.updated_gmt.isoformat() if standard_form.updated_gmt else None
-    }
+# 订单字段 -> (列名, 转换函数)
+ORDER_FIELDS = {
+    'id': ('id', str),
+    'email': ('email', None),
+    'formType': ('form_type', None),
+    'formData': ('form_data', None),  # 原始JSON字符串，由前端解析
+    'files': ('files', None),
+    'remark': ('remark', None),
+    'status': ('status', lambda status: status or 'pending'),
+    'createdAt': ('created_gmt', isoformat),
+    'updatedAt': ('updated_gmt', isoformat),
+}
+# view=summary：列表页只展示类型、状态和时间
+ORDER_SUMMARY_FIELDS = ('id', 'formType', 'status', 'remark', 'createdAt', 'updatedAt')
+
+
+def form_to_order(standard_form, fields=None) -> Dict[str, Any]:
+    """
+    将StandardForm（ORM 实例或 form_reader 查询的 Row）转换为返回格式，只返回StandardForm实际拥有的字段
+    :param fields: 只输出这些字段（见 ORDER_FIELDS），默认全部
+    """
+    return to_dict(standard_form, ORDER_FIELDS, fields)
+
+
+# 可按索引列筛选的查询参数（索引列由 form_schema.INDEXED_FIELDS 在写入时填充）
+INDEXED_FILTER_PARAMS = ('name', 'phone', 'address', 'date_from', 'date_to')
+
+# 排序参数 -> (列名, 是否倒序)
+SORT_OPTIONS = {
+    'created': ('created_gmt', True),
+    'service_date': ('service_date', False),
+    '-service_date': ('service_date', True),
+}
+# 列表筛选 / 排序用到的列（select_forms_with_archive 的 filter_columns）
+FILTER_COLUMNS = ('id', 'email', 'form_type', 'status', 'remark', 'contact_name', 'contact_phone', 'address',
+                  'service_date', 'created_gmt')
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}, expected YYYY-MM-DD")
+
+
+def apply_indexed_filters(query, filters: Dict[str, str], columns=None):
+    """
+    按索引列筛选，不需要加载和解析 form_data
+    - name / phone / address：前缀匹配
+    - date_from / date_to：服务日期（看房 / 接机 / 到澳日期）范围，YYYY-MM-DD，包含 date_to 当天
+    日期格式错误时抛出 ValueError
+    :param columns: 筛选使用的列集合（select_forms_with_archive 返回的列），默认为 standard_form 的列
+    """
+    c = StandardForm.__table__.c if columns is None else columns
+    if filters.get('name'):
+        query = query.filter(c.contact_name.startswith(filters['name'], autoescape=True))
+    if filters.get('phone'):
+        query = query.filter(c.contact_phone.startswith(filters['phone'], autoescape=True))
+    if filters.get('address'):
+        query = query.filter(c.address.startswith(filters['address'], autoescape=True))
+    if filters.get('date_from'):
+        query = query.filter(c.service_date >= _parse_date(filters['date_from']))
+    if filters.get('date_to'):
+        query = query.filter(c.service_date < _parse_date(filters['date_to']) + timedelta(days=1))
+    return query
+
+
+def apply_sort(query, sort: str = None, columns=None):
+    """排序：created（默认，最新在前）/ service_date / -service_date，columns 同 apply_indexed_filters"""
+    c = StandardForm.__table__.c if columns is None else columns
+    # 创建时间相同（批量提交）时按 id 排序，保证分页稳定
+    if not sort or sort == 'created':
+        return query.order_by(c.created_gmt.desc(), c.id.desc())
+    if sort not in SORT_OPTIONS:
+        raise ValueError(f"Invalid sort: {sort}")
+    name, descending = SORT_OPTIONS[sort]
+    # 服务日期相同（或为空）时按创建时间排序
+    return query.order_by(c[name].desc() if descending else c[name].asc(), c.created_gmt.desc(), c.id.desc())
 
 
 def get_user_orders(email: str, page: int = 1, per_page: int = 10, 
                    status_filter: str = None, type_filter: str = None, 
-                   search: str = None) -> Dict[str, Any]:
-    """获取用户订单列表"""
-    
-    # 构建基础查询
-    query = StandardForm.query.filter_by(email=email)
+                   search: str = None, filters: Dict[str, str] = None,
+                   sort: str = None, fields: List[str] = None) -> Dict[str, Any]:
+    """
+    获取用户订单列表（包含已归档订单）
+    :param fields: 输出字段（resolve_fields 的结果），默认全部；只查询这些字段对应的列
+    """
+    fields = fields or list(ORDER_FIELDS)
+    
+    # 构建基础查询（只读 Core 查询，只取输出字段需要的列；合并归档表，订单归档后仍在列表中）
+    query, c = select_forms_with_archive(columns_for(ORDER_FIELDS, fields), FILTER_COLUMNS)
+    query = query.filter(c.email == email)
+
+    # 索引列筛选（姓名 / 电话 / 地址 / 服务日期）
+    if filters:
+        query = apply_indexed_filters(query, filters, c)
     
     # 状态筛选
     if status_filter and status_filter != 'all':
-        query = query.filter(StandardForm.status == status_filter)
+        query = query.filter(c.status == status_filter)
     
     # 类型筛选
     if type_filter and type_filter != 'all':
         if FormType.is_valid(type_filter):
-            query = query.filter(StandardForm.form_type == type_filter)
+            query = query.filter(c.form_type == type_filter)
     
-    # 搜索筛选
+    # 搜索筛选：form_data 压缩存储，无法在 SQL 中匹配，只搜索写入时提取的姓名 / 电话 / 地址和备注
     if search:
         search_pattern = f"%{search}%"
         query = query.filter(
             or_(
-                StandardForm.form_data.like(search_pattern),
-                StandardForm.remark.like(search_pattern)
+                c.contact_name.like(search_pattern),
+                c.contact_phone.like(search_pattern),
+                c.address.like(search_pattern),
+                c.remark.like(search_pattern)
             )
         )
     
-    # 排序：最新的在前
-    query = query.order_by(StandardForm.created_gmt.desc())
+    # 排序：默认最新的在前
+    query = apply_sort(query, sort, c)
     
     # 分页
-    paginated = query.paginate(
-        page=page, 
-        per_page=per_page, 
-        error_out=False
-    )
+    rows, paginated = paginate_rows(query, page, per_page)
     
     # 转换为订单格式
-    orders = [form_to_order(form) for form in paginated.items]
+    orders = [form_to_order(row, fields) for row in rows]
     
     return {
         'orders': orders,
         'pagination': {
             'currentPage': page,
-            'totalPages': paginated.pages,
-            'totalItems': paginated.total,
+            'totalPages': paginated['pages'],
+            'totalItems': paginated['total'],
             'itemsPerPage': per_page,
-            'hasNext': paginated.has_next,
-            'hasPrev': paginated.has_prev
+            'hasNext': paginated['has_next'],
+            'hasPrev': paginated['has_prev']
         }
     }
 
 
 def get_order_by_id(order_id: int, email: str) -> Optional[Dict[str, Any]]:
-    """根据ID获取订单详情"""
-    form = StandardForm.query.filter_by(id=order_id, email=email).first()
+    """根据ID获取订单详情（已归档的订单从归档表读取）"""
+    form = find_form(order_id, email)
     
     if not form:
         return None
@@ -90,54 +168,56 @@ def get_order_by_id(order_id: int, email: str) -> Optional[Dict[str, Any]]:
 
 def cancel_order(order_id: int, email: str) -> bool:
     """取消订单"""
-    form = StandardForm.query.filter_by(id=order_id, email=email).first()
-    
-    if not form:
-        return False
-    
-    # 检查是否可以取消（只有pending和processing状态可以取消）
-    if form.status in ['completed', 'cancelled']:
+    def _cancel(session):
+        form = session.query(StandardForm).filter_by(id=order_id, email=email).first()
+
+        if not form:
+            return False
+
+        # 检查是否可以取消（只有pending和processing状态可以取消）
+        if form.status in ['completed', 'cancelled']:
+            return False
+
+        # 更新状态为cancelled
+        form.status = 'cancelled'
+        return True
+
+    if not run_write(_cancel):
         return False
     
-    # 更新状态为cancelled
-    form.status = 'cancelled'
-    db.session.commit()
-    
     app_logger.info(f"[CANCEL_ORDER] 订单已取消 | 订单ID: {order_id} | 用户: {email}")
     
     return True
 
 
 def get_order_stats(email: str) -> Dict[str, Any]:
-    """获取用户订单统计数据"""
-    
-    # 基础统计查询
-    base_query = StandardForm.query.filter_by(email=email)
-    
-    # 总订单数
-    total_orders = base_query.count()
-    
-    # 各状态订单数
-    completed_orders = base_query.filter(StandardForm.status == 'completed').count()
-    pending_orders = base_query.filter(StandardForm.status == 'pending').count()
-    processing_orders = base_query.filter(StandardForm.status == 'processing').count()
-    cancelled_orders = base_query.filter(StandardForm.status == 'cancelled').count()
-    
-    # 按类型统计
-    type_stats = {}
-    # 使用枚举获取所有有效的表单类型
-    for form_type_enum in FormType:
-        form_type = form_type_enum.value
-        count = base_query.filter(StandardForm.form_type == form_type).count()
-        if count > 0:
-            type_stats[form_type] = count
+    """获取用户订单统计数据（包含已归档订单）"""
+    
+    # 每张表一次按 状态 × 类型 分组计数
+    status_counts, type_counts = Counter(), Counter()
+    for model in (StandardForm, StandardFormArchive):
+        rows = db.session.execute(
+            select(model.status, model.form_type, func.count())
+            .where(model.email == email)
+            .group_by(model.status, model.form_type)
+        ).all()
+        for status, form_type, count in rows:
+            status_counts[status] += count
+            type_counts[form_type] += count
+    
+    # 按类型统计（只统计有效的表单类型）
+    type_stats = {
+        form_type.value: type_counts[form_type.value]
+        for form_type in FormType
+        if type_counts[form_type.value] > 0
+    }
     
     return {
-        'totalOrders': total_orders,
-        'completedOrders': completed_orders,
-        'pendingOrders': pending_orders,
-        'processingOrders': processing_orders,
-        'cancelledOrders': cancelled_orders,
+        'totalOrders': sum(status_counts.values()),
+        'completedOrders': status_counts['completed'],
+        'pendingOrders': status_counts['pending'],
+        'processingOrders': status_counts['processing'],
+        'cancelledOrders': status_counts['cancelled'],
         'totalSpent': 0,  # 目前不涉及金额
         'typeStats': type_stats
     }
@@ -145,24 +225,28 @@ def get_order_stats(email: str) -> Dict[str, Any]:
 
 def update_order_status(order_id: int, status: str, email: str = None) -> bool:
     """更新订单状态（主要供管理员使用）"""
-    query = StandardForm.query.filter_by(id=order_id)
-    
-    # 如果指定了email，则只能更新该用户的订单
-    if email:
-        query = query.filter_by(email=email)
-    
-    form = query.first()
-    
-    if not form:
-        return False
-    
     # 验证状态值
     valid_statuses = ['pending', 'processing', 'completed', 'cancelled']
     if status not in valid_statuses:
         return False
-    
-    form.status = status
-    db.session.commit()
+
+    def _update(session):
+        query = session.query(StandardForm).filter_by(id=order_id)
+
+        # 如果指定了email，则只能更新该用户的订单
+        if email:
+            query = query.filter_by(email=email)
+
+        form = query.first()
+
+        if not form:
+            return False
+
+        form.status = status
+        return True
+
+    if not run_write(_update):
+        return False
     
     app_logger.info(f"[UPDATE_ORDER_STATUS] 订单状态已更新 | 订单ID: {order_id} | 新状态: {status}")
     
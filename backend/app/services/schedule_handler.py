@@ -0,0 +1,117 @@
+"""
+预约日程
+inspection / airportPickup 表单保存时，在同一事务中把已规整的字段投影到类型化的
+register_info / airport_pickup_info 表（appointment_date / pickup_time 带索引），
+运营可以按日期范围查询即将进行的看房和接机；历史表单可通过 project_pending 回填
+"""
+
+import json
+import logging
+
+from sqlalchemy import delete, insert, select
+
+from backend.app.models import db
+from backend.app.models.service_obj.inspection_obj import RegisterInfo
+from backend.app.models.service_obj.standard_form import StandardForm, FormType, FormStatus
+from backend.app.models.service_obj.transfer_obj import AirportPickupInfo
+from backend.app.services.form_schema import normalize_form
+
+db_logger = logging.getLogger('db_logger')
+
+# 表单类型 -> (投影模型, 日程时间列)
+PROJECTIONS = {
+    FormType.INSPECTION.value: (RegisterInfo, RegisterInfo.appointment_date),
+    FormType.AIRPORT_PICKUP.value: (AirportPickupInfo, AirportPickupInfo.pickup_time),
+}
+
+
+def project_forms(session, forms, replace=False):
+    """
+    在调用方事务中写入投影
+    :param forms: [(standard_form_id, form_type, values)]，values 为 NormalizedForm.values
+    :param replace: 表单内容被更新时为 True，先删除旧投影
+    """
+    rows_by_model = {}
+    for form_id, form_type, values in forms:
+        projection = PROJECTIONS.get(form_type)
+        if projection is None:
+            continue
+        model = projection[0]
+        row = model.columns_from_values(values)
+        row["standard_form_id"] = form_id
+        rows_by_model.setdefault(model, []).append(row)
+
+    for model, rows in rows_by_model.items():
+        if replace:
+            form_ids = [row["standard_form_id"] for row in rows]
+            session.execute(delete(model).where(model.standard_form_id.in_(form_ids)))
+        session.execute(insert(model), rows)
+
+
+def project_pending(session, after_id=0, limit=500):
+    """
+    回填尚未投影的历史表单（按 id 递增，每次最多 limit 条）
+    form_data 不满足当前表单结构（缺少必填字段 / 日期格式错误）的表单跳过
+    :return: (last_id, projected, skipped)；last_id 为 None 表示已处理完
+    """
+    forms = []
+    for form_type, (model, _) in PROJECTIONS.items():
+        projected = select(model.standard_form_id).where(model.standard_form_id == StandardForm.id).exists()
+        forms += session.execute(
+            select(StandardForm.id, StandardForm.form_type, StandardForm.form_data)
+            .where(StandardForm.form_type == form_type, StandardForm.id > after_id, ~projected)
+            .order_by(StandardForm.id)
+            .limit(limit)
+        ).all()
+
+    # 两种类型各取 limit 条后合并，只处理整体 id 最小的 limit 条，保证游标不跳过数据
+    forms = sorted(forms, key=lambda form: form.id)[:limit]
+    if not forms:
+        return None, 0, 0
+
+    pending, skipped = [], 0
+    for form in forms:
+        try:
+            values = normalize_form(form.form_type, json.loads(form.form_data)).values
+        except ValueError as e:
+            db_logger.warning(f"[SCHEDULE] 表单 {form.id} 无法投影，跳过: {e}")
+            skipped += 1
+            continue
+        pending.append((form.id, form.form_type, values))
+
+    project_forms(session, pending)
+    return forms[-1].id, len(pending), skipped
+
+
+def get_schedule(start, end, form_types=None, status=None):
+    """
+    查询 [start, end) 时间范围内的预约，按时间排序
+    :param form_types: 表单类型列表，默认全部
+    :param status: 表单状态；默认排除已取消的表单
+    """
+    items = []
+    for form_type in form_types or PROJECTIONS.keys():
+        model, time_column = PROJECTIONS[form_type]
+        query = (
+            select(model, StandardForm.email, StandardForm.status)
+            .join(StandardForm, StandardForm.id == model.standard_form_id)
+            .where(time_column >= start, time_column < end)
+            .order_by(time_column)
+        )
+        if status:
+            query = query.where(StandardForm.status == status)
+        else:
+            query = query.where(StandardForm.status != FormStatus.CANCELLED.value)
+
+        for projection, email, form_status in db.session.execute(query):
+            items.append((getattr(projection, time_column.key), {
+                "form_id": projection.standard_form_id,
+                "form_type": form_type,
+                "time": getattr(projection, time_column.key).isoformat(),
+                "user_email": email,
+                "status": form_status,
+                "details": projection.to_dict(),
+            }))
+
+    items.sort(key=lambda item: item[0])
+    return [item for _, item in items]
@@ -1,14 +1,19 @@
 import hashlib
 import json
 import os
+import uuid
 
-from flask import g
+from flask import g, current_app
+from sqlalchemy import insert
 from werkzeug.utils import secure_filename
 
-from backend.app.models import db
-from backend.app.models.service_obj.standard_form import StandardForm, FormType
-from backend.config.config import UploadConfig
-
+from backend.app.models.data_version import bump_versions, user_scope
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.services.form_reader import columns_for, isoformat, query_form_rows
+from backend.app.services.form_schema import NormalizedForm, normalize_form, indexed_columns
+from backend.app.services.schedule_handler import project_forms
+from backend.app.utils.unit_of_work import UnitOfWork
+from backend.app.utils.write_coordinator import run_write
 
 def email_to_folder(email: str) -> str:
     """将 email 转为哈希值目录"""
@@ -17,118 +22,224 @@ def email_to_folder(email: str) -> str:
     return hash_value[:16]  # 取前16位作为目录名
 
 
+def user_upload_folder(email: str) -> str:
+    """用户上传文件所在目录"""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], email_to_folder(email))
+
+
 def handle_file_uploads(file_dict: dict, folder: str) -> dict:
-    """保存上传文件，返回字段 -> 路径映射"""
+    """保存上传文件，返回字段 -> 路径映射（多值文件字段为路径列表）"""
     os.makedirs(folder, exist_ok=True)
     saved = {}
 
+    def _save(file):
+        filename = secure_filename(file.filename)
+        path = os.path.join(folder, filename)
+        file.save(path)
+        return path
+
     for field, file in file_dict.items():
-        if file and file.filename:
-            filename = secure_filename(file.filename)
-            path = os.path.join(folder, filename)
-            file.save(path)
-            saved[field] = path
+        if isinstance(file, list):
+            paths = [_save(f) for f in file if f and f.filename]
+            if paths:
+                saved[field] = paths
+        elif file and file.filename:
+            saved[field] = _save(file)
 
     return saved
 
 
-def save_form(request) -> str:
-    """保存表单数据（每次都创建新记录）"""
-    email = g.current_user.email
-    form_type = request.form.get('formType')
-    remark = request.form.get('remark')
+def remove_uploaded_files(saved: dict):
+    """删除 handle_file_uploads 保存的文件（表单未能入库时的补偿）"""
+    for paths in saved.values():
+        for path in paths if isinstance(paths, list) else [paths]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
-    if not email or not form_type:
-        raise ValueError("Missing email or formType")
 
-    # 校验表单类型
-    if FormType.is_valid(form_type) is False:
-        raise ValueError("Invalid form type: {}".format(form_type))
+def _add_form(session, record: StandardForm, form: NormalizedForm):
+    session.add(record)
+    session.flush()
+    # 同一事务中写入类型化投影（看房 / 接机日程）
+    project_forms(session, [(record.id, form.form_type, form.values)])
 
-    # 处理字段
-    form_data = request.form.to_dict(flat=False)
-    for key, value in form_data.items():
-        if not key.endswith("[]") and isinstance(value, list) and len(value) == 1:
-            form_data[key] = value[0]
-    form_data.pop('formType', None)
-    form_data.pop('remark', None)
 
-    # 处理文件上传
-    folder = os.path.join(UploadConfig.UPLOAD_FOLDER, email_to_folder(email))
-    new_files = handle_file_uploads(request.files, folder)
+def save_form(form: NormalizedForm, uow: UnitOfWork = None) -> str:
+    """
+    保存已规整的表单（每次都创建新记录）
+    传入 uow 时只暂存写入，由调用方 uow.commit() 统一提交；否则立即提交
+    """
+    email = g.current_user.email
+    if not email:
+        raise ValueError("Missing email")
 
-    # 处理空字段: 移除不保存
-    for key in list(form_data.keys()):
-        value = form_data[key]
-        if value is None or (isinstance(value, str) and value.strip() == ""):
-            form_data.pop(key)
+    # 处理文件上传（事务失败时删除）
+    new_files = handle_file_uploads(form.files, user_upload_folder(email))
 
     # 直接创建新记录
-    form = StandardForm(
+    record = StandardForm(
         email=email,
-        form_type=form_type,
-        form_data=json.dumps(form_data, ensure_ascii=False),
+        form_type=form.form_type,
+        form_data=json.dumps(form.data, ensure_ascii=False),
         files=json.dumps(new_files, ensure_ascii=False),
-        remark=remark,
+        remark=form.remark,
+        **indexed_columns(form.form_type, form.data),
     )
-    db.session.add(form)
-    db.session.commit()
+
+    own_uow = uow is None
+    uow = uow or UnitOfWork()
+    uow.stage(_add_form, record, form)
+    uow.on_rollback(remove_uploaded_files, new_files)
+    if own_uow:
+        uow.commit()
     return "created"
 
 
-def save_or_update_form(request) -> str:
+def save_or_update_form(form: NormalizedForm) -> str:
+    """保存已规整的表单（同一用户同一类型只保留一条记录）"""
     email = g.current_user.email
-    form_type = request.form.get('formType')
-    remark = request.form.get('remark')
+    if not email:
+        raise ValueError("Missing email")
 
-    if not email or not form_type:
-        raise ValueError("Missing email or formType")
+    # 处理文件上传
+    new_files = handle_file_uploads(form.files, user_upload_folder(email))
+    form_data = json.dumps(form.data, ensure_ascii=False)
+    indexed = indexed_columns(form.form_type, form.data)
 
-    # 校验表单类型
-    if FormType.is_valid(form_type) is False:
-        raise ValueError("Invalid form type: {}".format(form_type))
+    def _save_or_update(session):
+        # 查询是否已有记录
+        record = session.query(StandardForm).filter_by(email=email, form_type=form.form_type).first()
 
-    # 处理字段
-    form_data = request.form.to_dict(flat=False)
-    for key, value in form_data.items():
-        if not key.endswith("[]") and isinstance(value, list) and len(value) == 1:
-            form_data[key] = value[0]
-    form_data.pop('formType', None)
-    form_data.pop('remark', None)
+        if record:
+            # 合并旧文件路径（只替换新提交字段）
+            old_files = json.loads(record.files or "{}")
+            merged_files = {**old_files, **new_files}
+            record.form_data = form_data
+            record.files = json.dumps(merged_files, ensure_ascii=False)
+            record.remark = form.remark
+            for column, value in indexed.items():
+                setattr(record, column, value)
+            project_forms(session, [(record.id, form.form_type, form.values)], replace=True)
+            return "updated"
+        else:
+            record = StandardForm(
+                email=email,
+                form_type=form.form_type,
+                form_data=form_data,
+                files=json.dumps(new_files, ensure_ascii=False),
+                remark=form.remark,
+                **indexed,
+            )
+            session.add(record)
+            session.flush()
+            project_forms(session, [(record.id, form.form_type, form.values)])
+            return "created"
 
-    # 处理文件上传
-    folder = os.path.join(UploadConfig.UPLOAD_FOLDER, email_to_folder(email))
-    new_files = handle_file_uploads(request.files, folder)
-
-    # 处理空字段: 移除不保存
-    for key in list(form_data.keys()):
-        value = form_data[key]
-        if value is None or (isinstance(value, str) and value.strip() == ""):
-            form_data.pop(key)
-
-    # 查询是否已有记录
-    form = StandardForm.query.filter_by(email=email, form_type=form_type).first()
-
-    if form:
-        # 合并旧文件路径（只替换新提交字段）
-        old_files = json.loads(form.files or "{}")
-        merged_files = {**old_files, **new_files}
-        form.form_data = json.dumps(form_data, ensure_ascii=False)
-        form.files = json.dumps(merged_files, ensure_ascii=False)
-        form.remark = remark
-        db.session.commit()
-        return "updated"
-    else:
-        form = StandardForm(
-            email=email,
-            form_type=form_type,
-            form_data=json.dumps(form_data, ensure_ascii=False),
-            files=json.dumps(new_files, ensure_ascii=False),
-            remark=remark,
-        )
-        db.session.add(form)
-        db.session.commit()
-        return "created"
+    return run_write(_save_or_update)
+
+
+def save_uploads(file_dict: dict, email: str) -> dict:
+    """
+    预上传文件（供批量提交引用）
+    文件名加随机前缀避免互相覆盖，返回字段 -> 文件引用（用户目录下的文件名）
+    """
+    folder = user_upload_folder(email)
+    os.makedirs(folder, exist_ok=True)
+    refs = {}
+
+    for field, file in file_dict.items():
+        if file and file.filename:
+            filename = f"{uuid.uuid4().hex[:8]}_{secure_filename(file.filename)}"
+            file.save(os.path.join(folder, filename))
+            refs[field] = filename
+
+    return refs
+
+
+def resolve_upload_ref(email: str, ref: str) -> str | None:
+    """将文件引用解析为用户目录下的实际路径，不存在或越界时返回 None"""
+    if not isinstance(ref, str) or not ref:
+        return None
+    folder = os.path.realpath(user_upload_folder(email))
+    path = os.path.realpath(os.path.join(folder, ref))
+    if os.path.dirname(path) != folder or not os.path.isfile(path):
+        return None
+    return path
+
+
+def normalize_batch_item(email: str, item) -> NormalizedForm:
+    """校验并规整批量提交中的单个表单，文件引用解析为实际路径，非法时抛出 ValueError"""
+    if not isinstance(item, dict):
+        raise ValueError("Form item must be an object")
+
+    form_data = item.get('formData') or {}
+    if not isinstance(form_data, dict):
+        raise ValueError("formData must be an object")
+
+    form = normalize_form(item.get('formType'), form_data, item.get('files') or {}, remark=item.get('remark'))
+
+    files = {}
+    for field, ref in form.files.items():
+        refs = ref if isinstance(ref, list) else [ref]
+        paths = [resolve_upload_ref(email, r) for r in refs]
+        if None in paths:
+            raise ValueError(f"Unknown file reference for {field}: {ref}")
+        files[field] = paths if isinstance(ref, list) else paths[0]
+    form.files = files
+    return form
+
+
+def save_forms_batch(email: str, items: list):
+    """
+    批量保存表单：逐个校验，合法的表单在同一事务中批量插入
+    :return: (results, saved)
+        results: 与 items 一一对应的结果列表
+        saved: [(index, NormalizedForm)]，供调用方在提交后执行 post-save hook
+    """
+    results = [None] * len(items)
+    valid = []
+
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, normalize_batch_item(email, item)))
+        except ValueError as e:
+            results[index] = {'index': index, 'status': 'invalid', 'error': str(e)}
+
+    if not valid:
+        return results, []
+
+    rows = [
+        {
+            'email': email,
+            'form_type': form.form_type,
+            'form_data': json.dumps(form.data, ensure_ascii=False),
+            'files': json.dumps(form.files, ensure_ascii=False),
+            'remark': form.remark,
+            'status': 'pending',
+            **indexed_columns(form.form_type, form.data),
+        }
+        for _, form in valid
+    ]
+
+    def _bulk_insert(session):
+        ids = session.scalars(
+            insert(StandardForm).returning(StandardForm.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        project_forms(session, [(form_id, form.form_type, form.values) for (_, form), form_id in zip(valid, ids)])
+        # 批量插入不经过 ORM flush，需要手动递增数据版本号
+        bump_versions(session.connection(), {user_scope(email)})
+        return ids
+
+    ids = run_write(_bulk_insert)
+
+    saved = []
+    for (index, form), form_id in zip(valid, ids):
+        results[index] = {'index': index, 'status': 'created', 'id': form_id}
+        saved.append((index, form))
+    return results, saved
 
 
 def get_latest_form(form_type: str, email: str) -> StandardForm | None:
@@ -149,7 +260,20 @@ def get_latest_form(form_type: str, email: str) -> StandardForm | None:
     )
 
 
-def query_forms(params):
-    """根据条件查询表单"""
-    query = StandardForm.query.filter_by(**params)
-    return query.order_by(StandardForm.created_gmt.desc()).all()
+# /api/form-query 输出字段 -> (列名, 转换函数)
+QUERY_FIELDS = {
+    'id': ('id', None),
+    'formType': ('form_type', None),
+    'createTime': ('created_gmt', isoformat),
+    'updateTime': ('updated_gmt', isoformat),
+    'formData': ('form_data', None),
+}
+QUERY_SUMMARY_FIELDS = ('id', 'formType', 'createTime', 'updateTime')
+
+
+def query_forms(params, include_archived=False, fields=None):
+    """
+    根据条件查询表单（只读，返回只含 fields 所需列的 Row，fields 默认为 QUERY_FIELDS 全部字段）
+    需要完整历史时（/api/form-query）设置 include_archived，结果包含已归档表单
+    """
+    return query_form_rows(params, columns_for(QUERY_FIELDS, fields or list(QUERY_FIELDS)), include_archived)
@@ -4,20 +4,27 @@ from datetime import datetime, timezone
 from flask import jsonify
 
 from backend.app.clients.api_google_task import create_google_task
+from backend.app.models.service_obj.standard_form import FormType
 from backend.app.models.service_obj.transfer_obj import AirportPickupInfo
+from backend.app.services.form_schema import normalize_form
 
 app_logger = logging.getLogger('app_logger')
 
 
 def handle(req):
-    data = req.form.to_dict()
+    form = normalize_form(FormType.AIRPORT_PICKUP.value, req.form, req.files)
+    handle_data(form.values)
 
+    return jsonify({"success": True, "message": "Task created successfully"}), 200
+
+
+def handle_data(data: dict):
+    """根据规整后的表单字段（见 form_schema.NormalizedForm.values）创建 Google 任务"""
+    # 预约信息已在保存表单时投影入库（schedule_handler），这里只用于生成任务内容
     pickup_info = AirportPickupInfo(data=data)
-    pickup_info.save()
 
     create_google_task(create_task_body(pickup_info))
-
-    return jsonify({"success": True, "message": "Task created successfully"}), 200
+    return pickup_info
 
 
 def reload_record():
@@ -0,0 +1,95 @@
+"""
+压缩文本列
+CompressedText 在 Python 侧表现为普通字符串，写入数据库时超过阈值的内容用 zlib 压缩存储：
+- 压缩格式：MAGIC + 字典编号（1 字节）+ zlib 数据，压缩时使用预置字典（zdict），
+  表单 JSON 中反复出现的字段名 / 常见片段直接引用字典，小文本也能获得较好的压缩率
+- 未压缩内容按 UTF-8 存储；JSON 文本不会以 \\x00 开头，因此两种格式可以共存，
+  读取时按前缀区分，历史数据无需一次性改写（见 backend/scripts/compress_form_data.py）
+预置字典一经发布不可修改（否则已压缩的数据无法解压），需要调整时新增编号
+"""
+
+import zlib
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+MAGIC = b"\x00Z"
+
+# 字典 1：表单字段名（见 frontend/pages/service/*.html）及常见取值片段；
+# zlib 优先引用靠近字典末尾的内容，越常见的片段放得越靠后
+_ZDICT_V1 = (
+    '"rentalContactName[]": ["", "rentalContactRelation[]": ["", "rentalContactPhone[]": ["", '
+    '"rentalContactEmail[]": ["", "supervisor_name[]": ["", "supervisor_position[]": ["", '
+    '"supervisor_phone[]": ["", "supervisor_email[]": ["", "companyAddress[]": ["", "workStart[]": ["", '
+    '"workEnd[]": ["", "onboardDate[]": ["", "referee_name_1": "", "referee_phone_1": "", '
+    '"referee_email_1": "", "referee_relation_1": "", "referee_name_2": "", "referee_phone_2": "", '
+    '"referee_email_2": "", "referee_relation_2": "", "emergency_name": "", "emergency_relation": "", '
+    '"emergency_phone": "", "emergency_email": "", "other_files_notes": "", "additional_info": "", '
+    '"familySupportWorker": "", "personalStrength": "", "allowRentIncrease": "", "rentIncreaseMin": "", '
+    '"rentIncreaseMax": "", "payRentAdvance": "", "upfrontMonths": "", "studiedInAus": "", '
+    '"depositAUD": "", "depositCNY": "", "petOption": "", "smokeOption": "", "visaType": "", '
+    '"arrivalDate": "", "stayUntil": "", "fullName": "", "assets": "", "description": "", '
+    '"permission": "", "income_type": "", "weekly_income": "", "preferred_area": "", '
+    '"lease_length": "", "requirements": "", "room_type": "", "budget": "", "has_pets": "", '
+    '"has_car": "", "is_smoker": "", "uniName": "", "major": "", '
+    '"companyName[]": ["", "jobPosition[]": ["", "income[]": ["", "rentalAddress[]": ["", '
+    '"rentalType[]": ["", "rentalNote[]": ["", "rentalStart[]": ["", "rentalEnd[]": ["", '
+    '"rentalPrice[]": ["", "wx_name": "", "flight_number": "", "pickup_time": "", "contact_phone": "", '
+    '"destination": "", "luggage_info": "", "note": "", "wxid": "", "checklist[]": ["", '
+    '"appointmentDate": "", "address": "", "name": "", "email": "", "phone": "", '
+    '"passport": "", "visa": "", "/uploads/", ".pdf", ".jpg", ".png", "@gmail.com", "@qq.com", '
+    '"yes", "no", " WA 6", ", Perth", "+61", "04", "2025-", "T", "], ", ", "'
+).encode("utf-8")
+
+ZDICTS = {1: _ZDICT_V1}
+CURRENT_DICT_ID = 1
+
+
+def is_compressed(raw: bytes) -> bool:
+    return raw[:len(MAGIC)] == MAGIC
+
+
+def compress_text(value: str, min_size: int = 256, level: int = 6) -> bytes:
+    """编码为存储格式：超过 min_size 字节且压缩后更小时压缩，否则保存 UTF-8 原文"""
+    raw = value.encode("utf-8")
+    if len(raw) < min_size:
+        return raw
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, zdict=ZDICTS[CURRENT_DICT_ID])
+    compressed = MAGIC + bytes([CURRENT_DICT_ID]) + compressor.compress(raw) + compressor.flush()
+    return compressed if len(compressed) < len(raw) else raw
+
+
+def decompress_text(raw) -> str:
+    """解码存储格式（兼容压缩前写入的 TEXT 值）"""
+    if isinstance(raw, str):
+        return raw
+    raw = bytes(raw)  # PostgreSQL bytea 返回 memoryview
+    if not is_compressed(raw):
+        return raw.decode("utf-8")
+
+    dict_id = raw[len(MAGIC)]
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS, zdict=ZDICTS[dict_id])
+    data = decompressor.decompress(raw[len(MAGIC) + 1:]) + decompressor.flush()
+    return data.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """透明压缩的文本列（数据库中为 BLOB / bytea）"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, min_size=256, level=6):
+        super().__init__()
+        self.min_size = min_size
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text(value, self.min_size, self.level)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -0,0 +1,168 @@
+"""
+响应压缩
+根据 Accept-Encoding 协商压缩算法（brotli / zstd 需安装对应包，gzip 始终可用），
+只压缩指定类型且超过最小体积的响应；流式响应逐块压缩
+"""
+
+import gzip
+import zlib
+from functools import lru_cache
+
+from flask import request, current_app
+
+DEFAULT_MIMETYPES = [
+    "application/json",
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "application/javascript",
+]
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level)
+
+    def stream(self, chunks):
+        # wbits=31：带 gzip 头的 deflate 流
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self, module, level):
+        self.brotli = module
+        # brotli 质量范围 0-11，默认等级 6 已兼顾速度和压缩率
+        self.quality = min(level, 11)
+
+    def compress(self, data):
+        return self.brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks):
+        compressor = self.brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class _ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, module, level):
+        self.zstandard = module
+        self.level = level
+
+    def compress(self, data):
+        # ZstdCompressor 不是线程安全的，每次压缩单独创建
+        return self.zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        compressor = self.zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+@lru_cache(maxsize=None)
+def available_encoders(level):
+    """按服务端偏好顺序返回可用的压缩器（可选依赖在首次使用时才导入）"""
+    encoders = {}
+    try:
+        import brotli
+        encoders["br"] = _BrotliEncoder(brotli, level)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        encoders["zstd"] = _ZstdEncoder(zstandard, level)
+    except ImportError:
+        pass
+    encoders["gzip"] = _GzipEncoder(level)
+    return encoders
+
+
+class Compress:
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESS_ENABLED", True)
+        app.config.setdefault("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES)
+        app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+        app.config.setdefault("COMPRESS_LEVEL", 6)
+        app.config.setdefault("COMPRESS_ALGORITHMS", ["br", "zstd", "gzip"])
+
+        # after_request 按注册的逆序执行：需在其它 after_request 之前注册，保证最后一步才压缩
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        config = current_app.config
+        if not config["COMPRESS_ENABLED"] or not self._should_compress(response, config):
+            return response
+
+        if not response.is_streamed and len(response.get_data()) < config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        # 是否压缩取决于 Accept-Encoding：本次未压缩也要声明 Vary，
+        # 否则共享缓存会把未压缩的版本返回给支持压缩的客户端（或相反）
+        response.vary.add("Accept-Encoding")
+
+        encoder = self._negotiate(config)
+        if encoder is None:
+            return response
+
+        if response.is_streamed:
+            response.response = encoder.stream(response.iter_encoded())
+            response.headers.pop("Content-Length", None)
+        else:
+            response.set_data(encoder.compress(response.get_data()))
+
+        response.headers["Content-Encoding"] = encoder.name
+
+        # 压缩后的表示与原始表示字节不同，强 ETag 降级为弱 ETag
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    @staticmethod
+    def _should_compress(response, config):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.direct_passthrough or "Content-Encoding" in response.headers:
+            return False
+        if response.mimetype not in config["COMPRESS_MIMETYPES"]:
+            return False
+        if not response.is_streamed and response.content_length is not None \
+                and response.content_length < config["COMPRESS_MIN_SIZE"]:
+            return False
+        return True
+
+    @staticmethod
+    def _negotiate(config):
+        accept = request.accept_encodings
+        encoders = available_encoders(config["COMPRESS_LEVEL"])
+        best, best_quality = None, 0
+        for name in config["COMPRESS_ALGORITHMS"]:
+            quality = accept.quality(name)
+            if name in encoders and quality > best_quality:
+                best, best_quality = encoders[name], quality
+        return best
@@ -0,0 +1,71 @@
+"""
+条件请求（ETag / Last-Modified）工具
+根据数据版本号生成强 ETag，数据未变化时直接返回 304，不再执行视图和序列化
+"""
+
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import request, make_response, current_app
+
+from backend.app.models.data_version import get_versions
+
+
+def conditional(scopes_getter):
+    """
+    条件响应装饰器（放在 token_required 等认证装饰器之后）
+    :param scopes_getter: 无参函数，返回当前请求依赖的版本作用域列表；返回 None 表示不做条件处理
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            scopes = scopes_getter()
+            if not scopes:
+                return f(*args, **kwargs)
+
+            versions = get_versions(scopes)
+            etag = build_etag(scopes, versions)
+            last_modified = max((updated for _, updated in versions.values() if updated), default=None)
+            if last_modified is not None:
+                last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+
+            if is_not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+                set_validators(response, etag, last_modified)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                set_validators(response, etag, last_modified)
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def build_etag(scopes, versions):
+    """ETag = 请求路径 + 查询参数 + 各作用域版本号的摘要"""
+    parts = [request.path, request.query_string.decode("utf-8", "replace")]
+    for scope in sorted(scopes):
+        version, _ = versions.get(scope, (0, None))
+        parts.append(f"{scope}={version}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def is_not_modified(etag, last_modified):
+    # 有 If-None-Match 时忽略 If-Modified-Since（RFC 7232 3.3）
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # 允许浏览器缓存，但每次使用前都要带验证器回源确认
+    response.headers["Cache-Control"] = "private, no-cache"
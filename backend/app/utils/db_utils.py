@@ -0,0 +1,130 @@
+"""
+数据库引擎工具
+在引擎创建后挂载连接级设置（SQLite PRAGMA、fork 后重建连接池等）
+"""
+
+import logging
+import os
+import weakref
+
+from sqlalchemy import event
+
+db_logger = logging.getLogger('db_logger')
+
+
+def configure_engine(engine, config):
+    """根据数据库类型为引擎注册连接初始化逻辑"""
+    if engine.dialect.name == "sqlite":
+        register_sqlite_pragmas(engine, config.get("SQLITE_PRAGMAS") or {})
+    dispose_engine_after_fork(engine)
+
+
+# fork 后需要重建连接池的引擎；fork 钩子无法注销，只在模块加载时注册一次，引擎释放后自动移出
+_fork_safe_engines = weakref.WeakSet()
+
+
+def _dispose_engines_in_child():
+    for engine in list(_fork_safe_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engines_in_child)
+
+
+def dispose_engine_after_fork(engine):
+    """
+    子进程 fork 后丢弃继承自父进程的连接（gunicorn preload / 多进程场景）
+    close=False：不关闭父进程仍在使用的 socket，只让子进程重新建立连接
+    """
+    _fork_safe_engines.add(engine)
+
+
+def dispose_engines(app):
+    """释放 app 绑定的所有引擎连接池，供 gunicorn post_fork 等钩子显式调用"""
+    from backend.app.models import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def register_sqlite_pragmas(engine, pragmas):
+    """
+    在每个新建的 SQLite 连接上执行 PRAGMA
+    :param engine: SQLAlchemy Engine
+    :param pragmas: dict，例如 {"journal_mode": "WAL", "busy_timeout": 5000}
+    """
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+    if not statements:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    db_logger.info(f"SQLite PRAGMA 已注册: {pragmas}")
+
+
+def use_explicit_sqlite_transactions(engine, begin_statement="BEGIN"):
+    """
+    接管 pysqlite 的事务控制：由 SQLAlchemy 显式发出 BEGIN
+    pysqlite 默认延迟到第一条 DML 才开启事务，导致 SAVEPOINT 无法正确嵌套；
+    写入线程使用 BEGIN IMMEDIATE 在事务开始时即获取写锁
+    """
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql(begin_statement)
+
+
+def make_psycopg2_cooperative():
+    """
+    gevent / eventlet 下为 psycopg2 注册等待回调：psycopg2 是 C 扩展，monkey patch 不到它内部的 socket，
+    默认等待查询结果时会阻塞整个 hub；注册后改为非阻塞轮询，等待期间让出给其它 greenlet
+    未安装 psycopg2 或不在协作式运行时中时不做任何事，返回 False
+    """
+    from backend.app.utils.offload import cooperative_runtime
+
+    runtime = cooperative_runtime()
+    try:
+        from psycopg2 import OperationalError, extensions
+    except ImportError:
+        return False
+    if runtime == "gevent":
+        from gevent.socket import wait_read, wait_write
+    elif runtime == "eventlet":
+        from eventlet.hubs import trampoline
+
+        def wait_read(fd, timeout=None):
+            trampoline(fd, read=True, timeout=timeout)
+
+        def wait_write(fd, timeout=None):
+            trampoline(fd, write=True, timeout=timeout)
+    else:
+        return False
+
+    def _wait_callback(conn, timeout=None):
+        while True:
+            state = conn.poll()
+            if state == extensions.POLL_OK:
+                break
+            elif state == extensions.POLL_READ:
+                wait_read(conn.fileno(), timeout=timeout)
+            elif state == extensions.POLL_WRITE:
+                wait_write(conn.fileno(), timeout=timeout)
+            else:
+                raise OperationalError(f"Bad result from poll: {state}")
+
+    extensions.set_wait_callback(_wait_callback)
+    db_logger.info(f"psycopg2 wait callback registered for {runtime}")
+    return True
@@ -0,0 +1,157 @@
+"""
+幂等请求（Idempotency-Key）工具
+客户端超时重试时携带相同的 Idempotency-Key，服务端直接返回首次执行保存的响应，
+不会重复创建表单 / 重复创建 Google 任务：
+- 首次请求：先占位（status_code 为空），执行视图后保存响应
+- 相同键、相同请求：返回保存的响应（带 Idempotent-Replayed 头）
+- 相同键、首次请求仍在处理：409
+- 占位只在 IDEMPOTENCY_LOCK_TIMEOUT 秒内有效（expires_at 为租约到期时间，保存响应后才延长到 TTL）：
+  worker 崩溃 / 被杀留下的占位过期后，重试的请求直接接管，而不是一直 409 到 TTL 结束。
+  占位时间（created_gmt）标识占用者，被接管的原请求之后不会覆盖或删除新的占位
+- 相同键、不同请求内容：422
+- 视图返回 5xx 或抛出异常：删除占位，允许客户端重试
+"""
+
+import datetime
+import hashlib
+import logging
+from functools import wraps
+
+from flask import request, jsonify, g, make_response, current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.app.models.idempotency_key import IdempotencyKey
+from backend.app.utils.write_coordinator import run_write
+
+app_logger = logging.getLogger('app_logger')
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(f):
+    """幂等装饰器（放在 token_required 之后，幂等键按当前用户隔离）"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = (request.headers.get(IDEMPOTENCY_HEADER) or "").strip()
+        if not key:
+            return f(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{IDEMPOTENCY_HEADER} is too long'}), 400
+
+        email = g.current_user.email
+        request_hash = request_fingerprint()
+        ttl = datetime.timedelta(seconds=current_app.config.get("IDEMPOTENCY_KEY_TTL", 86400))
+        lease = datetime.timedelta(seconds=current_app.config.get("IDEMPOTENCY_LOCK_TIMEOUT", 120))
+        claimed_at = datetime.datetime.utcnow()
+
+        stored = run_write(_claim_key, email, key, request_hash, claimed_at, lease)
+        if stored is not None:
+            return _stored_response(stored, request_hash)
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            run_write(_release_key, email, key, claimed_at)
+            raise
+
+        try:
+            if response.status_code >= 500:
+                run_write(_release_key, email, key, claimed_at)
+            elif not run_write(_store_response, email, key, claimed_at, ttl,
+                               response.status_code, response.get_data(as_text=True)):
+                app_logger.warning(f"[IDEMPOTENCY] 占位已超时被其它请求接管，结果未保存 | 用户: {email} | 键: {key}")
+        except Exception as e:
+            app_logger.exception(f"[IDEMPOTENCY] 保存幂等结果失败 | 用户: {email} | 键: {key} | {e}")
+        return response
+
+    return decorated
+
+
+def request_fingerprint():
+    """请求指纹：方法 + 路径 + 请求内容；multipart 按字段计算，不受每次重试 boundary 不同的影响"""
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode("utf-8"))
+    if request.mimetype in ("multipart/form-data", "application/x-www-form-urlencoded"):
+        # 按字段名稳定排序，同名字段（如 checklist[]）保持原有顺序
+        for name, value in sorted(request.form.items(multi=True), key=lambda item: item[0]):
+            digest.update(f"{name}={value}\n".encode("utf-8"))
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            digest.update(f"{name}:{file.filename}\n".encode("utf-8"))
+            for chunk in iter(lambda: file.stream.read(65536), b""):
+                digest.update(chunk)
+            file.stream.seek(0)
+    else:
+        digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _stored_response(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return jsonify({'error': f'{IDEMPOTENCY_HEADER} was already used for a different request'}), 422
+    if stored.status_code is None:
+        response = jsonify({'error': 'A request with the same idempotency key is in progress'})
+        response.status_code = 409
+        response.headers["Retry-After"] = "1"
+        return response
+
+    response = current_app.response_class(stored.response_body, status=stored.status_code,
+                                          mimetype="application/json")
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _claim_key(session, email, key, request_hash, claimed_at, lease):
+    """
+    占用幂等键；已存在（未过期）时返回保存的记录，成功占用返回 None
+    占位的 expires_at 为租约到期时间，过期的占位和过期的结果一样会被清理，随后由本次请求重新占用
+    """
+    table = IdempotencyKey.__table__
+    # 顺带清理该用户已过期的键 / 租约已过期的占位（命中唯一索引前缀，代价很小）
+    session.execute(delete(table).where(table.c.email == email, table.c.expires_at < claimed_at))
+
+    values = dict(email=email, key=key, request_hash=request_hash, expires_at=claimed_at + lease,
+                  created_gmt=claimed_at, updated_gmt=claimed_at)
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        claimed = session.execute(upsert(table).values(**values).on_conflict_do_nothing()).rowcount == 1
+    else:
+        try:
+            with session.begin_nested():
+                session.execute(insert(table).values(**values))
+            claimed = True
+        except IntegrityError:
+            claimed = False
+
+    if claimed:
+        return None
+    return session.execute(
+        select(table.c.request_hash, table.c.status_code, table.c.response_body)
+        .where(table.c.email == email, table.c.key == key)
+    ).one()
+
+
+def _own_placeholder(table, email, key, claimed_at):
+    """本次请求占用、尚未保存结果的占位（被其它请求接管后不再匹配）"""
+    return (table.c.email == email, table.c.key == key,
+            table.c.created_gmt == claimed_at, table.c.status_code.is_(None))
+
+
+def _store_response(session, email, key, claimed_at, ttl, status_code, body):
+    """保存响应并把过期时间从租约延长到 TTL；占位已被接管时返回 False"""
+    table = IdempotencyKey.__table__
+    now = datetime.datetime.utcnow()
+    result = session.execute(
+        update(table).where(*_own_placeholder(table, email, key, claimed_at))
+        .values(status_code=status_code, response_body=body, expires_at=now + ttl, updated_gmt=now)
+    )
+    return result.rowcount == 1
+
+
+def _release_key(session, email, key, claimed_at):
+    table = IdempotencyKey.__table__
+    session.execute(delete(table).where(*_own_placeholder(table, email, key, claimed_at)))
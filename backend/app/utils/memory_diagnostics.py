@@ -0,0 +1,189 @@
+"""
+内存诊断
+tracemalloc 快照与对比、进程 RSS、ORM 对象数量，供 /admin/diagnostics/memory 接口使用。
+状态按进程保存：gunicorn 每个 worker 各自独立，每个响应都带 pid，多次请求可能落到不同 worker；
+需要从 worker 启动起就追踪时可设置环境变量 PYTHONTRACEMALLOC=<帧数>。
+快照只保留最近 MEMORY_MAX_SNAPSHOTS 个；dump 时写入 MEMORY_DIAG_DIR（默认为日志目录下的 memory/）：
+- <名称>.json：接口返回的统计结果
+- <名称>.tracemalloc：原始快照，可用 tracemalloc.Snapshot.load() 离线分析
+"""
+
+import gc
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+from flask import current_app
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# tracemalloc 自身和导入机制的分配与业务无关
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class TracingNotStarted(RuntimeError):
+    """tracemalloc 未启动时无法拍摄快照"""
+
+
+def process_memory():
+    """当前进程 RSS 和峰值 RSS（字节）；非 Linux 平台只有峰值"""
+    try:
+        with open("/proc/self/status") as status:
+            values = dict(line.split(":", 1) for line in status if line.startswith(("VmRSS:", "VmHWM:")))
+        return {"rss": int(values["VmRSS"].split()[0]) * 1024, "peak_rss": int(values["VmHWM"].split()[0]) * 1024}
+    except (OSError, KeyError, ValueError):
+        if resource is None:
+            return {"rss": None, "peak_rss": None}
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 单位为字节，Linux 为 KiB
+        return {"rss": None, "peak_rss": peak if sys.platform == "darwin" else peak * 1024}
+
+
+def orm_object_counts():
+    """当前进程中存活的各 ORM 模型实例数量（遍历 gc 跟踪的全部对象，开销与堆大小成正比）"""
+    from backend.app.models import db
+
+    mapped = {mapper.class_ for mapper in db.Model.registry.mappers}
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects() if type(obj) in mapped)
+    return dict(counts.most_common())
+
+
+def _location(traceback):
+    return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+
+def format_statistics(stats, limit):
+    return [{"location": _location(stat.traceback), "size": stat.size, "count": stat.count}
+            for stat in stats[:limit]]
+
+
+def format_diff(stats, limit):
+    return [{"location": _location(stat.traceback), "size": stat.size, "size_diff": stat.size_diff,
+             "count": stat.count, "count_diff": stat.count_diff}
+            for stat in stats[:limit]]
+
+
+class MemoryDiagnostics:
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()  # id -> (快照, 元数据)
+        self._next_id = 1
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("MEMORY_DIAG_DIR", None)
+        app.config.setdefault("MEMORY_MAX_SNAPSHOTS", 4)
+        app.config.setdefault("MEMORY_TRACE_FRAMES", 1)
+        app.extensions["memory_diagnostics"] = self
+
+    @staticmethod
+    def start(frames=None):
+        """开始追踪分配，frames 为每次分配记录的栈帧数（按 traceback 分组时需要大于 1）"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or current_app.config["MEMORY_TRACE_FRAMES"])
+        return tracemalloc.get_traceback_limit()
+
+    def stop(self):
+        """停止追踪并丢弃已有快照"""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def status(self, include_objects=False):
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshots = [meta for _, meta in self._snapshots.values()]
+        result = {
+            "pid": os.getpid(),
+            **process_memory(),
+            "tracing": tracemalloc.is_tracing(),
+            "traceback_limit": tracemalloc.get_traceback_limit(),
+            "traced": traced,
+            "traced_peak": traced_peak,
+            "gc_counts": gc.get_count(),
+            "snapshots": snapshots,
+        }
+        if include_objects:
+            result["orm_objects"] = orm_object_counts()
+        return result
+
+    def take_snapshot(self, label=None):
+        """拍摄快照并保存，返回元数据；超出 MEMORY_MAX_SNAPSHOTS 时丢弃最旧的快照"""
+        if not tracemalloc.is_tracing():
+            raise TracingNotStarted("tracemalloc 未启动")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshot_id = str(self._next_id)
+            self._next_id += 1
+            meta = {
+                "id": snapshot_id,
+                "label": label,
+                "pid": os.getpid(),
+                "taken_at": datetime.now().isoformat(timespec="seconds"),
+                "traced": traced,
+                "traced_peak": traced_peak,
+                **process_memory(),
+            }
+            self._snapshots[snapshot_id] = (snapshot, meta)
+            while len(self._snapshots) > current_app.config["MEMORY_MAX_SNAPSHOTS"]:
+                self._snapshots.popitem(last=False)
+        return meta
+
+    def _get(self, snapshot_id):
+        with self._lock:
+            if snapshot_id not in self._snapshots:
+                raise LookupError(f"快照 {snapshot_id} 不存在（进程 {os.getpid()}）")
+            return self._snapshots[snapshot_id]
+
+    def top(self, snapshot_id, group_by="lineno", limit=20):
+        snapshot, meta = self._get(snapshot_id)
+        return {"snapshot": meta, "group_by": group_by,
+                "stats": format_statistics(snapshot.statistics(group_by), limit)}
+
+    def diff(self, old_id, new_id, group_by="lineno", limit=20):
+        """new 相对 old 的分配变化，按增长量从大到小排序"""
+        old, old_meta = self._get(old_id)
+        new, new_meta = self._get(new_id)
+        stats = new.compare_to(old, group_by)
+        return {"from": old_meta, "to": new_meta, "group_by": group_by,
+                "size_diff": sum(stat.size_diff for stat in stats),
+                "stats": format_diff(stats, limit)}
+
+    def dump(self, name, result, snapshot_id=None):
+        """将统计结果（以及原始快照）写入诊断目录，返回写入的文件路径"""
+        directory = diagnostics_dir()
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}-{name}")
+        paths = [base + ".json"]
+        with open(paths[0], "w", encoding="utf-8") as out:
+            json.dump(result, out, ensure_ascii=False, indent=2)
+        if snapshot_id is not None:
+            snapshot, _ = self._get(snapshot_id)
+            paths.append(base + ".tracemalloc")
+            snapshot.dump(paths[1])
+        return paths
+
+
+def diagnostics_dir():
+    config = current_app.config
+    return config["MEMORY_DIAG_DIR"] or os.path.join(os.path.dirname(config["APP_LOG_FILE"]), "memory")
+
+
+memory_diagnostics = MemoryDiagnostics()
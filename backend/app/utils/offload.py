@@ -0,0 +1,36 @@
+"""
+CPU 密集任务卸载
+协作式 worker（gunicorn -k gevent / eventlet）中所有请求共用一个事件循环（hub），
+验证码绘制（Pillow）、密码哈希（bcrypt）这类纯计算会卡住 hub 上的全部请求。
+run_blocking 在协作式 worker 中把任务交给真正的系统线程池执行（bcrypt / Pillow 计算时释放 GIL），
+当前 greenlet 让出等待；sync / gthread worker 中直接调用，没有额外开销。
+线程池中的任务在调用方 contextvars 的副本中运行，仍可访问 current_app 等 Flask 上下文
+"""
+
+import contextvars
+import sys
+
+
+def cooperative_runtime():
+    """当前进程已被 gevent / eventlet monkey patch 时返回其名称，否则返回 None"""
+    gevent_monkey = sys.modules.get("gevent.monkey")
+    if gevent_monkey is not None and gevent_monkey.is_module_patched("socket"):
+        return "gevent"
+    eventlet_patcher = sys.modules.get("eventlet.patcher")
+    if eventlet_patcher is not None and eventlet_patcher.is_monkey_patched("socket"):
+        return "eventlet"
+    return None
+
+
+def run_blocking(fn, *args, **kwargs):
+    """执行 CPU 密集函数：协作式 worker 中放到系统线程池，其它情况直接调用"""
+    runtime = cooperative_runtime()
+    if runtime is None:
+        return fn(*args, **kwargs)
+
+    context = contextvars.copy_context()
+    if runtime == "gevent":
+        import gevent
+        return gevent.get_hub().threadpool.apply(context.run, (fn, *args), kwargs)
+    from eventlet import tpool
+    return tpool.execute(context.run, fn, *args, **kwargs)
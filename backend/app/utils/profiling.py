@@ -0,0 +1,226 @@
+"""
+按需请求剖析
+管理员请求带 X-Profile: 1 请求头或 ?__profile=1 参数时，后台线程按 PROFILE_INTERVAL_MS 采样处理该请求的线程调用栈，
+请求结束后在 PROFILE_DIR（默认为日志目录下的 profiles/）写入：
+- <id>.speedscope.json：可直接拖入 https://www.speedscope.app 查看火焰图
+- <id>.collapsed：折叠栈格式（flamegraph.pl / inferno 的输入）
+- <id>.meta.json：请求方法、路径、用户、状态码、耗时、采样数
+响应头 X-Profile-Id 返回剖析编号，/admin/profiles 列出最近的剖析。
+未触发时每个请求只多一次请求头 / 参数查找；非管理员带触发参数时忽略，不报错。
+采样基于 sys._current_frames()，gevent / eventlet worker 中同一线程上的其它 greenlet 也可能被采到
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app, g, request
+from flask_security import current_user
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ARG = "__profile"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9T]{15}-[0-9a-f]{8}$")
+PROFILE_FORMATS = {"speedscope": ".speedscope.json", "collapsed": ".collapsed"}
+
+
+class _StackSampler(threading.Thread):
+    """定时采样指定线程的调用栈，stacks 为 {(根 -> 叶的帧, ...): 次数}"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def to_collapsed(stacks):
+    """折叠栈：每行 "帧;帧;帧 次数" """
+    lines = []
+    for stack, count in stacks.most_common():
+        frames = ";".join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+        lines.append(f"{frames} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(stacks, name, interval_ms):
+    """speedscope sampled 格式，权重单位为毫秒"""
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in stacks.most_common():
+        sample = []
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            sample.append(index[frame])
+        samples.append(sample)
+        weights.append(count * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "easyaussie",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def profile_dir(config=None):
+    config = config or current_app.config
+    return config["PROFILE_DIR"] or os.path.join(os.path.dirname(config["APP_LOG_FILE"]), "profiles")
+
+
+def list_profiles(limit=50):
+    """最近的剖析元数据，按时间倒序"""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    names = sorted((name for name in os.listdir(directory) if name.endswith(".meta.json")), reverse=True)
+    profiles = []
+    for name in names[:limit]:
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as meta_file:
+                profiles.append(json.load(meta_file))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_path(profile_id, fmt="speedscope"):
+    """剖析文件路径，编号或格式不合法、文件不存在时返回 None"""
+    if not PROFILE_ID_PATTERN.match(profile_id) or fmt not in PROFILE_FORMATS:
+        return None
+    path = os.path.join(profile_dir(), profile_id + PROFILE_FORMATS[fmt])
+    return path if os.path.isfile(path) else None
+
+
+class RequestProfiler:
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PROFILE_ENABLED", True)
+        app.config.setdefault("PROFILE_DIR", None)
+        app.config.setdefault("PROFILE_INTERVAL_MS", 2)
+        app.config.setdefault("PROFILE_MAX_FILES", 200)
+        if not app.config["PROFILE_ENABLED"]:
+            return
+
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+    @staticmethod
+    def _triggered():
+        flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_ARG)
+        if not flag or flag == "0":
+            return False
+        # 与 require_admin 相同的权限判断（支持角色继承）
+        return current_user.is_authenticated and current_user.has_role("admin")
+
+    def before_request(self):
+        if not self._triggered():
+            return
+        interval_ms = current_app.config["PROFILE_INTERVAL_MS"]
+        sampler = _StackSampler(threading.get_ident(), interval_ms / 1000)
+        g._profile = {
+            "id": f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}",
+            "sampler": sampler,
+            "start": time.perf_counter(),
+            "user": current_user.email,
+        }
+        sampler.start()
+
+    @staticmethod
+    def after_request(response):
+        profile = g.get("_profile")
+        if profile is not None:
+            profile["status"] = response.status_code
+            response.headers["X-Profile-Id"] = profile["id"]
+        return response
+
+    @staticmethod
+    def teardown_request(exc):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return
+        duration_ms = (time.perf_counter() - profile["start"]) * 1000
+        sampler = profile["sampler"]
+        sampler.stop()
+        try:
+            _save_profile(current_app.config, profile, sampler, duration_ms)
+        except OSError as e:
+            current_app.logger.warning(f"[PROFILE] 保存剖析结果失败: {e}")
+
+
+def _save_profile(config, profile, sampler, duration_ms):
+    directory = profile_dir(config)
+    os.makedirs(directory, exist_ok=True)
+    profile_id = profile["id"]
+    interval_ms = config["PROFILE_INTERVAL_MS"]
+    name = f"{request.method} {request.full_path.rstrip('?')}"
+
+    with open(os.path.join(directory, profile_id + ".speedscope.json"), "w", encoding="utf-8") as out:
+        json.dump(to_speedscope(sampler.stacks, name, interval_ms), out)
+    with open(os.path.join(directory, profile_id + ".collapsed"), "w", encoding="utf-8") as out:
+        out.write(to_collapsed(sampler.stacks))
+    meta = {
+        "id": profile_id,
+        "method": request.method,
+        "path": request.path,
+        "query_string": request.query_string.decode("latin-1"),
+        "user": profile["user"],
+        "status": profile.get("status", 500),
+        "duration_ms": round(duration_ms, 2),
+        "samples": sum(sampler.stacks.values()),
+        "interval_ms": interval_ms,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+    }
+    # 元数据最后写入：列表只展示已完整写入的剖析
+    with open(os.path.join(directory, profile_id + ".meta.json"), "w", encoding="utf-8") as out:
+        json.dump(meta, out, ensure_ascii=False)
+    _prune(directory, config["PROFILE_MAX_FILES"])
+
+
+def _prune(directory, max_files):
+    """只保留最近 max_files 个剖析"""
+    ids = sorted(name[:-len(".meta.json")] for name in os.listdir(directory) if name.endswith(".meta.json"))
+    for profile_id in ids[:-max_files] if max_files > 0 else []:
+        for suffix in (".meta.json", *PROFILE_FORMATS.values()):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
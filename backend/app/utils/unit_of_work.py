@@ -0,0 +1,69 @@
+"""
+工作单元（Unit of Work）
+一次业务操作（例如提交一个表单）涉及的所有数据库写入先暂存，commit 时在同一个
+run_write 事务中依次执行：表单、类型化投影等一起 flush、只提交一次，要么全部生效要么全部回滚。
+外部调用（Google 任务等）登记为 after_commit，只在事务提交成功后执行；
+事务失败时执行 on_rollback 登记的补偿操作（例如删除已写入磁盘的上传文件）。
+
+用法：
+    uow = UnitOfWork()
+    uow.stage(_save_form, record)            # _save_form(session, record)
+    uow.on_rollback(remove_files, paths)
+    uow.after_commit(create_google_task, body)
+    uow.commit()
+"""
+
+import logging
+
+from backend.app.utils.write_coordinator import run_write
+
+app_logger = logging.getLogger('app_logger')
+
+
+class UnitOfWork:
+    __slots__ = ("_units", "_after_commit", "_on_rollback", "after_commit_errors")
+
+    def __init__(self):
+        self._units = []
+        self._after_commit = []
+        self._on_rollback = []
+        # after_commit 回调中的异常（回调名, 异常），不影响已提交的数据
+        self.after_commit_errors = []
+
+    def stage(self, unit, *args, **kwargs):
+        """暂存写入单元 unit(session, *args, **kwargs)，commit 时按登记顺序执行"""
+        self._units.append((unit, args, kwargs))
+
+    def after_commit(self, callback, *args, **kwargs):
+        """事务提交成功后执行（外部调用），异常只记录日志"""
+        self._after_commit.append((callback, args, kwargs))
+
+    def on_rollback(self, callback, *args, **kwargs):
+        """事务失败时执行的补偿操作"""
+        self._on_rollback.append((callback, args, kwargs))
+
+    def _run(self, session):
+        return [unit(session, *args, **kwargs) for unit, args, kwargs in self._units]
+
+    def commit(self):
+        """
+        在一个事务中执行所有写入单元并提交，返回各单元的返回值列表
+        事务失败时执行补偿操作后重新抛出异常，after_commit 回调不会执行
+        """
+        try:
+            results = run_write(self._run) if self._units else []
+        except Exception:
+            for callback, args, kwargs in self._on_rollback:
+                try:
+                    callback(*args, **kwargs)
+                except Exception as e:
+                    app_logger.exception(f"[UOW] 回滚补偿 {callback.__name__} 失败: {e}")
+            raise
+
+        for callback, args, kwargs in self._after_commit:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                app_logger.exception(f"[UOW] 提交后回调 {callback.__name__} 失败: {e}")
+                self.after_commit_errors.append((callback.__name__, e))
+        return results
@@ -0,0 +1,234 @@
+"""
+写入协调器
+所有短事务写入通过 run_write(unit) 执行：
+- 默认模式：在当前请求的 db.session 中执行 unit 并立即提交
+- 协调模式（WRITE_COORDINATION=1）：unit 交给本进程唯一的写线程，写线程在几毫秒窗口内
+  收集一批写入，每个 unit 放在独立 SAVEPOINT 中执行，整批只提交一次（group commit）；
+  多个 gunicorn worker 之间通过文件锁（flock）排队，不再依赖 busy_timeout 忙等重试
+
+unit 的签名为 unit(session, *args, **kwargs)，只能使用传入的 session 读写数据，
+返回值（或异常）会交还给调用方。协调模式下返回的 ORM 对象已与写线程 session 分离。
+调用方等待超时时，尚未开始执行的写入会被取消，不会在调用方收到错误之后才提交；
+已经在执行中的写入只能等待其所在批次结束（结果以实际提交为准）。
+写线程意外退出时释放所有权，下一次写入会重新启动写线程。
+"""
+
+import contextlib
+import logging
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import current_app
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import db
+from backend.app.utils.db_utils import configure_engine, use_explicit_sqlite_transactions
+
+try:
+    import fcntl
+except ImportError:  # Windows 本地开发环境没有 fcntl，只做进程内排队
+    fcntl = None
+
+db_logger = logging.getLogger('db_logger')
+
+
+class _WriteJob:
+    __slots__ = ("unit", "args", "kwargs", "future")
+
+    def __init__(self, unit, args, kwargs):
+        self.unit = unit
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class WriteCoordinator:
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._owner = None
+        self._queue = None
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("WRITE_COORDINATION", False)
+        app.config.setdefault("WRITE_BATCH_WINDOW_MS", 5)
+        app.config.setdefault("WRITE_BATCH_MAX", 64)
+        app.config.setdefault("WRITE_TIMEOUT", 30)
+        app.config.setdefault("WRITE_LOCK_FILE", None)
+        app.extensions["write_coordinator"] = self
+
+    def run(self, unit, *args, **kwargs):
+        """执行一个写入单元并提交，返回 unit 的返回值"""
+        if not current_app.config["WRITE_COORDINATION"]:
+            return self._run_inline(unit, args, kwargs)
+
+        job = _WriteJob(unit, args, kwargs)
+        self._submit(current_app._get_current_object(), job)
+        try:
+            return job.future.result(timeout=current_app.config["WRITE_TIMEOUT"])
+        except FutureTimeoutError:
+            if job.future.cancel():
+                raise
+            # 写线程已开始执行该写入：取消会导致调用方收到错误而数据仍被提交，等待批次结束
+            db_logger.warning("[WRITER] 写入等待超时，但已在执行中，继续等待批次结束")
+            return job.future.result()
+
+    @staticmethod
+    def _run_inline(unit, args, kwargs):
+        session = db.session
+        try:
+            result = unit(session, *args, **kwargs)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+
+    def _submit(self, app, job):
+        """
+        按进程懒启动写线程（fork 出的 worker 不会继承父进程的线程）并提交写入
+        与 _release_writer 持有同一把锁：写入不会进入已退出写线程的队列
+        """
+        owner = (os.getpid(), id(app))
+        with self._lock:
+            if self._owner != owner:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(
+                    target=self._writer_loop, args=(app, self._queue), name="db-writer", daemon=True
+                )
+                self._thread.start()
+                self._owner = owner
+            self._queue.put(job)
+
+    def _writer_loop(self, app, job_queue):
+        try:
+            self._process_queue(app, job_queue)
+        except Exception as e:
+            db_logger.exception(f"[WRITER] 写线程异常退出: {e}")
+        finally:
+            self._release_writer(job_queue)
+
+    def _release_writer(self, job_queue):
+        """清除所有权（下一次写入重新启动写线程），队列中剩余的写入直接失败，不再等到超时"""
+        with self._lock:
+            if self._queue is job_queue:
+                self._owner = None
+                self._queue = None
+                self._thread = None
+        while True:
+            try:
+                job = job_queue.get_nowait()
+            except queue.Empty:
+                break
+            if job.future.set_running_or_notify_cancel():
+                job.future.set_exception(RuntimeError("写线程已退出"))
+
+    def _process_queue(self, app, job_queue):
+        with app.app_context():
+            config = app.config
+            engine = self._create_writer_engine(config)
+            session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+            lock_path = self._lock_path(engine, config)
+            window = config["WRITE_BATCH_WINDOW_MS"] / 1000
+            batch_max = config["WRITE_BATCH_MAX"]
+            db_logger.info(f"[WRITER] 写线程已启动 | pid: {os.getpid()} | lock: {lock_path}")
+
+            while True:
+                batch = [job_queue.get()]
+                deadline = time.monotonic() + window
+                while len(batch) < batch_max:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(job_queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                self._commit_batch(session_factory, lock_path, batch)
+
+    @staticmethod
+    def _create_writer_engine(config):
+        """写线程专用引擎：单连接，SQLite 下以 BEGIN IMMEDIATE 开启事务以支持 SAVEPOINT"""
+        options = config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+        engine = create_engine(
+            db.engine.url,
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=options.get("pool_pre_ping", False),
+            connect_args=options.get("connect_args", {}),
+        )
+        configure_engine(engine, config)
+        if engine.dialect.name == "sqlite":
+            use_explicit_sqlite_transactions(engine, "BEGIN IMMEDIATE")
+        return engine
+
+    @staticmethod
+    def _lock_path(engine, config):
+        if config["WRITE_LOCK_FILE"]:
+            return config["WRITE_LOCK_FILE"]
+        if engine.dialect.name == "sqlite" and engine.url.database:
+            return f"{engine.url.database}.write-lock"
+        return os.path.join(tempfile.gettempdir(), "easyaussie.write-lock")
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _process_lock(lock_path):
+        """同一主机上多个 worker 进程按顺序获取写锁"""
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _commit_batch(self, session_factory, lock_path, batch):
+        # 已被调用方取消（等待超时）的写入不再执行；其余标记为执行中，之后无法取消
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        results = []
+        session = session_factory()
+        try:
+            with self._process_lock(lock_path):
+                for job in batch:
+                    try:
+                        with session.begin_nested():
+                            result = job.unit(session, *job.args, **job.kwargs)
+                        results.append((job, result, None))
+                    except Exception as e:
+                        results.append((job, None, e))
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            db_logger.error(f"[WRITER] 批量提交失败，共 {len(batch)} 个写入: {e}")
+            errors = {id(job): error for job, _, error in results if error is not None}
+            results = [(job, None, errors.get(id(job), e)) for job in batch]
+        finally:
+            # close() 会把对象从写线程 session 中分离，已加载的属性仍可在请求线程读取
+            session.close()
+
+        for job, result, error in results:
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+
+write_coordinator = WriteCoordinator()
+
+
+def run_write(unit, *args, **kwargs):
+    """执行写入单元并提交（是否合并提交由 WRITE_COORDINATION 决定）"""
+    return write_coordinator.run(unit, *args, **kwargs)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+IO 密集路径并发基准测试
+本地启动一个模拟 Google Tasks API（每个请求固定延迟），应用通过 GOOGLE_TASKS_API_ENDPOINT 指向它；
+C 个并发客户端混合提交验房表单（提交后同步创建 Google 任务，即等待上游）和获取验证码（CPU 密集），
+对比 sync / gthread / gevent / eventlet（已安装时）在上游变慢时的吞吐和延迟。
+协作式 worker 中验证码绘制通过 backend/app/utils/offload.py 放到线程池，不阻塞其它等待上游的请求
+
+用法:
+    python -m backend.benchmarks.bench_cooperative --upstream-ms 200 --clients 32 --duration 10
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+
+from backend.benchmarks.bench_gunicorn_workers import available_worker_classes, free_port, load, seed, start_server
+
+
+def start_upstream(latency):
+    """模拟 Tasks API：任意 POST 等待 latency 秒后返回一个任务"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(latency)
+            body = json.dumps({"id": "bench", "kind": "tasks#task"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_token(path):
+    """写入一个未过期的 token，应用无需刷新即可调用模拟 API"""
+    expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=1)
+    with open(path, "w") as token_file:
+        json.dump({"token": "bench", "refresh_token": "bench", "client_id": "bench", "client_secret": "bench",
+                   "expiry": expiry.isoformat() + "Z"}, token_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IO 密集路径在各 worker 类型下的并发基准测试")
+    parser.add_argument("--upstream-ms", type=int, default=200, help="模拟 Google Tasks API 的响应延迟（毫秒）")
+    parser.add_argument("--workers", type=int, default=2, help="worker 进程数")
+    parser.add_argument("--threads", type=int, default=4, help="gthread 每个 worker 的线程数")
+    parser.add_argument("--clients", type=int, default=32, help="并发客户端数")
+    parser.add_argument("--duration", type=float, default=10, help="每种模式运行秒数")
+    parser.add_argument("--worker-classes", default=",".join(available_worker_classes()),
+                        help="逗号分隔的 worker 类型，默认为已安装的全部类型")
+    args = parser.parse_args()
+
+    upstream = start_upstream(args.upstream_ms / 1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        overrides, token, _ = seed(tmp, 1)
+        overrides["UPLOAD_FOLDER"] = os.path.join(tmp, "uploads")
+        token_file = os.path.join(tmp, "google_token.json")
+        write_token(token_file)
+        extra_env = {
+            "GOOGLE_TASKS_TOKEN_FILE": token_file,
+            "GOOGLE_TASKS_API_ENDPOINT": f"http://127.0.0.1:{upstream.server_port}/",
+            "GOOGLE_TASKS_NUM_RETRIES": "0",
+        }
+        headers = {"Authorization": f"Bearer {token}"}
+        submit = urlencode({"formType": "inspection", "address": "35 Stirling Hwy",
+                            "appointmentDate": "2030-05-02T10:00"})
+        paths = [("POST", "/api/form-submit", submit, "application/x-www-form-urlencoded"), "/api/captcha"]
+
+        print(f"🚀 upstream={args.upstream_ms}ms workers={args.workers} threads={args.threads} "
+              f"clients={args.clients} duration={args.duration}s")
+        with open(os.path.join(tmp, "gunicorn.log"), "w") as log_file:
+            for worker_class in args.worker_classes.split(","):
+                port = free_port()
+                proc = start_server(overrides, worker_class, args.workers, args.threads, port, log_file, extra_env)
+                try:
+                    load(port, paths, headers, args.clients, 1)  # 预热
+                    result = load(port, paths, headers, args.clients, args.duration)
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                print(json.dumps({"worker_class": worker_class, **result}, ensure_ascii=False))
+    upstream.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Gunicorn worker 模式基准测试
+使用 backend/gunicorn.conf.py 分别以各 worker 类型启动应用（临时 SQLite 数据库），
+C 个并发客户端（keep-alive 连接）轮流请求订单列表 / 订单详情 / 表单查询 / 验证码，
+对比吞吐和延迟。gevent / eventlet 只在已安装时测试
+
+用法:
+    python -m backend.benchmarks.bench_gunicorn_workers --workers 2 --threads 4 --clients 16 --duration 10
+    python -m backend.benchmarks.bench_gunicorn_workers --worker-classes sync,gthread,gevent
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CONFIG_FILE = os.path.join(PROJECT_ROOT, "backend", "gunicorn.conf.py")
+
+
+def seed(tmp, forms):
+    """创建数据库、测试用户和表单，返回 (应用参数, token, 表单 id)"""
+    from backend.app import create_app
+    from backend.app.models import db
+    from backend.app.models.auth_obj.user import User
+    from backend.app.models.service_obj.standard_form import StandardForm
+
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        "APP_LOG_FILE": os.path.join(tmp, "app.log"),
+        "DB_LOG_FILE": os.path.join(tmp, "database.log"),
+    }
+    app = create_app(overrides)
+    with app.app_context():
+        db.create_all()
+        user = User(email="bench@example.com", password="x")
+        db.session.add(user)
+        db.session.add_all([
+            StandardForm(user.email, "inspection", json.dumps({"name": "Bench", "address": f"{i} Hay St"}))
+            for i in range(forms)
+        ])
+        db.session.commit()
+        token = user.get_auth_token()
+        form_id = db.session.query(StandardForm.id).first()[0]
+        db.engine.dispose()
+    return overrides, token, form_id
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def available_worker_classes():
+    """sync / gthread 总是可用，gevent / eventlet 需要单独安装"""
+    return ["sync", "gthread"] + [name for name in ("gevent", "eventlet") if importlib.util.find_spec(name)]
+
+
+def start_server(overrides, worker_class, workers, threads, port, log_file, extra_env=None):
+    env = dict(os.environ, GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_WORKER_CLASS=worker_class,
+               GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads), GUNICORN_MAX_REQUESTS="0",
+               **(extra_env or {}))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", CONFIG_FILE, f"backend.app:create_app({overrides!r})"],
+        cwd=PROJECT_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn 未能启动")
+
+
+def load(port, paths, headers, clients, duration):
+    """
+    paths 的元素为 GET 路径，或 (method, path, body, content_type) 元组
+    返回吞吐、延迟分位数和错误数（5xx 及连接错误）
+    """
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+
+    def client_loop(offset):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        i = offset
+        while time.monotonic() < deadline:
+            method, path, body, content_type = _as_request(paths[i % len(paths)])
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body,
+                             headers={**headers, "Content-Type": content_type} if content_type else headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    errors.append(response.status)
+                else:
+                    latencies.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                errors.append(0)
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+
+    pool = [threading.Thread(target=client_loop, args=(n,)) for n in range(clients)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    latencies.sort()
+    return {
+        "requests_per_sec": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies or [0]) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+def _as_request(item):
+    return ("GET", item, None, None) if isinstance(item, str) else item
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gunicorn sync / gthread 基准测试")
+    parser.add_argument("--workers", type=int, default=2, help="worker 进程数")
+    parser.add_argument("--threads", type=int, default=4, help="gthread 每个 worker 的线程数")
+    parser.add_argument("--clients", type=int, default=16, help="并发客户端数")
+    parser.add_argument("--duration", type=float, default=10, help="每种模式运行秒数")
+    parser.add_argument("--forms", type=int, default=200, help="测试用户的表单数")
+    parser.add_argument("--worker-classes", default=",".join(available_worker_classes()),
+                        help="逗号分隔的 worker 类型，默认为已安装的全部类型")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        overrides, token, form_id = seed(tmp, args.forms)
+        headers = {"Authorization": f"Bearer {token}"}
+        paths = ["/api/orders?view=summary", f"/api/orders/{form_id}", "/api/form-query?type=inspection",
+                 "/api/captcha"]
+
+        print(f"🚀 workers={args.workers} threads={args.threads} clients={args.clients} duration={args.duration}s")
+        with open(os.path.join(tmp, "gunicorn.log"), "w") as log_file:
+            for worker_class in args.worker_classes.split(","):
+                port = free_port()
+                proc = start_server(overrides, worker_class, args.workers, args.threads, port, log_file)
+                try:
+                    load(port, paths, headers, args.clients, 1)  # 预热
+                    result = load(port, paths, headers, args.clients, args.duration)
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                print(json.dumps({"worker_class": worker_class, **result}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+列表读取性能对比：ORM（StandardForm.query）vs Core 只读查询（form_reader）
+在临时 SQLite 数据库中生成表单，分别读取 1000 行并转换为订单 dict，
+输出每 1000 行的 CPU 时间（process_time，取中位数）和 tracemalloc 峰值内存
+
+用法:
+    python -m backend.benchmarks.bench_read_path --rows 2000
+"""
+
+import argparse
+import json
+import statistics
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+
+from backend.app import create_app, db
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.services.form_reader import ORDER_COLUMNS, select_forms, fetch_rows
+from backend.app.services.order_handler import form_to_order
+
+EMAIL = "bench@example.com"
+
+
+def seed(rows):
+    data = json.dumps({"name": "Bench User", "phone": "0400000000", "address": "35 Stirling Hwy, Crawley WA 6009",
+                       "appointmentDate": "2030-05-01T10:00", "checklist[]": ["检查水电", "检查门窗"]},
+                      ensure_ascii=False)
+    db.session.execute(insert(StandardForm), [
+        {"email": EMAIL, "form_type": "inspection", "form_data": data, "files": "{}", "status": "pending",
+         "contact_name": "Bench User", "address": "35 Stirling Hwy"}
+        for _ in range(rows)
+    ])
+    db.session.commit()
+
+
+def read_orm(limit):
+    forms = StandardForm.query.filter_by(email=EMAIL).order_by(StandardForm.created_gmt.desc()).limit(limit).all()
+    return [form_to_order(form) for form in forms]
+
+
+def read_core(limit):
+    stmt = select_forms(ORDER_COLUMNS).filter(StandardForm.email == EMAIL) \
+        .order_by(StandardForm.created_gmt.desc()).limit(limit)
+    return [form_to_order(row) for row in fetch_rows(stmt)]
+
+
+def measure(reader, limit, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.process_time()
+        reader(limit)
+        timings.append((time.process_time() - start) * 1000)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    reader(limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return statistics.median(timings), peak
+
+
+def main(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "APP_LOG_FILE": os.path.join(tmp, 'app.log'),
+            "DB_LOG_FILE": os.path.join(tmp, 'database.log'),
+        })
+        with app.app_context():
+            db.create_all()
+            seed(rows)
+            scale = 1000 / rows
+            print(f"{'路径':<6}{'CPU ms / 1000 行':>18}{'峰值内存 KiB / 1000 行':>24}")
+            for name, reader in (("ORM", read_orm), ("Core", read_core)):
+                cpu_ms, peak = measure(reader, rows, repeat)
+                print(f"{name:<6}{cpu_ms * scale:>18.2f}{peak / 1024 * scale:>24.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="列表读取性能对比（ORM vs Core）")
+    parser.add_argument("--rows", type=int, default=1000, help="每次读取的行数")
+    parser.add_argument("--repeat", type=int, default=20, help="CPU 时间测量次数")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+写入协调基准测试
+模拟 P 个 gunicorn worker 进程 × 每进程 T 个并发请求持续提交表单，
+对比逐条提交（默认）与单写线程合并提交（WRITE_COORDINATION）的吞吐和延迟
+
+用法:
+    python -m backend.benchmarks.bench_write_coordination --processes 4 --threads 8 --duration 10
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+FORM_DATA = json.dumps({
+    "name": "Bench User",
+    "address": "35 Stirling Hwy, Crawley WA 6009",
+    "phone": "0400123456",
+    "remarks": "x" * 512,
+}, ensure_ascii=False)
+
+
+def worker_process(db_url, log_dir, coordinated, threads, duration, result_queue):
+    from backend.app import create_app
+    from backend.app.models.service_obj.standard_form import StandardForm
+    from backend.app.utils.write_coordinator import run_write
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": db_url,
+        "APP_LOG_FILE": os.path.join(log_dir, "app.log"),
+        "DB_LOG_FILE": os.path.join(log_dir, "database.log"),
+        "WRITE_COORDINATION": coordinated,
+    })
+
+    def insert_form(session):
+        session.add(StandardForm(email="bench@example.com", form_type="test", form_data=FORM_DATA))
+
+    latencies = []
+    errors = []
+    deadline = time.monotonic() + duration
+
+    def submit_loop():
+        with app.app_context():
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    run_write(insert_form)
+                    latencies.append(time.perf_counter() - start)
+                except Exception:
+                    errors.append(1)
+
+    pool = [threading.Thread(target=submit_loop) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    result_queue.put((latencies, len(errors)))
+
+
+def run(coordinated, processes, threads, duration):
+    from backend.app import create_app
+    from backend.app.models import db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": db_url,
+            "APP_LOG_FILE": os.path.join(tmp, "app.log"),
+            "DB_LOG_FILE": os.path.join(tmp, "database.log"),
+        })
+        with app.app_context():
+            db.create_all()
+            db.engine.dispose()
+
+        ctx = multiprocessing.get_context("spawn")
+        result_queue = ctx.Queue()
+        procs = [
+            ctx.Process(target=worker_process, args=(db_url, tmp, coordinated, threads, duration, result_queue))
+            for _ in range(processes)
+        ]
+        for p in procs:
+            p.start()
+        latencies, errors = [], 0
+        for _ in procs:
+            proc_latencies, proc_errors = result_queue.get()
+            latencies.extend(proc_latencies)
+            errors += proc_errors
+        for p in procs:
+            p.join()
+
+    latencies.sort()
+    return {
+        "mode": "coordinated" if coordinated else "per-request commit",
+        "writes_per_sec": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies or [0]) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else 0,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else 0,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="写入协调（group commit）基准测试")
+    parser.add_argument("--processes", type=int, default=4, help="worker 进程数")
+    parser.add_argument("--threads", type=int, default=8, help="每个进程的并发请求数")
+    parser.add_argument("--duration", type=float, default=10, help="每种模式运行秒数")
+    args = parser.parse_args()
+
+    print(f"🚀 processes={args.processes} threads={args.threads} duration={args.duration}s")
+    for coordinated in (False, True):
+        print(json.dumps(run(coordinated, args.processes, args.threads, args.duration), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+启动耗时报告
+在子进程中用 python -X importtime 导入应用模块，解析输出，按累计耗时列出最慢的模块，
+并测量冷启动（导入 + create_app）耗时。backend/test/utils/test_startup_budget.py 用同样的函数做预算检查
+
+用法:
+    python -m backend.benchmarks.importtime_report --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import NamedTuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# gunicorn worker 启动时导入的模块（create_app 内注册的 blueprint）
+APP_MODULES = (
+    "backend.app",
+    "backend.app.routes.auth_router",
+    "backend.app.routes.standard_form_router",
+    "backend.app.routes.admin_router",
+)
+
+_COLD_START = """
+import sys, time
+start = time.perf_counter()
+from backend.app import create_app
+create_app({
+    "SQLALCHEMY_DATABASE_URI": "sqlite:///" + sys.argv[1] + "/app.db",
+    "APP_LOG_FILE": sys.argv[1] + "/app.log",
+    "DB_LOG_FILE": sys.argv[1] + "/database.log",
+})
+print(time.perf_counter() - start)
+"""
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def parse_importtime(output: str):
+    """解析 -X importtime 输出（import time: self [us] | cumulative | imported package）"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append(ImportEntry(name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def profile_imports(modules=APP_MODULES):
+    """在干净的子进程中导入 modules，返回 ImportEntry 列表"""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT, env=_env(),
+                            capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def total_import_ms(entries):
+    """顶层导入（depth 0）的累计耗时之和，即导入全部模块的总耗时"""
+    return sum(entry.cumulative_us for entry in entries if entry.depth == 0) / 1000
+
+
+def cold_start_seconds():
+    """子进程中导入并 create_app 的耗时（秒），使用临时数据库和日志目录"""
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run([sys.executable, "-c", _COLD_START, tmp], cwd=PROJECT_ROOT, env=_env(),
+                                capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(top):
+    entries = profile_imports()
+    print(f"导入 {', '.join(APP_MODULES)}：共 {total_import_ms(entries):.1f} ms\n")
+    print(f"{'累计 ms':>10}{'自身 ms':>10}  模块")
+    for entry in sorted(entries, key=lambda entry: entry.cumulative_us, reverse=True)[:top]:
+        print(f"{entry.cumulative_us / 1000:>10.1f}{entry.self_us / 1000:>10.1f}  {'  ' * entry.depth}{entry.module}")
+    print(f"\n冷启动（导入 + create_app）：{cold_start_seconds():.3f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动耗时报告")
+    parser.add_argument("--top", type=int, default=30, help="列出累计耗时最高的模块数")
+    args = parser.parse_args()
+    main(args.top)
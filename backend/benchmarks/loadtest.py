@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+本地压测工具
+在临时 SQLite 数据库中创建普通用户和管理员，用 backend/gunicorn.conf.py 启动应用，Google Tasks 指向本地模拟服务
+（backend/benchmarks/bench_cooperative.py），按目标 RPS 以开环方式（按计划时间发出请求，不等待上一个请求完成）
+回放加权混合流量：验证码、登录、带附件的表单提交、订单列表、订单统计、管理后台列表。
+延迟从计划发出时间算起，服务端排队造成的等待也计入延迟（避免协调遗漏 coordinated omission）。
+各接口的请求数、吞吐、p50/p95/p99 延迟和错误率写入 JSON 文件，可用 --compare 与上一次结果对比
+
+用法:
+    python -m backend.benchmarks.loadtest --rps 50 --duration 30 --output loadtest.json
+    python -m backend.benchmarks.loadtest --mix orders=60,login=10,form_submit=30 --worker-class gthread
+    python -m backend.benchmarks.loadtest --compare before.json after.json
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from http.cookies import SimpleCookie
+
+from backend.benchmarks.bench_cooperative import start_upstream, write_token
+from backend.benchmarks.bench_gunicorn_workers import available_worker_classes, free_port, start_server
+
+PASSWORD = "LoadTest#2024"
+
+# 场景名 -> 默认权重
+DEFAULT_MIX = {
+    "captcha": 10,
+    "login": 5,
+    "form_submit": 15,
+    "orders": 35,
+    "order_stats": 15,
+    "admin_forms": 12,
+    "admin_users": 8,
+}
+
+
+def parse_mix(text):
+    """解析 name=weight,... 为权重 dict，未知场景或非正权重抛出 ValueError"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario: {name}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+        if mix[name] <= 0:
+            raise ValueError(f"Weight must be positive: {item}")
+    return mix
+
+
+def encode_multipart(fields, files):
+    """
+    编码 multipart/form-data 请求体
+    :param fields: 普通字段 dict
+    :param files: [(字段名, 文件名, bytes)]
+    :return: (body, content_type)
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, filename, content in files:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def summarize(samples, duration):
+    """
+    :param samples: {接口: [(延迟秒, 状态码)]}，状态码 0 表示连接错误
+    :return: {接口: 统计}，另含 _total 汇总；非 2xx（包括重定向到登录页）都计为错误
+    """
+    def stats(entries):
+        latencies = sorted(latency for latency, _ in entries)
+        statuses = Counter(str(status) for _, status in entries)
+        errors = sum(1 for _, status in entries if not 200 <= status < 300)
+        return {
+            "requests": len(entries),
+            "throughput_rps": round(len(entries) / duration, 2),
+            "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else 0,
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "errors": errors,
+            "error_rate": round(errors / len(entries), 4) if entries else 0,
+            "status_codes": dict(sorted(statuses.items())),
+        }
+
+    report = {endpoint: stats(entries) for endpoint, entries in sorted(samples.items())}
+    report["_total"] = stats([entry for entries in samples.values() for entry in entries])
+    return report
+
+
+def seed(tmp, users, forms_per_user):
+    """创建数据库、角色、普通用户（含若干表单）和管理员，返回 (app, 应用参数, 普通用户 [(email, token)], 管理员邮箱)"""
+    from flask_security.utils import hash_password
+
+    from backend.app import create_app
+    from backend.app.models import db
+    from backend.app.models.auth_obj.user import Role, User
+    from backend.app.models.service_obj.standard_form import StandardForm
+
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'loadtest.db')}",
+        "APP_LOG_FILE": os.path.join(tmp, "app.log"),
+        "DB_LOG_FILE": os.path.join(tmp, "database.log"),
+        "UPLOAD_FOLDER": os.path.join(tmp, "uploads"),
+    }
+    app = create_app(overrides)
+    with app.app_context():
+        db.create_all()
+        admin_role = Role(code="admin", display_name="系统管理员", level=0)
+        user_role = Role(code="user", display_name="普通用户", level=40)
+        db.session.add_all([admin_role, user_role])
+
+        password = hash_password(PASSWORD)  # 哈希较慢，所有用户共用同一个密码
+        accounts = [User(email=f"load{i}@example.com", password=password, roles=[user_role]) for i in range(users)]
+        admin = User(email="load-admin@example.com", password=password, roles=[admin_role])
+        db.session.add_all(accounts + [admin])
+        db.session.add_all([
+            StandardForm(user.email, "inspection", json.dumps({"name": f"Load {i}", "address": f"{i} Hay St"}))
+            for user in accounts for i in range(forms_per_user)
+        ])
+        db.session.commit()
+        tokens = [(user.email, user.get_auth_token()) for user in accounts]
+        admin_email = admin.email
+        db.engine.dispose()
+    return app, overrides, tokens, admin_email
+
+
+class Client:
+    """单个压测线程的 keep-alive 连接和 cookie"""
+
+    def __init__(self, port):
+        self.port = port
+        self.cookies = {}
+        self.admin = None
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+            return 0, b""
+        for header in response.headers.get_all("Set-Cookie") or []:
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        return response.status, data
+
+    def close(self):
+        self.conn.close()
+        if self.admin is not None:
+            self.admin.close()
+
+
+class Scenarios:
+    """
+    每个场景方法执行一次用户操作，返回 [(接口名, 状态码)]（登录包含获取验证码和登录两个请求）
+    """
+
+    def __init__(self, app, tokens, admin_email, file_kb):
+        self.session_serializer = app.session_interface.get_signing_serializer(app)
+        self.session_cookie = app.config["SESSION_COOKIE_NAME"]
+        self.tokens = tokens
+        self.admin_email = admin_email
+        self.admin_cookies = {}
+        self.attachment = os.urandom(file_kb * 1024)
+
+    def _user_headers(self, rng):
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)[1]}"}
+
+    def captcha(self, client, rng):
+        status, _ = client.request("GET", "/api/captcha")
+        return [("GET /api/captcha", status)]
+
+    def _login(self, client, email):
+        captcha_status, _ = client.request("GET", "/api/captcha")
+        # 压测工具与服务端使用同一个 SECRET_KEY，可以从签名 session cookie 中读出验证码
+        session = self.session_serializer.loads(client.cookies.get(self.session_cookie, "")) \
+            if captcha_status == 200 else {}
+        body = json.dumps({"email": email, "password": PASSWORD, "captcha": session.get("captcha_code")})
+        status, _ = client.request("POST", "/api/login", body, {"Content-Type": "application/json"})
+        return [("GET /api/captcha", captcha_status), ("POST /api/login", status)]
+
+    def login_admin(self, port):
+        """管理后台使用 session 登录：压测开始前以管理员登录一次，各线程共用该 session cookie"""
+        client = Client(port)
+        results = self._login(client, self.admin_email)
+        client.close()
+        if results[-1][1] != 200:
+            raise RuntimeError(f"管理员登录失败: {results}")
+        self.admin_cookies = dict(client.cookies)
+
+    def _admin_client(self, client):
+        """管理后台请求使用单独的连接和管理员 cookie，不影响 login 场景的 session"""
+        if client.admin is None:
+            client.admin = Client(client.port)
+            client.admin.cookies = dict(self.admin_cookies)
+        return client.admin
+
+    def login(self, client, rng):
+        return self._login(client, rng.choice(self.tokens)[0])
+
+    def form_submit(self, client, rng):
+        if rng.random() < 0.5:
+            fields = {"formType": "inspection", "address": "35 Stirling Hwy, Crawley WA 6009",
+                      "appointmentDate": "2030-05-02T10:00", "name": "Load Test", "phone": "0400123456"}
+        else:
+            fields = {"formType": "airportPickup", "wx_name": "LoadWX", "flight_number": "CA1234",
+                      "pickup_time": "2030-05-02T10:00", "contact_phone": "0400123456",
+                      "destination": "123 Main St, Perth WA"}
+        body, content_type = encode_multipart(fields, [("attachment", "photo.jpg", self.attachment)])
+        status, _ = client.request("POST", "/api/form-submit", body,
+                                   {**self._user_headers(rng), "Content-Type": content_type})
+        return [("POST /api/form-submit", status)]
+
+    def orders(self, client, rng):
+        view = rng.choice(("summary", "full"))
+        status, _ = client.request("GET", f"/api/orders?view={view}", headers=self._user_headers(rng))
+        return [("GET /api/orders", status)]
+
+    def order_stats(self, client, rng):
+        status, _ = client.request("GET", "/api/orders/stats", headers=self._user_headers(rng))
+        return [("GET /api/orders/stats", status)]
+
+    def admin_forms(self, client, rng):
+        status, _ = self._admin_client(client).request("GET", "/admin/forms?form_type=inspection")
+        return [("GET /admin/forms", status)]
+
+    def admin_users(self, client, rng):
+        status, _ = self._admin_client(client).request("GET", "/admin/users")
+        return [("GET /admin/users", status)]
+
+
+def run_load(port, scenarios, mix, rps, duration, concurrency, seed_value=0):
+    """
+    开环压测：第 i 个请求计划在 start + i / rps 发出，由 concurrency 个线程中空闲的一个执行；
+    线程都在忙时请求延后发出，延迟仍从计划时间算起。同一 seed_value 下场景序列相同
+    返回 {接口: [(延迟秒, 状态码)]}
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = defaultdict(list)
+    samples_lock = threading.Lock()
+    counter = itertools.count()
+    start = time.perf_counter() + 0.1
+    total = int(rps * duration)
+
+    def worker():
+        client = Client(port)
+        while True:
+            i = next(counter)
+            if i >= total:
+                break
+            rng = random.Random(seed_value * 1_000_003 + i)
+            scenario = getattr(scenarios, rng.choices(names, weights)[0])
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            results = scenario(client, rng)
+            latency = time.perf_counter() - scheduled
+            with samples_lock:
+                for endpoint, status in results:
+                    samples[endpoint].append((latency, status))
+        client.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_file, new_file):
+    """逐接口打印两次结果的吞吐和延迟变化"""
+    with open(old_file) as f:
+        old = json.load(f)["endpoints"]
+    with open(new_file) as f:
+        new = json.load(f)["endpoints"]
+    metrics = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "error_rate")
+    print(f"{'endpoint':<26}" + "".join(f"{metric:>28}" for metric in metrics))
+    for endpoint in sorted(old.keys() | new.keys()):
+        cells = []
+        for metric in metrics:
+            before, after = old.get(endpoint, {}).get(metric), new.get(endpoint, {}).get(metric)
+            if before is None or after is None:
+                cells.append(f"{'-' if before is None else before} -> {'-' if after is None else after}")
+            else:
+                change = f" ({(after - before) / before:+.0%})" if before else ""
+                cells.append(f"{before} -> {after}{change}")
+        print(f"{endpoint:<26}" + "".join(f"{cell:>28}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地压测：按目标 RPS 回放加权混合流量")
+    parser.add_argument("--rps", type=float, default=50, help="目标请求速率（每秒用户操作数）")
+    parser.add_argument("--duration", type=float, default=30, help="压测秒数")
+    parser.add_argument("--concurrency", type=int, default=64, help="最多同时进行的用户操作数")
+    parser.add_argument("--mix", default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+                        help="场景权重，name=weight 逗号分隔")
+    parser.add_argument("--users", type=int, default=50, help="普通用户数")
+    parser.add_argument("--forms-per-user", type=int, default=20, help="每个用户预置的表单数")
+    parser.add_argument("--file-kb", type=int, default=64, help="表单附件大小（KB）")
+    parser.add_argument("--upstream-ms", type=int, default=150, help="模拟 Google Tasks API 的响应延迟（毫秒）")
+    parser.add_argument("--worker-class", default="gthread", choices=available_worker_classes())
+    parser.add_argument("--workers", type=int, default=2, help="worker 进程数")
+    parser.add_argument("--threads", type=int, default=4, help="gthread 每个 worker 的线程数")
+    parser.add_argument("--seed", type=int, default=0, help="场景序列的随机种子")
+    parser.add_argument("--output", default="loadtest.json", help="结果 JSON 文件")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="对比两个结果文件后退出")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    mix = parse_mix(args.mix)
+    upstream = start_upstream(args.upstream_ms / 1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        app, overrides, tokens, admin_email = seed(tmp, args.users, args.forms_per_user)
+        token_file = os.path.join(tmp, "google_token.json")
+        write_token(token_file)
+        extra_env = {
+            "GOOGLE_TASKS_TOKEN_FILE": token_file,
+            "GOOGLE_TASKS_API_ENDPOINT": f"http://127.0.0.1:{upstream.server_port}/",
+            "GOOGLE_TASKS_NUM_RETRIES": "0",
+        }
+        scenarios = Scenarios(app, tokens, admin_email, args.file_kb)
+
+        port = free_port()
+        print(f"🚀 rps={args.rps} duration={args.duration}s worker_class={args.worker_class} "
+              f"workers={args.workers} threads={args.threads} mix={mix}")
+        with open(os.path.join(tmp, "gunicorn.log"), "w") as log_file:
+            proc = start_server(overrides, args.worker_class, args.workers, args.threads, port, log_file, extra_env)
+            try:
+                scenarios.login_admin(port)
+                run_load(port, scenarios, mix, min(args.rps, 10), 1, args.concurrency, args.seed + 1)  # 预热
+                started = time.perf_counter()
+                samples = run_load(port, scenarios, mix, args.rps, args.duration, args.concurrency, args.seed)
+                elapsed = time.perf_counter() - started
+            finally:
+                proc.terminate()
+                proc.wait()
+    upstream.shutdown()
+
+    result = {
+        "config": {
+            "rps": args.rps, "duration": args.duration, "concurrency": args.concurrency, "mix": mix,
+            "users": args.users, "forms_per_user": args.forms_per_user, "file_kb": args.file_kb,
+            "upstream_ms": args.upstream_ms, "worker_class": args.worker_class, "workers": args.workers,
+            "threads": args.threads, "seed": args.seed, "revision": git_revision(),
+        },
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": summarize(samples, elapsed),
+    }
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+    for endpoint, stats in result["endpoints"].items():
+        print(f"{endpoint:<26} {stats['requests']:>6} req {stats['throughput_rps']:>8} rps  p50 {stats['p50_ms']:>8} ms"
+              f"  p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  errors {stats['error_rate']:.2%}")
+    print(f"\n📄 结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
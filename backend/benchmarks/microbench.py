@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+热点函数微基准
+覆盖每个请求都会调用的函数：token 校验、角色继承、模型 to_dict、订单转换、上传目录、Google 任务内容、表单规整。
+在临时 SQLite 数据库中按数据规模（small / large：角色层级深度、表单字段数、检查项数、列表行数）准备数据，
+每个基准先校准循环次数使单个样本不少于 --min-time 秒，再取 --repeat 个样本的中位数（pyperf 的做法）。
+结果可保存为基线（backend/benchmarks/baselines/microbench.json），--compare 与基线对比，
+中位数变慢超过阈值的基准标记为回归并以退出码 1 结束，可用于 CI
+
+用法:
+    python -m backend.benchmarks.microbench
+    python -m backend.benchmarks.microbench --filter to_dict --sizes large
+    python -m backend.benchmarks.microbench --save-baseline
+    python -m backend.benchmarks.microbench --compare --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from werkzeug.datastructures import MultiDict
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "microbench.json")
+
+# 数据规模：角色继承深度、用户角色数、表单额外字段数、检查项数、列表行数
+SIZES = {
+    "small": {"role_depth": 2, "user_roles": 1, "extra_fields": 5, "checklist": 3, "rows": 20},
+    "large": {"role_depth": 6, "user_roles": 4, "extra_fields": 60, "checklist": 40, "rows": 500},
+}
+
+# 基准名 -> setup(ctx)，setup 用 Context 中的数据构造并返回无参的被测函数
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def inspection_fields(size):
+    fields = MultiDict([
+        ("formType", "inspection"), ("address", "35 Stirling Hwy, Crawley WA 6009"),
+        ("appointmentDate", "2030-05-02T10:00"), ("name", "Bench User"), ("phone", "0400123456"),
+        ("email", "bench@example.com"), ("remark", "bench"),
+    ])
+    for i in range(size["checklist"]):
+        fields.add("checklist[]", f"检查项 {i}")
+    for i in range(size["extra_fields"]):
+        fields.add(f"note_{i}", f"value {i} " * 4)
+    return fields
+
+
+class Context:
+    """
+    基准数据：临时数据库中的角色链、用户、表单，以及 app / 请求上下文
+    每种规模单独建库，setup 中可直接使用 ORM 对象（已加载关系，不再触发查询）
+    """
+
+    def __init__(self, size_name):
+        from backend.app import create_app
+        from backend.app.models import db
+        from backend.app.models.auth_obj.user import Role, User
+        from backend.app.models.service_obj.standard_form import StandardForm
+        from backend.app.services.form_schema import indexed_columns, normalize_form
+
+        self.size = SIZES[size_name]
+        self._tmp = tempfile.TemporaryDirectory()
+        self._stack = contextlib.ExitStack()
+        self.app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self._tmp.name, 'microbench.db')}",
+            "APP_LOG_FILE": os.path.join(self._tmp.name, "app.log"),
+            "DB_LOG_FILE": os.path.join(self._tmp.name, "database.log"),
+        })
+        self._stack.enter_context(self.app.test_request_context())
+        db.create_all()
+
+        # 角色继承链 role0（最高）<- role1 <- ...，共 role_depth 层，用户持有最底层角色
+        parent = None
+        chain = []
+        for level in range(self.size["role_depth"]):
+            role = Role(code=f"role{level}", display_name=f"Role {level}", level=level, parent=parent)
+            chain.append(role)
+            parent = role
+        extra = [Role(code=f"extra{i}", display_name=f"Extra {i}", level=50 + i)
+                 for i in range(self.size["user_roles"] - 1)]
+        self.user = User(email="bench@example.com", password="x", name="Bench", roles=[chain[-1]] + extra)
+        db.session.add_all(chain + extra + [self.user])
+
+        form = normalize_form("inspection", inspection_fields(self.size))
+        db.session.add_all([
+            StandardForm(self.user.email, "inspection", json.dumps(form.data, ensure_ascii=False),
+                         **indexed_columns("inspection", form.data))
+            for _ in range(self.size["rows"])
+        ])
+        db.session.commit()
+
+        self.role = chain[-1]
+        self.token = self.user.get_auth_token()
+        self.forms = StandardForm.query.all()
+        self.user.to_dict()  # 预先加载角色关系
+
+    def close(self):
+        from backend.app.models import db
+
+        db.session.remove()
+        db.engine.dispose()
+        self._stack.close()
+        self._tmp.cleanup()
+
+
+@benchmark("verify_token")
+def bench_verify_token(ctx):
+    from backend.app.utils.auth_utils import verify_token
+    return lambda: verify_token(ctx.token)
+
+
+@benchmark("User.has_role")
+def bench_has_role(ctx):
+    # 最坏情况：需要沿继承链查到最顶层角色
+    return lambda: ctx.user.has_role("role0")
+
+
+@benchmark("User.to_dict")
+def bench_user_to_dict(ctx):
+    return ctx.user.to_dict
+
+
+@benchmark("Role.get_inherited_role_codes")
+def bench_inherited_role_codes(ctx):
+    return ctx.role.get_inherited_role_codes
+
+
+@benchmark("BaseModel.to_dict")
+def bench_base_to_dict(ctx):
+    """StandardForm 继承的通用 to_dict（每个字符串字段都尝试 json.loads），遍历 rows 行"""
+    return lambda: [form.to_dict() for form in ctx.forms]
+
+
+@benchmark("form_to_order")
+def bench_form_to_order(ctx):
+    """订单列表：Core 查询的 Row 转换为输出 dict，遍历 rows 行"""
+    from backend.app.services.form_reader import ORDER_COLUMNS, fetch_rows, select_forms
+    from backend.app.services.order_handler import form_to_order
+
+    rows = fetch_rows(select_forms(ORDER_COLUMNS))
+    return lambda: [form_to_order(row) for row in rows]
+
+
+@benchmark("email_to_folder")
+def bench_email_to_folder(ctx):
+    from backend.app.services.standard_form_handler import email_to_folder
+    return lambda: email_to_folder(" Bench.User@Example.com ")
+
+
+@benchmark("inspection.create_task_body")
+def bench_inspection_task_body(ctx):
+    from backend.app.models.service_obj.inspection_obj import RegisterInfo
+    from backend.app.services.form_schema import normalize_form
+    from backend.app.services.inspection_handler import create_task_body
+
+    register_info = RegisterInfo(data=normalize_form("inspection", inspection_fields(ctx.size)).values)
+    return lambda: create_task_body(register_info)
+
+
+@benchmark("transfer.create_task_body")
+def bench_transfer_task_body(ctx):
+    from backend.app.models.service_obj.transfer_obj import AirportPickupInfo
+    from backend.app.services.transfer_handler import create_task_body
+
+    pickup_info = AirportPickupInfo(data={
+        "wx_name": "BenchWX", "flight_number": "CA1234", "pickup_time": datetime(2030, 5, 2, 10),
+        "contact_phone": "0400123456", "destination": "123 Main St, Perth WA", "luggage_info": "28寸箱子x2",
+    })
+    return lambda: create_task_body(pickup_info)
+
+
+@benchmark("format_checklist")
+def bench_format_checklist(ctx):
+    """数据库中的检查清单为 JSON 字符串"""
+    from backend.app.services.inspection_handler import format_checklist
+
+    checklist = json.dumps([f"检查项 {i}" for i in range(ctx.size["checklist"])], ensure_ascii=False)
+    return lambda: format_checklist(checklist)
+
+
+@benchmark("save_form.normalize")
+def bench_save_form_normalize(ctx):
+    """save_form 入库前的字段处理：规整 multipart 字段、序列化 form_data、提取索引列"""
+    from backend.app.services.form_schema import indexed_columns, normalize_form
+
+    fields = inspection_fields(ctx.size)
+
+    def normalize():
+        form = normalize_form(fields.get("formType"), fields, remark=fields.get("remark"))
+        json.dumps(form.data, ensure_ascii=False)
+        indexed_columns(form.form_type, form.data)
+    return normalize
+
+
+def measure(fn, min_time, repeat):
+    """校准循环次数使单个样本不少于 min_time 秒，返回 (每次调用耗时样本 [秒], 循环次数)"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return samples, loops
+
+
+def run(sizes, name_filter=None, min_time=0.05, repeat=7):
+    """运行匹配 name_filter 的基准，返回 {"名称[规模]": {"median_us", "stdev_us", "loops"}}"""
+    results = {}
+    for size_name in sizes:
+        ctx = Context(size_name)
+        try:
+            for name, setup in BENCHMARKS.items():
+                if name_filter and name_filter not in name:
+                    continue
+                samples, loops = measure(setup(ctx), min_time, repeat)
+                results[f"{name}[{size_name}]"] = {
+                    "median_us": round(statistics.median(samples) * 1e6, 3),
+                    "stdev_us": round(statistics.stdev(samples) * 1e6, 3) if len(samples) > 1 else 0,
+                    "loops": loops,
+                }
+        finally:
+            ctx.close()
+    return results
+
+
+def compare_results(baseline, current, threshold):
+    """
+    对比中位数，返回 [(名称, 基线 µs, 当前 µs, 变化比例, 是否回归)]，只包含两边都有的基准
+    变化比例 = 当前 / 基线 - 1，大于 threshold 为回归
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name]["median_us"], current[name]["median_us"]
+        change = after / before - 1 if before else 0
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def environment():
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="热点函数微基准")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="逗号分隔的数据规模")
+    parser.add_argument("--filter", help="只运行名称包含该字符串的基准")
+    parser.add_argument("--min-time", type=float, default=0.05, help="单个样本最少耗时（秒）")
+    parser.add_argument("--repeat", type=int, default=7, help="样本数")
+    parser.add_argument("--output", help="结果写入 JSON 文件")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="基线文件")
+    parser.add_argument("--save-baseline", action="store_true", help="把结果保存为基线")
+    parser.add_argument("--compare", action="store_true", help="与基线对比，有回归时退出码为 1")
+    parser.add_argument("--threshold", type=float, default=0.15, help="回归阈值（中位数变慢比例）")
+    args = parser.parse_args()
+
+    results = run(args.sizes.split(","), args.filter, args.min_time, args.repeat)
+    report = {"environment": environment(), "results": results}
+
+    print(f"{'benchmark':<42}{'median µs':>12}{'stdev µs':>12}{'loops':>10}")
+    for name, stats in results.items():
+        print(f"{name:<42}{stats['median_us']:>12.2f}{stats['stdev_us']:>12.2f}{stats['loops']:>10}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        print(f"\n📄 基线已保存到 {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["environment"] != report["environment"]:
+            print(f"\n⚠️ 基线环境 {baseline['environment']} 与当前 {report['environment']} 不同，结果仅供参考")
+        rows = compare_results(baseline["results"], results, args.threshold)
+        print(f"\n{'benchmark':<42}{'baseline µs':>14}{'current µs':>14}{'change':>10}")
+        for name, before, after, change, regressed in rows:
+            print(f"{name:<42}{before:>14.2f}{after:>14.2f}{change:>+10.1%}{'  ❌ regression' if regressed else ''}")
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} 个基准变慢超过 {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ 没有超过 {args.threshold:.0%} 的回归")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Gunicorn 生产配置
+用法（见 deploy/easyaussie.service）:
+    gunicorn -c backend/gunicorn.conf.py backend.app.app:app
+
+所有选项都可用环境变量覆盖：
+    GUNICORN_BIND                  监听地址，默认 0.0.0.0:8080
+    GUNICORN_WORKER_CLASS          sync（默认）/ gthread / gevent / eventlet
+    GUNICORN_WORKERS               worker 数，默认 sync 为 CPU*2+1，其它为 CPU+1
+    GUNICORN_THREADS               gthread 每个 worker 的线程数，默认 4
+    GUNICORN_WORKER_CONNECTIONS    gevent / eventlet 每个 worker 同时处理的连接数，默认 200
+    GUNICORN_PRELOAD               是否在 master 中预加载应用，默认 1
+    GUNICORN_MAX_REQUESTS          处理多少请求后重启 worker（防止内存缓慢增长），默认 2000，0 为不重启
+    GUNICORN_MAX_REQUESTS_JITTER   重启阈值随机抖动，避免所有 worker 同时重启，默认 200
+    GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT / GUNICORN_KEEPALIVE
+
+预加载（preload_app）时应用只在 master 中导入和初始化一次，worker fork 后与 master 共享只读内存页；
+gc.freeze() 把预加载产生的对象移出 GC 跟踪，避免 worker 中的垃圾回收写入这些对象的引用计数头，
+触发写时复制（copy-on-write）导致共享页被逐个复制
+
+gevent / eventlet（需另行 pip install）适合等待外部 IO（Google Tasks、数据库）为主的负载：
+- 在加载应用之前 monkey patch，preload 时模块级创建的锁、线程等也是协作式的
+- 数据库连接池限制同时访问数据库的 greenlet 数，其余在池中排队（排队等待同样会让出）
+- psycopg2 注册等待回调（backend/app/utils/db_utils.py: make_psycopg2_cooperative）
+- 密码哈希、验证码绘制由 backend/app/utils/offload.py 放到系统线程池，不阻塞 hub
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _patch_cooperative(runtime):
+    """尽早 monkey patch 标准库（gunicorn 在 worker 中会再次 patch，重复调用无副作用）"""
+    if runtime == "gevent":
+        from gevent import monkey
+        monkey.patch_all()
+    else:
+        import eventlet
+        eventlet.monkey_patch()
+
+    from backend.app.utils.db_utils import make_psycopg2_cooperative
+    make_psycopg2_cooperative()
+
+
+COOPERATIVE_WORKER_CLASSES = ("gevent", "eventlet")
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8080")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+
+if worker_class == "gthread":
+    threads = _env_int("GUNICORN_THREADS", 4)
+    workers = _env_int("GUNICORN_WORKERS", cpu_count + 1)
+    # 每个线程同时最多占用一个数据库连接，连接池至少要容纳全部线程（须在加载应用、读取配置之前设置）
+    os.environ.setdefault("DB_POOL_SIZE", str(threads))
+elif worker_class in COOPERATIVE_WORKER_CLASSES:
+    threads = 1
+    workers = _env_int("GUNICORN_WORKERS", cpu_count + 1)
+    worker_connections = _env_int("GUNICORN_WORKER_CONNECTIONS", 200)
+    # 连接数固定上限（不溢出），避免大量 greenlet 同时建连压垮数据库；排队超过 DB_POOL_TIMEOUT 秒才报错
+    os.environ.setdefault("DB_POOL_SIZE", "10")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+    _patch_cooperative(worker_class)
+else:
+    threads = 1
+    workers = _env_int("GUNICORN_WORKERS", cpu_count * 2 + 1)
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 200)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# 预加载期间暂停 GC，避免在冻结前回收产生内存碎片（冻结后在 when_ready 中恢复）
+if preload_app:
+    gc.disable()
+
+# worker 心跳文件放在内存文件系统，避免磁盘 IO 抖动导致 worker 被误判超时
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def when_ready(server):
+    """master 就绪（preload 时应用已加载）、fork worker 之前"""
+    if preload_app:
+        _warm_up(server.app.wsgi())
+        gc.freeze()
+        gc.enable()
+        server.log.info(f"Preloaded app, frozen {gc.get_freeze_count()} objects | "
+                        f"worker_class={worker_class} workers={workers} threads={threads}")
+
+
+def post_fork(server, worker):
+    """
+    worker fork 之后：丢弃继承自 master 的数据库连接，由 worker 重新建立
+    （random 在 fork 后由 Python 自动重新播种，各 worker 的验证码序列互不相同；写入协调线程按进程懒启动）
+    """
+    if preload_app:
+        from backend.app.utils.db_utils import dispose_engines
+        dispose_engines(server.app.wsgi())
+
+
+def _warm_up(app):
+    """在 master 中预先填充只读缓存，worker 直接共享，不必各自重新计算"""
+    from backend.app.utils.compression import available_encoders
+
+    available_encoders(app.config["COMPRESS_LEVEL"])
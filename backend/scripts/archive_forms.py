@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+归档历史表单
+把结束状态（已完成 / 已取消 / 已拒绝）且长期未更新的表单移入 standard_form_archive，
+每批在独立事务中提交，可定时执行（例如每天一次的 cron）；--vacuum 在 SQLite 上回收空间
+"""
+
+import argparse
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import text
+
+from backend.app import create_app, db
+from backend.app.services.archive_handler import archive_forms
+
+
+def run(days, batch_size, max_batches, vacuum):
+    app = create_app()
+
+    with app.app_context():
+        total = archive_forms(days, batch_size, max_batches)
+        print(f"归档完成：共归档 {total} 条表单")
+
+        if vacuum and total and db.engine.dialect.name == "sqlite":
+            # VACUUM 不能在事务中执行，需要独占数据库，建议在低峰期使用
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text("VACUUM"))
+            print("VACUUM 完成")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="归档历史表单")
+    parser.add_argument("--days", type=int, default=None, help="超过该天数未更新才归档（默认 FORM_ARCHIVE_AFTER_DAYS）")
+    parser.add_argument("--batch-size", type=int, default=None, help="每批归档的表单数（默认 FORM_ARCHIVE_BATCH_SIZE）")
+    parser.add_argument("--max-batches", type=int, default=None, help="本次最多执行的批数")
+    parser.add_argument("--vacuum", action="store_true", help="归档后执行 VACUUM 回收空间（仅 SQLite）")
+    args = parser.parse_args()
+    run(args.days, args.batch_size, args.max_batches, args.vacuum)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+回填表单索引列
+从历史表单的 form_data 提取 contact_name / contact_phone / address / service_date
+（字段映射见 backend/app/services/form_schema.py 的 INDEXED_FIELDS），可重复执行
+"""
+
+import argparse
+import json
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import select, update
+
+from backend.app import create_app
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.services.form_schema import indexed_columns
+from backend.app.utils.write_coordinator import run_write
+
+
+def _backfill_batch(session, after_id, batch_size):
+    rows = session.execute(
+        select(StandardForm.id, StandardForm.form_type, StandardForm.form_data)
+        .where(StandardForm.id > after_id)
+        .order_by(StandardForm.id)
+        .limit(batch_size)
+    ).all()
+
+    updates = []
+    for row in rows:
+        try:
+            data = json.loads(row.form_data)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(data, dict):
+            updates.append({"id": row.id, **indexed_columns(row.form_type, data)})
+
+    # 按主键批量更新（ORM bulk UPDATE，executemany）
+    if updates:
+        session.execute(update(StandardForm), updates)
+    return (rows[-1].id if rows else None), len(updates)
+
+
+def backfill_form_columns(batch_size):
+    app = create_app()
+
+    with app.app_context():
+        after_id, total = 0, 0
+        while True:
+            last_id, updated = run_write(_backfill_batch, after_id, batch_size)
+            if last_id is None:
+                break
+            after_id = last_id
+            total += updated
+            print(f"已处理到表单 {last_id}：更新 {updated} 条")
+
+        print(f"回填完成：共更新 {total} 条表单")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="回填表单索引列")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理的表单数")
+    args = parser.parse_args()
+    backfill_form_columns(args.batch_size)
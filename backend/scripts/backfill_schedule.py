@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+回填预约日程投影
+把历史 inspection / airportPickup 表单的 form_data 投影到 register_info / airport_pickup_info 表
+可重复执行：已投影的表单会被跳过，每批在独立事务中提交
+"""
+
+import argparse
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from backend.app import create_app
+from backend.app.services.schedule_handler import project_pending
+from backend.app.utils.write_coordinator import run_write
+
+
+def backfill_schedule(batch_size):
+    app = create_app()
+
+    with app.app_context():
+        after_id, total_projected, total_skipped = 0, 0, 0
+        while True:
+            last_id, projected, skipped = run_write(project_pending, after_id, batch_size)
+            if last_id is None:
+                break
+            after_id = last_id
+            total_projected += projected
+            total_skipped += skipped
+            print(f"已处理到表单 {last_id}：投影 {projected} 条，跳过 {skipped} 条")
+
+        print(f"回填完成：共投影 {total_projected} 条，跳过 {total_skipped} 条（详见 database.log）")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="回填预约日程投影")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理的表单数")
+    args = parser.parse_args()
+    backfill_schedule(args.batch_size)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+压缩历史表单数据
+按 id 分批把 standard_form.form_data / files 中未压缩的值改写为 CompressedText 压缩格式，
+每批独立提交并可设置间隔，服务运行期间也可执行；--measure 输出改写前后的存储大小和读取耗时
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import select, update, func, text, table, column, Integer, LargeBinary
+
+from backend.app import create_app, db
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.utils.compressed_text import compress_text, decompress_text, is_compressed
+from backend.app.utils.write_coordinator import run_write
+
+# 按原始字节读写，绕过 CompressedText 的自动编解码
+raw_forms = table(
+    'standard_form',
+    column('id', Integer()),
+    column('form_data', LargeBinary()),
+    column('files', LargeBinary()),
+)
+COLUMNS = ('form_data', 'files')
+
+
+def _rewrite_batch(session, after_id, batch_size, min_size):
+    rows = session.execute(
+        select(raw_forms).where(raw_forms.c.id > after_id).order_by(raw_forms.c.id).limit(batch_size)
+    ).all()
+
+    updates = []
+    for row in rows:
+        values = {}
+        for name in COLUMNS:
+            raw = getattr(row, name)
+            if raw is None or (not isinstance(raw, str) and is_compressed(bytes(raw))):
+                continue
+            encoded = compress_text(decompress_text(raw), min_size)
+            if is_compressed(encoded):
+                values[name] = encoded
+        if values:
+            updates.append((row.id, values))
+
+    for form_id, values in updates:
+        session.execute(update(raw_forms).where(raw_forms.c.id == form_id).values(**values))
+    return (rows[-1].id if rows else None), len(updates)
+
+
+def measure(samples=20, limit=200):
+    """存储大小（字节）和读取最近 limit 条表单的耗时（毫秒，取中位数）"""
+    stored = db.session.execute(
+        select(func.sum(func.coalesce(func.length(raw_forms.c.form_data), 0)
+                        + func.coalesce(func.length(raw_forms.c.files), 0)))
+    ).scalar() or 0
+
+    if db.engine.dialect.name == "sqlite":
+        page_size = db.session.execute(text("PRAGMA page_size")).scalar()
+        pages = db.session.execute(text("PRAGMA page_count")).scalar()
+        free_pages = db.session.execute(text("PRAGMA freelist_count")).scalar()
+        db_size = (pages - free_pages) * page_size
+    else:
+        db_size = db.session.execute(text("SELECT pg_total_relation_size('standard_form')")).scalar()
+
+    timings = []
+    for _ in range(samples):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        forms = StandardForm.query.order_by(StandardForm.id.desc()).limit(limit).all()
+        for form in forms:
+            form.form_data, form.files
+        timings.append((time.perf_counter() - start) * 1000)
+    db.session.rollback()
+
+    return {"stored_bytes": stored, "db_bytes": db_size, "read_ms": statistics.median(timings)}
+
+
+def print_measure(label, result):
+    print(f"[{label}] form_data+files: {result['stored_bytes'] / 1024:.1f} KiB | "
+          f"已用页面: {result['db_bytes'] / 1024:.1f} KiB | 读取最近 200 条: {result['read_ms']:.2f} ms")
+
+
+def compress_form_data(batch_size, min_size, sleep_ms, do_measure, vacuum):
+    app = create_app()
+
+    with app.app_context():
+        if do_measure:
+            before = measure()
+            print_measure("改写前", before)
+
+        after_id, total = 0, 0
+        while True:
+            last_id, updated = run_write(_rewrite_batch, after_id, batch_size, min_size)
+            if last_id is None:
+                break
+            after_id = last_id
+            total += updated
+            print(f"已处理到表单 {last_id}：压缩 {updated} 条")
+            # 每批之间让出写锁，避免长时间阻塞在线写入
+            time.sleep(sleep_ms / 1000)
+
+        print(f"改写完成：共压缩 {total} 条表单")
+
+        if vacuum and db.engine.dialect.name == "sqlite":
+            # VACUUM 不能在事务中执行，需要独占数据库，建议在低峰期使用
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text("VACUUM"))
+            print("VACUUM 完成")
+
+        if do_measure:
+            after = measure()
+            print_measure("改写后", after)
+            if before['stored_bytes']:
+                print(f"存储减少 {(1 - after['stored_bytes'] / before['stored_bytes']) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="压缩历史表单数据")
+    parser.add_argument("--batch-size", type=int, default=200, help="每批处理的表单数")
+    parser.add_argument("--min-size", type=int, default=256, help="超过该字节数才压缩（与 CompressedText 默认值一致）")
+    parser.add_argument("--sleep-ms", type=int, default=50, help="每批之间的间隔（毫秒）")
+    parser.add_argument("--measure", action="store_true", help="输出改写前后的存储大小和读取耗时")
+    parser.add_argument("--vacuum", action="store_true", help="改写后执行 VACUUM 回收空间（仅 SQLite）")
+    args = parser.parse_args()
+    compress_form_data(args.batch_size, args.min_size, args.sleep_ms, args.measure, args.vacuum)
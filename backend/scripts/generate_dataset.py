@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+生成大规模模拟数据
+向数据库批量写入用户、角色继承链、各类型 / 各状态的表单（含日程投影和附件路径），用于在接近生产规模的数据上
+测量各项性能改进。所有内容由 --seed 决定：相同的 seed、--end-date 和数量参数生成完全相同的数据。
+使用 Core 批量 insert（每批一个事务），SQLite 上 100 万表单约数分钟
+
+- 用户：邮箱 user{n}@dataset.example，共用同一个密码哈希（默认 Dataset#2024），都持有角色链最底层角色，
+  --staff-ratio 比例的用户另外持有随机一个上层角色
+- 表单：按用户偏斜分布（少数用户表单很多），类型 / 状态按权重分布，创建时间分布在 --days 天内，
+  较早的表单多为已结束状态；form_data 大小接近真实提交（检查清单、备注、自我介绍等长度随机）
+- 附件：files 中写入 UPLOAD_FOLDER/<用户目录>/ 下的路径；--write-attachments 时同时创建占位文件
+
+用法:
+    python backend/scripts/generate_dataset.py --users 50000 --forms 1000000 --role-depth 5
+    python backend/scripts/generate_dataset.py --database-url sqlite:////tmp/dataset.db --create-tables --forms 100000 \
+        --log-dir /tmp/dataset-logs
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import func, insert, select
+
+from backend.app import create_app, db
+from backend.app.models.auth_obj.user import Role, RolesUsers, User
+from backend.app.models.service_obj.standard_form import FormType, StandardForm
+from backend.app.services.form_schema import indexed_columns, normalize_form
+from backend.app.services.schedule_handler import PROJECTIONS
+from backend.app.services.standard_form_handler import email_to_folder
+
+EMAIL_DOMAIN = "dataset.example"
+DEFAULT_PASSWORD = "Dataset#2024"
+
+TYPE_WEIGHTS = {
+    FormType.INSPECTION.value: 40,
+    FormType.AIRPORT_PICKUP.value: 25,
+    FormType.RENTAL_APPLICATION.value: 15,
+    FormType.COVERLETTER.value: 15,
+    FormType.Test.value: 5,
+}
+# 近期表单多为处理中，较早的表单多已结束（可被归档，见 archive_handler）
+RECENT_STATUS_WEIGHTS = {"pending": 45, "processing": 25, "completed": 20, "cancelled": 7, "rejected": 3}
+OLD_STATUS_WEIGHTS = {"pending": 4, "processing": 3, "completed": 75, "cancelled": 13, "rejected": 5}
+RECENT_DAYS = 60
+
+SUBURBS = ["Crawley", "Nedlands", "Subiaco", "Perth", "Northbridge", "Victoria Park", "Bentley", "Como",
+           "South Perth", "Leederville", "Mount Lawley", "Fremantle", "Claremont", "Cottesloe", "Scarborough"]
+STREETS = ["Stirling Hwy", "Hay St", "Murray St", "Albany Hwy", "Beaufort St", "Oxford St", "Canning Hwy",
+           "Broadway", "Hampden Rd", "Mounts Bay Rd", "Riverside Dr", "Walcott St"]
+NAMES = ["Li Wei", "Zhang Min", "Wang Fang", "Chen Jie", "Liu Yang", "Huang Lei", "Zhao Jing", "Wu Hao",
+         "Emily Smith", "Jack Brown", "Olivia Wilson", "Noah Taylor", "Mia Nguyen", "Lucas Tran"]
+CHECK_ITEMS = ["检查水电", "检查门窗", "检查热水器", "拍摄厨房", "检查霉斑", "测试网络", "检查空调", "拍摄卫生间",
+               "检查洗衣机", "确认车位", "检查烟雾报警器", "询问账单", "检查床垫", "测量房间尺寸"]
+WORDS = ["租房", "学生", "安静", "整洁", "预算", "通勤", "合租", "长期", "宠物", "停车", "家具", "朝北",
+         "the", "room", "close", "to", "campus", "quiet", "tidy", "budget", "lease", "share", "bond"]
+AIRLINES = ["CA", "CZ", "MU", "SQ", "QF", "CX", "MH", "TR"]
+VISAS = ["Student", "Graduate", "Working Holiday", "Skilled", "Visitor"]
+RENTAL_FILES = ["passport", "visa", "bank_statement[]", "balance_proof[]", "pay_slips[]", "other_files[]"]
+
+
+class DatasetGenerator:
+    """按 seed 生成确定的用户 / 表单数据（只生成 dict，不访问数据库）"""
+
+    def __init__(self, seed, users, end_date, days, upload_folder):
+        self.rng = random.Random(seed)
+        self.users = users
+        self.end = end_date
+        self.days = days
+        self.upload_folder = upload_folder
+        self._types = list(TYPE_WEIGHTS)
+        self._type_weights = list(TYPE_WEIGHTS.values())
+
+    @staticmethod
+    def email(n):
+        return f"user{n}@{EMAIL_DOMAIN}"
+
+    def uniquifier(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def text(self, mean_words):
+        """长度近似对数正态分布的随机文本"""
+        count = max(1, int(self.rng.lognormvariate(0, 0.6) * mean_words))
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def address(self):
+        return f"{self.rng.randint(1, 400)} {self.rng.choice(STREETS)}, {self.rng.choice(SUBURBS)} WA 6{self.rng.randint(0, 199):03d}"
+
+    def phone(self):
+        return f"04{self.rng.randint(0, 99999999):08d}"
+
+    def owner(self):
+        """表单所属用户：平方分布使编号小的用户拥有更多表单"""
+        return int(self.users * self.rng.random() ** 2)
+
+    def created_at(self):
+        return self.end - timedelta(seconds=self.rng.randint(0, self.days * 86400))
+
+    def status(self, created):
+        weights = RECENT_STATUS_WEIGHTS if (self.end - created).days <= RECENT_DAYS else OLD_STATUS_WEIGHTS
+        return self.rng.choices(list(weights), list(weights.values()))[0]
+
+    def service_time(self, created):
+        when = created + timedelta(days=self.rng.randint(1, 45), hours=self.rng.randint(8, 19))
+        return when.replace(minute=self.rng.choice((0, 15, 30, 45)), second=0, microsecond=0)
+
+    def form_data(self, form_type, email, created):
+        rng = self.rng
+        if form_type == FormType.INSPECTION.value:
+            return {
+                "address": self.address(),
+                "appointmentDate": self.service_time(created).strftime("%Y-%m-%dT%H:%M"),
+                "checklist[]": rng.sample(CHECK_ITEMS, rng.randint(1, len(CHECK_ITEMS))),
+                "name": rng.choice(NAMES), "phone": self.phone(), "email": email,
+                "wxid": f"wx_{rng.getrandbits(32):08x}", "remarks": self.text(12),
+            }
+        if form_type == FormType.AIRPORT_PICKUP.value:
+            return {
+                "wx_name": rng.choice(NAMES), "flight_number": f"{rng.choice(AIRLINES)}{rng.randint(100, 9999)}",
+                "pickup_time": self.service_time(created).strftime("%Y-%m-%dT%H:%M"),
+                "contact_phone": self.phone(), "destination": self.address(),
+                "luggage_info": f"{rng.randint(1, 3)} 件行李", "note": self.text(8),
+            }
+        if form_type == FormType.RENTAL_APPLICATION.value:
+            return {
+                "name": rng.choice(NAMES), "phone": self.phone(), "email": email,
+                "uniName": "The University of Western Australia", "major": rng.choice(["CS", "Law", "Medicine"]),
+                "move_in": self.service_time(created).strftime("%Y-%m-%d"),
+                "preferred_area": rng.choice(SUBURBS), "budget": str(rng.randint(200, 700)),
+                "self_intro": self.text(80),
+            }
+        if form_type == FormType.COVERLETTER.value:
+            arrival = self.service_time(created)
+            return {
+                "fullName": rng.choice(NAMES), "visaType": rng.choice(VISAS),
+                "arrivalDate": arrival.strftime("%Y-%m"),
+                "stayUntil": (arrival + timedelta(days=rng.randint(180, 1100))).strftime("%Y-%m"),
+                "personalStrength": self.text(150), "experience": self.text(100),
+            }
+        return {"message": self.text(5)}
+
+    def files(self, form_type, email):
+        """附件路径（rentalApplication 必有，其它类型偶尔带一张图片）"""
+        folder = os.path.join(self.upload_folder, email_to_folder(email))
+        if form_type == FormType.RENTAL_APPLICATION.value:
+            files = {}
+            for field in RENTAL_FILES:
+                if field.endswith("[]"):
+                    files[field] = [os.path.join(folder, f"{field[:-2]}_{i}.pdf")
+                                    for i in range(self.rng.randint(1, 4))]
+                else:
+                    files[field] = os.path.join(folder, f"{field}.jpg")
+            return files
+        if self.rng.random() < 0.2:
+            return {"attachment": os.path.join(folder, f"photo_{self.rng.getrandbits(24):06x}.jpg")}
+        return {}
+
+    def form(self, form_id):
+        """返回 (standard_form 行, 表单类型, 规整后的 values)"""
+        email = self.email(self.owner())
+        form_type = self.rng.choices(self._types, self._type_weights)[0]
+        created = self.created_at()
+        updated = min(self.end, created + timedelta(seconds=self.rng.randint(0, 30 * 86400)))
+        data = self.form_data(form_type, email, created)
+        row = {
+            "id": form_id, "email": email, "form_type": form_type,
+            "form_data": json.dumps(data, ensure_ascii=False),
+            "files": json.dumps(self.files(form_type, email), ensure_ascii=False),
+            "remark": self.text(4) if self.rng.random() < 0.1 else None,
+            "status": self.status(created), "created_gmt": created, "updated_gmt": updated,
+            **indexed_columns(form_type, data),
+        }
+        values = normalize_form(form_type, data).values if form_type in PROJECTIONS else None
+        return row, form_type, values
+
+
+def create_roles(session, depth):
+    """创建角色继承链 dataset_role_0（最高）<- ... <- dataset_role_{depth-1}，已存在时复用，返回按层级排列的 id"""
+    ids, parent_id = [], None
+    for level in range(depth):
+        code = f"dataset_role_{level}"
+        role = session.execute(select(Role).filter_by(code=code)).scalar_one_or_none()
+        if role is None:
+            role = Role(code=code, display_name=f"Dataset Role {level}", level=10 + level, parent_role_id=parent_id)
+            session.add(role)
+            session.flush()
+        ids.append(role.id)
+        parent_id = role.id
+    return ids
+
+
+def insert_users(session, generator, count, role_ids, staff_ratio, password_hash, batch_size, start):
+    user_table, link_table = User.__table__, RolesUsers.__table__
+    next_id = (session.execute(select(func.max(user_table.c.id))).scalar() or 0) + 1
+    base_role = role_ids[-1]
+    for offset in range(0, count, batch_size):
+        users, links = [], []
+        for n in range(offset, min(offset + batch_size, count)):
+            user_id = next_id + n
+            created = generator.created_at()
+            users.append({
+                "id": user_id, "email": generator.email(n), "password": password_hash, "active": True,
+                "name": generator.rng.choice(NAMES), "phone": generator.phone(),
+                "fs_uniquifier": generator.uniquifier(), "created_gmt": created, "updated_gmt": created,
+            })
+            links.append({"user_id": user_id, "role_id": base_role})
+            if len(role_ids) > 1 and generator.rng.random() < staff_ratio:
+                links.append({"user_id": user_id, "role_id": generator.rng.choice(role_ids[:-1])})
+        session.execute(insert(user_table), users)
+        session.execute(insert(link_table), links)
+        session.commit()
+        print(f"用户 {offset + len(users)}/{count} | {time.perf_counter() - start:.1f}s")
+
+
+def insert_forms(session, generator, count, batch_size, start):
+    form_table = StandardForm.__table__
+    next_id = (session.execute(select(func.max(form_table.c.id))).scalar() or 0) + 1
+    for offset in range(0, count, batch_size):
+        forms, projections = [], {}
+        for form_id in range(next_id + offset, next_id + min(offset + batch_size, count)):
+            row, form_type, values = generator.form(form_id)
+            forms.append(row)
+            if values is not None:
+                model = PROJECTIONS[form_type][0]
+                projection = model.columns_from_values(values)
+                projection.update(standard_form_id=form_id, created_gmt=row["created_gmt"],
+                                  updated_gmt=row["updated_gmt"])
+                projections.setdefault(model, []).append(projection)
+        session.execute(insert(form_table), forms)
+        for model, rows in projections.items():
+            session.execute(insert(model.__table__), rows)
+        session.commit()
+        done = offset + len(forms)
+        elapsed = time.perf_counter() - start
+        print(f"表单 {done}/{count} | {elapsed:.1f}s | {done / elapsed:.0f} 条/s")
+
+
+def write_attachments(session, size):
+    """为已生成表单的附件路径创建占位文件"""
+    content = b"\0" * size
+    created = 0
+    rows = session.execute(select(StandardForm.files).where(StandardForm.email.like(f"%@{EMAIL_DOMAIN}")))
+    for (files,) in rows:
+        for paths in json.loads(files or "{}").values():
+            for path in paths if isinstance(paths, list) else [paths]:
+                if not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as f:
+                        f.write(content)
+                    created += 1
+    print(f"占位附件：新建 {created} 个文件")
+
+
+def generate_dataset(args):
+    overrides = {}
+    if args.database_url:
+        overrides["SQLALCHEMY_DATABASE_URI"] = args.database_url
+    if args.log_dir:
+        # 默认日志路径随环境变化（如 /var/log/easyaussie），在本地 / CI 生成数据时不一定可写
+        overrides["APP_LOG_FILE"] = os.path.join(args.log_dir, "app.log")
+        overrides["DB_LOG_FILE"] = os.path.join(args.log_dir, "database.log")
+    app = create_app(overrides or None)
+
+    with app.app_context():
+        if args.create_tables:
+            db.create_all()
+
+        session = db.session
+        existing = session.execute(
+            select(func.count()).select_from(User.__table__).where(User.email.like(f"%@{EMAIL_DOMAIN}"))
+        ).scalar()
+        if existing and args.users:
+            print(f"❌ 数据库中已有 {existing} 个 @{EMAIL_DOMAIN} 用户，请使用新数据库或 --users 0 只追加表单")
+            sys.exit(1)
+        if not existing and not args.users and args.forms:
+            print(f"❌ 没有 @{EMAIL_DOMAIN} 用户，表单无法关联用户")
+            sys.exit(1)
+
+        user_count = args.users or existing
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+        generator = DatasetGenerator(args.seed, user_count, end_date, args.days, app.config["UPLOAD_FOLDER"])
+        if db.engine.dialect.name == "sqlite":
+            # 只影响本连接：批量导入时不等待每次提交落盘
+            session.connection().exec_driver_sql("PRAGMA synchronous=OFF")
+
+        start = time.perf_counter()
+        if args.users:
+            from flask_security.utils import hash_password
+
+            role_ids = create_roles(session, args.role_depth)
+            session.commit()
+            insert_users(session, generator, args.users, role_ids, args.staff_ratio,
+                         hash_password(args.password), args.batch_size, start)
+        insert_forms(session, generator, args.forms, args.batch_size, start)
+        if args.write_attachments:
+            write_attachments(session, args.attachment_bytes)
+
+        print(f"✅ 完成：{args.users} 个用户，{args.forms} 份表单，耗时 {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成大规模模拟数据")
+    parser.add_argument("--database-url", help="目标数据库，默认为应用配置（DATABASE_URL）")
+    parser.add_argument("--log-dir", help="应用 / 数据库日志目录，默认为应用配置（APP_LOG_FILE / DB_LOG_FILE）")
+    parser.add_argument("--create-tables", action="store_true", help="先执行 create_all 建表（全新数据库）")
+    parser.add_argument("--users", type=int, default=50000, help="用户数，0 表示向已生成的用户追加表单")
+    parser.add_argument("--forms", type=int, default=1000000, help="表单数")
+    parser.add_argument("--role-depth", type=int, default=4, help="角色继承链深度")
+    parser.add_argument("--staff-ratio", type=float, default=0.01, help="额外持有上层角色的用户比例")
+    parser.add_argument("--days", type=int, default=730, help="创建时间分布的天数")
+    parser.add_argument("--end-date", default=datetime.utcnow().strftime("%Y-%m-%d"),
+                        help="最晚创建日期 YYYY-MM-DD（与 seed 一起决定生成的数据）")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--batch-size", type=int, default=5000, help="每批插入的行数")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="所有用户的密码")
+    parser.add_argument("--write-attachments", action="store_true", help="创建附件占位文件")
+    parser.add_argument("--attachment-bytes", type=int, default=1024, help="占位文件大小（字节）")
+    generate_dataset(parser.parse_args())
@@ -0,0 +1,220 @@
+"""
+测试基类（AppTestCase）
+每个进程只创建一次 app（pytest-xdist 下每个 worker 各一个），测试之间互不影响、可以并行：
+- 数据库为 SQLite 内存库（StaticPool 单连接，测试代码与测试客户端共用），首次使用时建表
+- 每个测试类在一个外层事务中执行，setUpTestData 写入的数据对类内所有测试可见；
+  每个测试再包一层 SAVEPOINT，结束时回滚。应用内 session.commit() 只释放自己的 SAVEPOINT，不会真正提交
+- Google Tasks 客户端替换为 FakeTasksService，创建的任务记录在 self.google_tasks.created，不访问网络
+- 测试客户端的每个请求使用独立的应用上下文，不与测试代码共享 g 和 db.session
+- 密码使用 plaintext 哈希，日志、上传目录放在进程级临时目录
+写入协调（WRITE_COORDINATION）使用独立的写线程引擎，看不到测试事务；这类需要真实数据库文件的测试使用
+FileDatabaseTestCase（每个类一个临时数据库文件），或用 file_app_config 生成临时目录下的 create_app 配置
+
+用法:
+    class OrdersTest(AppTestCase):
+        @classmethod
+        def setUpTestData(cls):
+            cls.headers = cls.auth_headers(cls.create_user("a@example.com"))
+
+        def test_orders(self):
+            self.assertEqual(self.client.get("/api/orders", headers=self.headers).status_code, 200)
+
+    class WriterTest(FileDatabaseTestCase):
+        app_config = {"WRITE_COORDINATION": True}
+
+    python -m pytest -q backend/test              # 串行
+    python -m pytest -q -n auto backend/test      # 并行（需安装 pytest-xdist）
+"""
+
+import atexit
+import contextvars
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask.testing import FlaskClient
+from sqlalchemy.pool import StaticPool
+
+from backend.app import create_app
+from backend.app.clients import api_google_task
+from backend.app.models import db
+from backend.app.models.auth_obj.user import User, Role
+from backend.app.utils.db_utils import use_explicit_sqlite_transactions
+
+_app = None
+
+
+class IsolatedClient(FlaskClient):
+    """
+    每个请求在空的 contextvars 上下文中执行，推入自己的应用上下文（独立的 g 和 db.session），与生产环境一致；
+    否则请求会复用测试类推入的应用上下文，g 中缓存的登录用户等会在请求之间残留
+    """
+
+    def open(self, *args, **kwargs):
+        return contextvars.Context().run(super().open, *args, **kwargs)
+
+
+def file_app_config(directory, **overrides):
+    """数据库文件、日志和上传目录都在 directory 下的 create_app 配置"""
+    return {
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(directory, 'test.db')}",
+        "APP_LOG_FILE": os.path.join(directory, "app.log"),
+        "DB_LOG_FILE": os.path.join(directory, "database.log"),
+        "UPLOAD_FOLDER": os.path.join(directory, "uploads"),
+        **overrides,
+    }
+
+
+def get_test_app():
+    """进程内共享的测试 app，首次调用时建表"""
+    global _app
+    if _app is not None:
+        return _app
+
+    tmp = tempfile.mkdtemp(prefix="easyaussie-test-")
+    atexit.register(shutil.rmtree, tmp, True)
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "SQLALCHEMY_ENGINE_OPTIONS": {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}},
+        "SQLITE_PRAGMAS": {},
+        "WRITE_COORDINATION": False,
+        "SECURITY_PASSWORD_HASH": "plaintext",
+        "APP_LOG_FILE": os.path.join(tmp, "app.log"),
+        "DB_LOG_FILE": os.path.join(tmp, "database.log"),
+        "UPLOAD_FOLDER": os.path.join(tmp, "uploads"),
+    })
+    with app.app_context():
+        # 由 SQLAlchemy 显式发出 BEGIN，SAVEPOINT 才能正确嵌套
+        use_explicit_sqlite_transactions(db.engine)
+        db.create_all()
+        db.session.remove()
+        # 会话加入测试事务时以 SAVEPOINT 代替真正的提交 / 回滚
+        db.session.configure(join_transaction_mode="create_savepoint")
+    app.test_client_class = IsolatedClient
+    _app = app
+    return app
+
+
+class FakeTasksService:
+    """Google Tasks API 客户端替身：service.tasks().insert(tasklist=, body=).execute()"""
+
+    def __init__(self):
+        self.created = []
+
+    def tasks(self):
+        return self
+
+    def insert(self, tasklist, body):
+        self.created.append(body)
+        return self
+
+    def execute(self, num_retries=0):
+        return {"id": str(len(self.created)), "kind": "tasks#task", **self.created[-1]}
+
+
+class AppTestCase(unittest.TestCase):
+    """子类覆盖 setUp 时需先调用 super().setUp()"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.app = get_test_app()
+        cls._app_context = cls.app.app_context()
+        cls._app_context.push()
+        # db.engines 返回的就是 Flask-SQLAlchemy 内部的字典：默认 bind 换成测试连接，
+        # 之后所有会话（含请求内的）都在该连接的事务中执行
+        cls._engine = db.engines[None]
+        cls._connection = cls._engine.connect()
+        cls._transaction = cls._connection.begin()
+        db.engines[None] = cls._connection
+        try:
+            # setUpTestData 中通过测试客户端提交表单时同样不访问 Google Tasks
+            with patch.object(api_google_task, "authenticate_google_tasks", return_value=FakeTasksService()):
+                cls.setUpTestData()
+            db.session.commit()
+        except Exception:
+            cls._release()
+            raise
+        finally:
+            db.session.remove()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._release()
+        super().tearDownClass()
+
+    @classmethod
+    def _release(cls):
+        db.session.remove()
+        db.engines[None] = cls._engine
+        cls._transaction.rollback()
+        cls._connection.close()
+        cls._app_context.pop()
+
+    @classmethod
+    def setUpTestData(cls):
+        """类内共享的数据，整个类结束后回滚。ORM 对象随会话关闭而分离，类属性中只保存 id / email / token 等值"""
+
+    def setUp(self):
+        super().setUp()
+        self._savepoint = self._connection.begin_nested()
+        self.addCleanup(self._rollback_test)
+        self.google_tasks = FakeTasksService()
+        patcher = patch.object(api_google_task, "authenticate_google_tasks", return_value=self.google_tasks)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self.app.test_client()
+
+    def _rollback_test(self):
+        db.session.remove()
+        if self._savepoint.is_active:
+            self._savepoint.rollback()
+
+    @staticmethod
+    def create_user(email, password="Test@1234", roles=()):
+        """创建用户，roles 为角色 code，不存在的角色一并创建"""
+        user = User(email=email, password=password, active=True)
+        for code in roles:
+            role = Role.query.filter_by(code=code).first() or Role(code=code, display_name=code)
+            user.roles.append(role)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    @staticmethod
+    def auth_headers(user):
+        return {"Authorization": f"Bearer {user.get_auth_token()}"}
+
+    def login_session(self, user_or_uniquifier):
+        """以 Cookie 会话登录（管理后台接口只接受会话认证）"""
+        uniquifier = getattr(user_or_uniquifier, "fs_uniquifier", user_or_uniquifier)
+        with self.client.session_transaction() as session:
+            session["_user_id"] = uniquifier
+            session["_fresh"] = True
+
+
+class FileDatabaseTestCase(unittest.TestCase):
+    """
+    使用临时数据库文件的测试基类，每个类一个独立 app，类结束时删除数据库文件
+    用于写入协调线程等需要其它连接看到已提交数据的场景；数据在类内的测试之间保留，测试需使用各自的数据
+    """
+    app_config = {}  # 额外的 create_app 配置
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._tmp = tempfile.TemporaryDirectory(prefix="easyaussie-test-")
+        cls.app = create_app(file_app_config(cls._tmp.name, **cls.app_config))
+        with cls.app.app_context():
+            db.create_all()
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.app.app_context():
+            db.engine.dispose()
+        cls._tmp.cleanup()
+        super().tearDownClass()
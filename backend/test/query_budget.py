@@ -0,0 +1,126 @@
+"""
+SQL 查询预算断言
+记录一段代码（通常是一次测试客户端请求）执行的 SQL 语句、数据库耗时和总耗时，超出预算时测试失败并列出执行的语句；
+assertConstantQueries 对比数据量增长前后同一请求执行的语句，数量不同时输出两次语句的差异（用于发现 N+1 查询）
+
+用法（在 unittest.TestCase 中混入 QueryBudgetMixin）:
+    with self.assertQueryBudget(max_queries=3, max_db_ms=50):
+        self.client.get("/api/orders", headers=headers)
+
+    self.assertConstantQueries(lambda: self.client.get("/admin/users"), grow=add_users)
+
+耗时预算会乘以环境变量 QUERY_BUDGET_TIME_SCALE（默认 1），较慢的 CI 机器上可以整体放宽
+"""
+
+import difflib
+import os
+import re
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+TIME_SCALE = float(os.getenv("QUERY_BUDGET_TIME_SCALE", "1"))
+
+_WHITESPACE = re.compile(r"\s+")
+# selectinload / in_() 展开的参数个数随数据量变化，对比时合并为一个占位符
+_EXPANDED_IN = re.compile(r"\(\?(?:, \?)+\)|\(%\(\w+\)s(?:, %\(\w+\)s)+\)")
+# 事务控制语句（测试基类的 SAVEPOINT 等）不计入查询
+_TRANSACTION_CONTROL = re.compile(r"^\s*(BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+
+def normalize_statement(statement):
+    return _EXPANDED_IN.sub("(?...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryLog:
+    """一段代码执行的 SQL：statements 为 [(语句, 参数, 耗时秒)]"""
+
+    def __init__(self):
+        self.statements = []
+        self.wall_time = 0.0
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def db_ms(self):
+        return sum(duration for _, _, duration in self.statements) * 1000
+
+    @property
+    def wall_ms(self):
+        return self.wall_time * 1000
+
+    def normalized(self):
+        return [normalize_statement(statement) for statement, _, _ in self.statements]
+
+    def format(self):
+        lines = [f"{self.count} queries | db {self.db_ms:.1f} ms | wall {self.wall_ms:.1f} ms"]
+        for i, (statement, parameters, duration) in enumerate(self.statements, 1):
+            lines.append(f"  {i:>3}. [{duration * 1000:.2f} ms] {normalize_statement(statement)}  -- {parameters!r}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def record_queries():
+    """记录期间所有引擎（含写入协调线程的引擎）执行的语句"""
+    log = QueryLog()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_budget_start", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_budget_start"].pop()
+        if _TRANSACTION_CONTROL.match(statement):
+            return
+        log.statements.append((statement, parameters, time.perf_counter() - started))
+
+    event.listen(Engine, "before_cursor_execute", before)
+    event.listen(Engine, "after_cursor_execute", after)
+    start = time.perf_counter()
+    try:
+        yield log
+    finally:
+        log.wall_time = time.perf_counter() - start
+        event.remove(Engine, "before_cursor_execute", before)
+        event.remove(Engine, "after_cursor_execute", after)
+
+
+class QueryBudgetMixin:
+    """unittest.TestCase 混入类"""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries=None, max_db_ms=None, max_wall_ms=None):
+        """with 块内执行的语句数 / 数据库耗时 / 总耗时超过预算时失败，失败信息列出全部语句"""
+        with record_queries() as log:
+            yield log
+
+        problems = []
+        if max_queries is not None and log.count > max_queries:
+            problems.append(f"{log.count} queries > budget {max_queries}")
+        if max_db_ms is not None and log.db_ms > max_db_ms * TIME_SCALE:
+            problems.append(f"db time {log.db_ms:.1f} ms > budget {max_db_ms * TIME_SCALE:.1f} ms")
+        if max_wall_ms is not None and log.wall_ms > max_wall_ms * TIME_SCALE:
+            problems.append(f"wall time {log.wall_ms:.1f} ms > budget {max_wall_ms * TIME_SCALE:.1f} ms")
+        if problems:
+            self.fail("Query budget exceeded: " + "; ".join(problems) + "\n" + log.format())
+
+    def assertConstantQueries(self, call, grow):
+        """
+        先执行 call，再执行 grow（增加数据）后再次执行 call，两次语句数不同时失败并输出语句差异
+        :return: (增长前, 增长后) 的 QueryLog
+        """
+        with record_queries() as before:
+            call()
+        grow()
+        with record_queries() as after:
+            call()
+
+        if before.count != after.count:
+            diff = difflib.unified_diff(before.normalized(), after.normalized(),
+                                        fromfile=f"before ({before.count} queries)",
+                                        tofile=f"after grow ({after.count} queries)", lineterm="")
+            self.fail("Query count depends on data size:\n" + "\n".join(diff))
+        return before, after
@@ -1,15 +1,16 @@
 import unittest
 import random
 import string
-from backend.app import create_app
 
+from backend.app.models import db
+from backend.app.models.auth_obj.user import User, Role
+from backend.test.base import AppTestCase
 
-class UserBatchRegisterTest(unittest.TestCase):
+
+class UserBatchRegisterTest(AppTestCase):
     @classmethod
-    def setUpClass(cls):
-        cls.app = create_app()
-        cls.app.config['TESTING'] = True
-        cls.client = cls.app.test_client()
+    def setUpTestData(cls):
+        db.session.add(Role(code="user", display_name="用户", level=40))
         cls.password = "Test@1234"
         cls.user_count = 3
 
@@ -25,36 +26,32 @@ class UserBatchRegisterTest(unittest.TestCase):
         self.assertIsNotNone(captcha_code, "获取验证码失败")
         return captcha_code
 
-    def test_batch_register_users(self):
-        success_count = 0
-
-        for _ in range(self.user_count):
-            email = self.generate_random_email()
-            captcha_code = self.fetch_captcha_code()
+    def register(self, email):
+        payload = {
+            "email": email,
+            "password": self.password,
+            "code": self.fetch_captcha_code()
+        }
+        return self.client.post("/api/register", json=payload)
 
-            payload = {
-                "email": email,
-                "password": self.password,
-                "code": captcha_code
-            }
+    def test_batch_register_users(self):
+        emails = [self.generate_random_email() for _ in range(self.user_count)]
 
-            response = self.client.post("/api/register", json=payload)
+        for email in emails:
+            response = self.register(email)
 
             # 校验
             self.assertEqual(response.status_code, 200, f"注册失败，状态码: {response.status_code}")
             self.assertTrue(response.json.get("success"), f"注册失败，返回: {response.json}")
 
-            print(f"✅ 成功注册: {email}")
-
-            # 保存注册的用户信息到CSV,有表头:Email,Password
-            with open("registered_users.csv", "a") as f:
-                if f.tell() == 0:
-                    f.write("Email,Password\n")
-                f.write(f"{email},{self.password}\n")
-
-            success_count += 1
+        registered = User.query.filter(User.email.in_(emails)).all()
+        self.assertEqual(len(registered), self.user_count)
+        self.assertTrue(all([role.code for role in user.roles] == ["user"] for user in registered))
 
-        print(f"\n✅ 成功注册 {success_count} 个用户")
+    def test_register_existing_email(self):
+        self.create_user("exists@example.com")
+        response = self.register("exists@example.com")
+        self.assertEqual(response.status_code, 409)
 
 
 if __name__ == '__main__':
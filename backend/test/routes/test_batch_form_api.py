@@ -0,0 +1,68 @@
+import json
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from backend.app.models import db
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.test.base import AppTestCase
+
+
+class BatchFormApiTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.headers = cls.auth_headers(cls.create_user("batch@example.com"))
+
+    def upload(self, **files):
+        data = {field: (BytesIO(b"fake file content"), name) for field, name in files.items()}
+        response = self.client.post("/api/uploads", data=data, headers=self.headers,
+                                    content_type="multipart/form-data")
+        self.assertEqual(response.status_code, 200)
+        return response.json["files"]
+
+    @patch('backend.app.services.transfer_handler.create_google_task')
+    @patch('backend.app.services.inspection_handler.create_google_task')
+    def test_batch_submit_mixed_forms(self, mock_inspection_task, mock_transfer_task):
+        refs = self.upload(passport="passport.pdf", visa="visa.pdf")
+        forms = [
+            {"formType": "rentalApplication", "formData": {"name": "Test User", "major": ""}, "files": refs},
+            {"formType": "inspection", "formData": {
+                "address": "35 Stirling Hwy, Crawley WA 6009",
+                "appointmentDate": "2024-12-01T12:00",
+                "checklist[]": ["检查水电"],
+            }},
+            {"formType": "airportPickup", "formData": {
+                "flight_number": "CA1234", "pickup_time": "2024-12-01T10:00", "wx_name": "TestWX",
+            }},
+            {"formType": "unknown", "formData": {}},
+            {"formType": "coverletter", "formData": {}, "files": {"cv": "../../etc/passwd"}},
+        ]
+
+        response = self.client.post("/api/form-submit/batch", json={"forms": forms}, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        results = response.json["results"]
+
+        self.assertEqual([r["status"] for r in results], ["created", "created", "created", "invalid", "invalid"])
+        self.assertEqual([r.get("hook") for r in results[:3]], ["skipped", "done", "done"])
+        mock_inspection_task.assert_called_once()
+        mock_transfer_task.assert_called_once()
+
+        rental = db.session.get(StandardForm, results[0]["id"])
+        self.assertEqual(json.loads(rental.form_data), {"name": "Test User"})
+        self.assertEqual(set(json.loads(rental.files)), {"passport", "visa"})
+        self.assertEqual(rental.status, "pending")
+
+    def test_batch_requires_list(self):
+        response = self.client.post("/api/form-submit/batch", json={"forms": {}}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_all_invalid_returns_400(self):
+        response = self.client.post("/api/form-submit/batch", json={"forms": [
+            {"formType": "inspection", "formData": {"address": "no date"}},
+        ]}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("appointmentDate", response.json["results"][0]["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
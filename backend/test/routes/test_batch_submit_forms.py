@@ -1,28 +1,17 @@
-import csv
 import unittest
 from io import BytesIO
-from unittest.mock import patch
 
-from backend.app import create_app
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.test.base import AppTestCase
 
 
-class FormSubmissionTest(unittest.TestCase):
+class FormSubmissionTest(AppTestCase):
     @classmethod
-    def setUpClass(cls):
-        cls.app = create_app()
-        cls.app.config['TESTING'] = True
-        cls.client = cls.app.test_client()
-        cls.users = cls.load_users("registered_users.csv")  # 读取已注册的用户
-        cls.files_fake = (BytesIO(b"fake file content"), "test.pdf")
-
-    @staticmethod
-    def load_users(csv_file):
-        users = []
-        with open(csv_file, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                users.append(row['Email'])
-        return users
+    def setUpTestData(cls):
+        cls.users = {}  # email -> 认证请求头
+        for i in range(3):
+            email = f"batch{i}@example.com"
+            cls.users[email] = cls.auth_headers(cls.create_user(email))
 
     def build_airport_pickup_form(self, email):
         return {
@@ -79,13 +68,13 @@ class FormSubmissionTest(unittest.TestCase):
             "formType": "inspection",
             "email": email,
             "address": "35 Stirling Hwy, Crawley WA 6009",
-            "appointment_date": "2024-12-01T12:00",
+            "appointmentDate": "2024-12-01T12:00",
             "name": "Test User",
             "phone": "0400123456",
             "checklist[]": "检查水电"
         }
 
-    def submit_form(self, form_data):
+    def submit_form(self, form_data, headers):
         """修正版：统一将普通字段和文件字段放到data里，Flask自己识别"""
         data = {}
         for key, value in form_data.items():
@@ -96,19 +85,15 @@ class FormSubmissionTest(unittest.TestCase):
         response = self.client.post(
             "/api/form-submit",
             data=data,
+            headers=headers,
             content_type="multipart/form-data"
         )
         return response
 
-    @patch('backend.app.services.transfer_handler.create_google_task')
-    @patch('backend.app.services.inspection_handler.create_google_task')
-    def test_batch_submit_forms(self, mock_transfer_create_task, mock_inspection_create_task):
-        mock_transfer_create_task.return_value = None
-        mock_inspection_create_task.return_value = None  # 不做任何事情
-
+    def test_batch_submit_forms(self):
         total_submitted = 0
 
-        for email in self.users:
+        for email, headers in self.users.items():
             for builder in [
                 self.build_airport_pickup_form,
                 self.build_rental_application_form,
@@ -116,13 +101,14 @@ class FormSubmissionTest(unittest.TestCase):
                 self.build_inspection_form,
             ]:
                 form_data = builder(email)
-                response = self.submit_form(form_data)
+                response = self.submit_form(form_data, headers)
                 self.assertEqual(response.status_code, 200, f"提交失败，状态码: {response.status_code}")
                 self.assertEqual(response.json.get("status"), "success", f"提交失败，返回: {response.json}")
                 total_submitted += 1
-                print(f"✅ 成功提交表单: {form_data['formType']} for {email}")
 
-        print(f"\n✅ 全部完成，共提交 {total_submitted} 份表单！")
+        self.assertEqual(StandardForm.query.count(), total_submitted)
+        # 接机和看房表单提交后各创建一个 Google 任务
+        self.assertEqual(len(self.google_tasks.created), 2 * len(self.users))
 
 
 if __name__ == '__main__':
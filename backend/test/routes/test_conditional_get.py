@@ -0,0 +1,69 @@
+import unittest
+
+from backend.app.models import db
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.test.base import AppTestCase
+
+
+class ConditionalGetTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.headers = cls.auth_headers(cls.create_user("etag@example.com"))
+
+    def get(self, path, etag=None):
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        return self.client.get(path, headers=headers)
+
+    def test_unchanged_orders_return_304(self):
+        """数据未变化时带 If-None-Match 返回 304"""
+        first = self.get("/api/orders")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers.get("ETag")
+        self.assertIsNotNone(etag)
+
+        second = self.get("/api/orders", etag=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers.get("ETag"), etag)
+        self.assertEqual(second.data, b"")
+
+    def test_new_form_changes_etag(self):
+        """新提交的表单会递增版本号，旧 ETag 失效"""
+        before = self.get("/api/orders/stats")
+        etag = before.headers.get("ETag")
+
+        db.session.add(StandardForm(email="etag@example.com", form_type="test", form_data="{}"))
+        db.session.commit()
+
+        response = self.get("/api/orders/stats", etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers.get("ETag"), etag)
+        self.assertEqual(response.json["data"]["totalOrders"], before.json["data"]["totalOrders"] + 1)
+
+    def test_cancel_order_changes_etag(self):
+        form = StandardForm(email="etag@example.com", form_type="test", form_data="{}")
+        db.session.add(form)
+        db.session.commit()
+        form_id = form.id
+
+        etag = self.get("/api/orders").headers.get("ETag")
+        self.client.post(f"/api/orders/{form_id}/cancel", headers=self.headers)
+        self.assertEqual(self.get("/api/orders", etag=etag).status_code, 200)
+
+    def test_etag_depends_on_query_string(self):
+        etag = self.get("/api/orders?page=1").headers.get("ETag")
+        self.assertEqual(self.get("/api/orders?page=2", etag=etag).status_code, 200)
+
+    def test_profile_etag_and_last_modified(self):
+        first = self.get("/api/profile")
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNotNone(first.headers.get("ETag"))
+        self.assertEqual(self.get("/api/profile", etag=first.headers["ETag"]).status_code, 304)
+
+        self.client.put("/api/profile", json={"name": "New Name"}, headers=self.headers)
+        self.assertEqual(self.get("/api/profile", etag=first.headers["ETag"]).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import datetime
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from backend.app.models import db
+from backend.app.models.idempotency_key import IdempotencyKey
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.utils.idempotency_utils import _claim_key, request_fingerprint
+from backend.app.utils.write_coordinator import run_write
+from backend.test.base import AppTestCase
+
+
+class IdempotencyTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.token = cls.create_user("idem@example.com").get_auth_token()
+
+    def headers(self, key):
+        return {"Authorization": f"Bearer {self.token}", "Idempotency-Key": key}
+
+    def submit(self, key, address="35 Stirling Hwy"):
+        data = {
+            "formType": "inspection",
+            "address": address,
+            "appointmentDate": "2024-12-01T12:00",
+            "file": (BytesIO(b"passport"), "passport.pdf"),
+        }
+        return self.client.post("/api/form-submit", data=data, headers=self.headers(key),
+                                content_type="multipart/form-data")
+
+    def add_placeholder(self, key, path="/api/orders/1/cancel", age=datetime.timedelta(0)):
+        """按首次请求的方式占用幂等键但不保存结果（模拟处理中 / worker 中断），age 为占位距今的时间"""
+        with self.app.test_request_context(path, method="POST"):
+            lease = datetime.timedelta(seconds=self.app.config["IDEMPOTENCY_LOCK_TIMEOUT"])
+            claimed = run_write(_claim_key, "idem@example.com", key, request_fingerprint(),
+                                datetime.datetime.utcnow() - age, lease)
+            self.assertIsNone(claimed)
+
+    def count_forms(self):
+        return db.session.query(StandardForm).filter_by(email="idem@example.com").count()
+
+    def add_form(self):
+        form = StandardForm(email="idem@example.com", form_type="test", form_data="{}")
+        db.session.add(form)
+        db.session.commit()
+        return form.id
+
+    def test_retry_replays_stored_response(self):
+        before = self.count_forms()
+        first = self.submit("submit-1")
+        self.assertEqual(first.status_code, 200)
+
+        retry = self.submit("submit-1")
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.headers.get("Idempotent-Replayed"), "true")
+        self.assertEqual(retry.json, first.json)
+
+        self.assertEqual(self.count_forms(), before + 1)
+        self.assertEqual(len(self.google_tasks.created), 1)
+
+    def test_key_reused_for_different_request(self):
+        self.assertEqual(self.submit("submit-2").status_code, 200)
+        self.assertEqual(self.submit("submit-2", address="another address").status_code, 422)
+
+    def test_in_progress_key_returns_409(self):
+        """首次请求仍在处理中（只有占位记录）时，重试返回 409"""
+        self.add_placeholder("cancel-busy")
+        response = self.client.post("/api/orders/1/cancel", headers=self.headers("cancel-busy"))
+        self.assertEqual(response.status_code, 409)
+
+    def test_stale_placeholder_is_taken_over(self):
+        """占位租约过期后，重试接管该键并正常执行，结果保存后可重放"""
+        form_id = self.add_form()
+        lease = datetime.timedelta(seconds=self.app.config["IDEMPOTENCY_LOCK_TIMEOUT"])
+        self.add_placeholder("cancel-stale", path=f"/api/orders/{form_id}/cancel",
+                             age=lease + datetime.timedelta(seconds=1))
+
+        first = self.client.post(f"/api/orders/{form_id}/cancel", headers=self.headers("cancel-stale"))
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNone(first.headers.get("Idempotent-Replayed"))
+
+        retry = self.client.post(f"/api/orders/{form_id}/cancel", headers=self.headers("cancel-stale"))
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.headers.get("Idempotent-Replayed"), "true")
+        stored = IdempotencyKey.query.filter_by(email="idem@example.com", key="cancel-stale").one()
+        # 保存结果后过期时间延长到 TTL
+        self.assertGreater(stored.expires_at, datetime.datetime.utcnow() + datetime.timedelta(hours=1))
+
+    def test_cancel_retry_returns_first_result(self):
+        form_id = self.add_form()
+
+        first = self.client.post(f"/api/orders/{form_id}/cancel", headers=self.headers("cancel-1"))
+        retry = self.client.post(f"/api/orders/{form_id}/cancel", headers=self.headers("cancel-1"))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.status_code, 200)
+
+        # 不带幂等键时重复取消仍按原逻辑返回 400
+        plain = self.client.post(f"/api/orders/{form_id}/cancel", headers={"Authorization": f"Bearer {self.token}"})
+        self.assertEqual(plain.status_code, 400)
+
+    def test_failed_request_releases_key(self):
+        with patch('backend.app.services.standard_form_handler.save_form', side_effect=RuntimeError("db down")):
+            self.assertEqual(self.submit("submit-3").status_code, 500)
+        response = self.submit("submit-3")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.headers.get("Idempotent-Replayed"))
+
+
+if __name__ == '__main__':
+    unittest.main()
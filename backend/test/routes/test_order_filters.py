@@ -0,0 +1,54 @@
+import unittest
+
+from backend.test.base import AppTestCase
+
+
+class OrderFilterTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.headers = cls.auth_headers(cls.create_user("filters@example.com"))
+        cls.app.test_client().post("/api/form-submit/batch", json={"forms": [
+            {"formType": "inspection", "formData": {
+                "name": "Zhang San", "phone": "0400111222", "address": "35 Stirling Hwy",
+                "appointmentDate": "2030-05-03T10:00"}},
+            {"formType": "inspection", "formData": {
+                "name": "Li Si", "phone": "0400333444", "address": "1 Hay St",
+                "appointmentDate": "2030-05-01T09:00"}},
+            {"formType": "airportPickup", "formData": {
+                "wx_name": "Zhao", "flight_number": "CA1234", "pickup_time": "2030-06-01T08:30"}},
+        ]}, headers=cls.headers)
+
+    def orders(self, query):
+        response = self.client.get(f"/api/orders?{query}", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json["data"]
+
+    def test_filter_by_name_and_phone_prefix(self):
+        self.assertEqual(len(self.orders("name=Zhang")), 1)
+        self.assertEqual(len(self.orders("phone=0400")), 2)
+        self.assertEqual(len(self.orders("name=%25")), 0)
+
+    def test_filter_and_sort_by_service_date(self):
+        orders = self.orders("date_from=2030-05-01&date_to=2030-05-31&sort=service_date")
+        self.assertEqual([order["formType"] for order in orders], ["inspection", "inspection"])
+        self.assertIn("Li Si", orders[0]["formData"])
+
+        orders = self.orders("sort=-service_date")
+        self.assertEqual(orders[0]["formType"], "airportPickup")
+
+    def test_search_matches_indexed_columns_and_remark(self):
+        """关键字搜索匹配姓名 / 电话 / 地址（子串）和备注"""
+        self.assertEqual(len(self.orders("search=Stirling")), 1)
+        self.assertEqual(len(self.orders("search=333")), 1)
+        self.assertEqual(len(self.orders("search=Zha")), 2)
+        self.assertEqual(self.orders("search=nothing-matches"), [])
+
+    def test_invalid_filter_returns_400(self):
+        response = self.client.get("/api/orders?date_from=tomorrow", headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/orders?sort=email", headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from backend.app.models import db
+from backend.app.models.auth_obj.user import User, Role
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.test.base import AppTestCase
+from backend.test.query_budget import QueryBudgetMixin
+
+
+class QueryBudgetTest(QueryBudgetMixin, AppTestCase):
+    """热点接口的 SQL 语句数预算：语句数不随分页大小 / 数据量增长"""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin_role = Role(code="admin", display_name="管理员", level=0)
+        user_role = Role(code="user", display_name="用户", level=40, parent=admin_role)
+        admin = User(email="budget-admin@example.com", password="x", roles=[admin_role])
+        user = User(email="budget@example.com", password="x", roles=[user_role])
+        db.session.add_all([admin_role, user_role, admin, user])
+        db.session.add_all([StandardForm(email=user.email, form_type="inspection", form_data="{}")
+                            for _ in range(30)])
+        db.session.commit()
+        cls.headers = cls.auth_headers(user)
+        cls.admin_uniquifier = admin.fs_uniquifier
+
+    def add_users(self, count):
+        role = Role.query.filter_by(code="user").first()
+        start = User.query.count()
+        db.session.add_all([User(email=f"budget-{start + i}@example.com", password="x", roles=[role])
+                            for i in range(count)])
+        db.session.commit()
+
+    def test_orders_query_count_independent_of_page_size(self):
+        """/api/orders：用户 + 版本号 + 计数 + 当前页，共 4 条，与 per_page 无关"""
+        for per_page in (5, 30):
+            with self.assertQueryBudget(max_queries=4, max_db_ms=100):
+                response = self.client.get(f"/api/orders?per_page={per_page}", headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json["data"]), per_page)
+
+    def test_admin_users_query_count_constant_in_user_count(self):
+        """/admin/users：角色预加载，用户数增加不产生额外查询"""
+        self.login_session(self.admin_uniquifier)
+
+        def call():
+            response = self.client.get("/admin/users")
+            self.assertEqual(response.status_code, 200)
+
+        before, after = self.assertConstantQueries(call, grow=lambda: self.add_users(20))
+        self.assertLessEqual(after.count, 3, after.format())
+
+    def test_budget_failure_lists_statements(self):
+        with self.assertRaises(AssertionError) as ctx:
+            with self.assertQueryBudget(max_queries=0):
+                self.client.get("/api/orders", headers=self.headers)
+        self.assertIn("queries > budget 0", str(ctx.exception))
+        self.assertIn("FROM standard_form", str(ctx.exception))
+
+    def test_constant_queries_failure_shows_diff(self):
+        calls = []
+
+        def call():
+            for _ in calls:
+                db.session.get(User, 1)
+                db.session.expunge_all()
+            calls.append(None)
+
+        with self.assertRaises(AssertionError) as ctx:
+            self.assertConstantQueries(call, grow=lambda: None)
+        self.assertIn("+SELECT", str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from backend.app.models import db
+from backend.app.models.service_obj.inspection_obj import RegisterInfo
+from backend.test.base import AppTestCase
+
+
+class ScheduleApiTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_id = cls.create_user("admin@example.com", roles=["admin"]).fs_uniquifier
+        cls.user_headers = cls.auth_headers(cls.create_user("schedule@example.com"))
+
+    def admin_get(self, path):
+        # admin 接口使用 Flask-Security 的会话认证
+        self.login_session(self.admin_id)
+        return self.client.get(path)
+
+    def test_submitted_forms_appear_in_schedule(self):
+        self.client.post("/api/form-submit", data={
+            "formType": "inspection",
+            "address": "35 Stirling Hwy",
+            "appointmentDate": "2030-05-02T10:00",
+            "checklist[]": ["检查水电"],
+        }, headers=self.user_headers, content_type="multipart/form-data")
+        self.client.post("/api/form-submit/batch", json={"forms": [
+            {"formType": "airportPickup", "formData": {"flight_number": "CA1234", "pickup_time": "2030-05-01T08:30"}},
+            {"formType": "airportPickup", "formData": {"flight_number": "CA9999", "pickup_time": "2030-06-01T08:30"}},
+        ]}, headers=self.user_headers)
+
+        response = self.admin_get("/admin/schedule?start=2030-05-01&end=2030-05-02")
+        self.assertEqual(response.status_code, 200)
+        items = response.json["data"]
+        self.assertEqual([item["form_type"] for item in items], ["airportPickup", "inspection"])
+        self.assertEqual(items[0]["details"]["flight_number"], "CA1234")
+        self.assertEqual(items[1]["details"]["checklist"], ["检查水电"])
+        self.assertEqual(items[1]["user_email"], "schedule@example.com")
+
+        self.assertEqual(db.session.query(RegisterInfo).filter_by(standard_form_id=items[1]["form_id"]).count(), 1)
+
+    def test_invalid_range(self):
+        response = self.admin_get("/admin/schedule?start=2030-05-02&end=2030-05-01")
+        self.assertEqual(response.status_code, 400)
+        response = self.admin_get("/admin/schedule?start=tomorrow")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,23 @@
 import unittest
 from io import BytesIO
 
-from backend.app import create_app
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.test.base import AppTestCase
 from backend.test.utils.test_form_data_factory import TestFormDataFactory
 
 
-class UnifiedFormSubmitTest(unittest.TestCase):
+class UnifiedFormSubmitTest(AppTestCase):
     @classmethod
-    def setUpClass(cls):
-        cls.app = create_app()
-        cls.app.config['TESTING'] = True
-        cls.client = cls.app.test_client()
+    def setUpTestData(cls):
+        cls.headers = cls.auth_headers(cls.create_user("submit@example.com"))
+
+    def submit(self, data):
+        return self.client.post(
+            "/api/form-submit",
+            data=data,
+            headers=self.headers,
+            content_type="multipart/form-data"
+        )
 
     def test_generic_form_submit_success(self):
         """测试统一表单提交接口是否正常接受请求"""
@@ -18,14 +25,11 @@ class UnifiedFormSubmitTest(unittest.TestCase):
             "formType": "test"
         })
 
-        response = self.client.post(
-            "/api/form-submit",
-            data=data,
-            content_type="multipart/form-data"
-        )
+        response = self.submit(data)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json['status'], 'success')
+        self.assertEqual(StandardForm.query.filter_by(email="submit@example.com").count(), 1)
 
     def test_form_submit_with_file_upload(self):
         """测试包含文件上传的表单提交"""
@@ -37,15 +41,18 @@ class UnifiedFormSubmitTest(unittest.TestCase):
         # 添加模拟上传文件
         data["file"] = (BytesIO(b"fake file content"), "test.txt")
 
-        response = self.client.post(
-            "/api/form-submit",
-            data=data,
-            content_type="multipart/form-data"
-        )
+        response = self.submit(data)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json['status'], 'success')
 
+    def test_inspection_submit_creates_google_task(self):
+        response = self.submit(TestFormDataFactory.build())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.google_tasks.created), 1)
+        self.assertIn("Unit 101", self.google_tasks.created[0]["title"])
+
 
 if __name__ == '__main__':
     unittest.main()
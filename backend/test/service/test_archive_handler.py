@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta
+
+from backend.app.models import db
+from backend.app.models.service_obj.inspection_obj import RegisterInfo
+from backend.app.models.service_obj.standard_form import StandardForm, StandardFormArchive
+from backend.app.services.archive_handler import archive_forms
+from backend.test.base import AppTestCase
+
+
+class ArchiveHandlerTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_id = cls.create_user("admin@example.com", roles=["admin"]).fs_uniquifier
+        cls.headers = cls.auth_headers(cls.create_user("archive@example.com"))
+
+    def setUp(self):
+        super().setUp()
+        response = self.client.post("/api/form-submit/batch", json={"forms": [
+            {"formType": "inspection", "formData": {
+                "name": "Old", "address": "1 Hay St", "appointmentDate": "2020-05-01T09:00",
+                "note": "x" * 500}},
+            {"formType": "inspection", "formData": {
+                "name": "Recent", "address": "2 Hay St", "appointmentDate": "2030-05-01T09:00"}},
+            {"formType": "inspection", "formData": {
+                "name": "Pending", "address": "3 Hay St", "appointmentDate": "2020-05-01T09:00"}},
+        ]}, headers=self.headers)
+        self.old_id, self.recent_id, self.pending_id = [item["id"] for item in response.json["results"]]
+
+        # 两条已完成（一条长期未更新），一条长期未更新但仍待处理
+        long_ago = datetime.utcnow() - timedelta(days=400)
+        for form_id, status, updated in ((self.old_id, "completed", long_ago),
+                                         (self.recent_id, "completed", datetime.utcnow()),
+                                         (self.pending_id, "pending", long_ago)):
+            form = db.session.get(StandardForm, form_id)
+            form.status = status
+            form.updated_gmt = updated
+        db.session.commit()
+
+    def test_archive_moves_only_aged_terminal_forms(self):
+        self.assertEqual(archive_forms(days=180, batch_size=1), 1)
+        self.assertEqual(archive_forms(days=180), 0)
+
+        self.assertIsNone(db.session.get(StandardForm, self.old_id))
+        self.assertEqual(db.session.query(StandardFormArchive.id).all(), [(self.old_id,)])
+        self.assertEqual(db.session.query(RegisterInfo).filter_by(standard_form_id=self.old_id).count(), 0)
+        self.assertEqual(StandardForm.query.count(), 2)
+
+    def test_reads_fall_through_to_archive(self):
+        response = self.client.get(f"/api/orders/{self.old_id}", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        before = response.json["data"]
+        listing = self.client.get("/api/orders", headers=self.headers)
+        stats_before = self.client.get("/api/orders/stats", headers=self.headers).json["data"]
+
+        archive_forms(days=180)
+
+        response = self.client.get(f"/api/orders/{self.old_id}", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["data"], before)
+
+        # 列表和统计透明包含已归档订单（归档使版本号递增，ETag 失效）
+        response = self.client.get("/api/orders", headers=self.headers)
+        self.assertNotEqual(response.headers.get("ETag"), listing.headers.get("ETag"))
+        self.assertEqual(response.json["data"], listing.json["data"])
+        self.assertEqual(self.client.get("/api/orders/stats", headers=self.headers).json["data"], stats_before)
+        response = self.client.get("/api/orders?status=completed&sort=service_date", headers=self.headers)
+        self.assertEqual([order["id"] for order in response.json["data"]],
+                         [str(self.old_id), str(self.recent_id)])
+
+        self.login_session(self.admin_id)
+        response = self.client.get(f"/admin/forms/{self.old_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json["archived"])
+        self.assertIn("x" * 500, response.json["form_data"])
+
+        # 管理员列表默认只列活跃表单，include_archived=1 时包含已归档表单
+        ids = [item["id"] for item in self.client.get("/admin/forms").json["results"]]
+        self.assertNotIn(self.old_id, ids)
+        results = self.client.get("/admin/forms?include_archived=1&sort=service_date").json["results"]
+        self.assertEqual([(item["id"], item["archived"]) for item in results],
+                         [(self.pending_id, False), (self.old_id, True), (self.recent_id, False)])
+
+        # 归档表单只读
+        response = self.client.put(f"/admin/forms/{self.old_id}/status", json={"status": "pending"})
+        self.assertEqual(response.status_code, 409)
+        response = self.client.put(f"/admin/forms/{self.old_id}/remark", json={"remark": "x"})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.put("/admin/forms/99999/remark", json={"remark": "x"}).status_code, 404)
+
+    def test_form_query_includes_archived(self):
+        archive_forms(days=180)
+        response = self.client.get("/api/form-query?type=inspection&view=summary", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(form["id"] for form in response.json["data"]),
+                         sorted([self.old_id, self.recent_id, self.pending_id]))
+
+    def test_ids_are_not_reused_after_archiving_newest_forms(self):
+        """归档最新的表单后，新表单不能复用其 id（SQLite 默认复用最大 rowid），否则再次归档主键冲突"""
+        long_ago = datetime.utcnow() - timedelta(days=400)
+        StandardForm.query.update({"status": "completed", "updated_gmt": long_ago})
+        db.session.commit()
+        self.assertEqual(archive_forms(days=180), 3)
+
+        form = StandardForm(email="archive@example.com", form_type="test", form_data="{}", status="completed")
+        db.session.add(form)
+        db.session.commit()
+        self.assertGreater(form.id, max(self.old_id, self.recent_id, self.pending_id))
+
+        form.updated_gmt = long_ago
+        db.session.commit()
+        self.assertEqual(archive_forms(days=180), 1)
+        self.assertEqual(StandardFormArchive.query.count(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import unittest
+
+from backend.app.models import db
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.services.form_reader import ORDER_COLUMNS, select_forms, paginate_rows
+from backend.test.base import AppTestCase
+from backend.test.query_budget import record_queries
+
+
+class FormReaderTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_id = cls.create_user("admin@example.com", roles=["admin"]).fs_uniquifier
+        cls.headers = cls.auth_headers(cls.create_user("reader@example.com"))
+        db.session.add_all([
+            StandardForm("reader@example.com", "test", json.dumps({"n": i}), contact_name=f"Name {i}")
+            for i in range(5)
+        ])
+        db.session.add(StandardForm("other@example.com", "test", "{}"))
+        db.session.commit()
+
+    def test_paginate_rows(self):
+        stmt = select_forms(ORDER_COLUMNS).filter(StandardForm.email == "reader@example.com") \
+            .order_by(StandardForm.id)
+        rows, pagination = paginate_rows(stmt, 2, 2)
+        self.assertEqual([json.loads(row.form_data)["n"] for row in rows], [2, 3])
+        self.assertEqual((pagination["total"], pagination["pages"]), (5, 3))
+        self.assertTrue(pagination["has_next"] and pagination["has_prev"])
+
+        rows, pagination = paginate_rows(stmt, 0, 10)
+        self.assertEqual((len(rows), pagination["page"], pagination["has_next"]), (5, 1, False))
+
+    def test_listing_endpoints(self):
+        response = self.client.get("/api/orders?per_page=2", headers=self.headers)
+        self.assertEqual(len(response.json["data"]), 2)
+        self.assertEqual(response.json["pagination"]["totalItems"], 5)
+        self.assertIn(json.loads(response.json["data"][0]["formData"])["n"], range(5))
+
+        response = self.client.get("/api/form-query?type=test", headers=self.headers)
+        self.assertEqual(len(response.json["data"]), 5)
+
+        self.login_session(self.admin_id)
+        response = self.client.get("/admin/forms?email=reader&name=Name%203")
+        self.assertEqual([item["contact_name"] for item in response.json["results"]], ["Name 3"])
+
+    def test_sparse_fieldsets(self):
+        with record_queries() as log:
+            response = self.client.get("/api/orders?view=summary", headers=self.headers)
+
+        order = response.json["data"][0]
+        self.assertEqual(set(order), {"id", "formType", "status", "remark", "createdAt", "updatedAt"})
+        # 大字段在 SQL 层就没有查询
+        self.assertFalse([sql for sql, _, _ in log.statements if "standard_form" in sql and "form_data" in sql])
+
+        response = self.client.get("/api/orders?fields=status,formData&view=summary", headers=self.headers)
+        self.assertEqual(set(response.json["data"][0]), {"id", "status", "formData"})
+
+        response = self.client.get("/api/form-query?view=summary", headers=self.headers)
+        self.assertNotIn("formData", response.json["data"][0])
+        response = self.client.get("/api/form-query", headers=self.headers)
+        self.assertIn("formData", response.json["data"][0])
+
+        self.assertEqual(self.client.get("/api/orders?fields=password", headers=self.headers).status_code, 400)
+        self.assertEqual(self.client.get("/api/form-query?view=tiny", headers=self.headers).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime
+from io import BytesIO
+
+from werkzeug.datastructures import FileStorage, MultiDict
+
+from backend.app.services.form_schema import normalize_form, FormValidationError
+
+
+class FormSchemaTest(unittest.TestCase):
+
+    def test_inspection_multipart(self):
+        raw = MultiDict([
+            ("formType", "inspection"),
+            ("address", "35 Stirling Hwy"),
+            ("appointmentDate", "2024-12-01T12:00"),
+            ("checklist[]", "检查水电"),
+            ("checklist[]", "检查门窗"),
+            ("name", "Test User"),
+            ("phone", " "),
+            ("remark", "备注"),
+        ])
+        form = normalize_form("inspection", raw)
+
+        # 存储内容保持提交时的字段名和格式
+        self.assertEqual(form.data, {
+            "address": "35 Stirling Hwy",
+            "appointmentDate": "2024-12-01T12:00",
+            "checklist[]": ["检查水电", "检查门窗"],
+            "name": "Test User",
+        })
+        # handler 使用的内容已完成类型转换
+        self.assertEqual(form.values["appointmentDate"], datetime(2024, 12, 1, 12, 0))
+        self.assertEqual(form.values["checklist"], ["检查水电", "检查门窗"])
+
+    def test_json_item_accepts_plain_list_key(self):
+        form = normalize_form("inspection", {
+            "address": "35 Stirling Hwy",
+            "appointmentDate": "2024-12-01T12:00:30",
+            "checklist": "检查水电",
+        })
+        self.assertEqual(form.data["checklist[]"], ["检查水电"])
+        self.assertEqual(form.values["appointmentDate"], datetime(2024, 12, 1, 12, 0, 30))
+
+    def test_missing_and_invalid_fields(self):
+        with self.assertRaisesRegex(FormValidationError, "flight_number, pickup_time"):
+            normalize_form("airportPickup", {"wx_name": "TestWX"})
+        with self.assertRaisesRegex(FormValidationError, "pickup_time"):
+            normalize_form("airportPickup", {"flight_number": "CA1234", "pickup_time": "tomorrow"})
+        with self.assertRaises(FormValidationError):
+            normalize_form("unknown", {})
+
+    def test_multiple_file_fields_keep_all_files(self):
+        files = MultiDict([
+            ("passport", FileStorage(BytesIO(b"a"), "passport.pdf")),
+            ("pay_slips[]", FileStorage(BytesIO(b"b"), "slip1.pdf")),
+            ("pay_slips[]", FileStorage(BytesIO(b"c"), "slip2.pdf")),
+        ])
+        form = normalize_form("rentalApplication", MultiDict([("name", "Test User")]), files)
+        self.assertEqual(form.files["passport"].filename, "passport.pdf")
+        self.assertEqual([f.filename for f in form.files["pay_slips[]"]], ["slip1.pdf", "slip2.pdf"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,18 +2,12 @@ import unittest
 from werkzeug.test import EnvironBuilder
 from werkzeug.wrappers import Request
 
-from backend.app import create_app
 from backend.app.services import inspection_handler
+from backend.test.base import AppTestCase
 from backend.test.utils.test_form_data_factory import TestFormDataFactory
 
 
-class GoogleTaskTest(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        cls.app = create_app()
-        cls.app.config['TESTING'] = True
-        cls.client = cls.app.test_client()
-
+class GoogleTaskTest(AppTestCase):
     def build_request(self, data_dict):
         builder = EnvironBuilder(
             method='POST',
@@ -25,7 +19,7 @@ class GoogleTaskTest(unittest.TestCase):
 
     def test_inspection_handle_success(self):
         """测试 inspection 表单的正常提交流程"""
-        form_data = TestFormDataFactory.build(overrides={"form_type": "inspection"})
+        form_data = TestFormDataFactory.build()
         req = self.build_request(form_data)
 
         with self.app.app_context():
@@ -39,6 +33,7 @@ class GoogleTaskTest(unittest.TestCase):
 
         json_data = response.get_json()
         self.assertTrue(json_data.get("success"))
+        self.assertEqual(len(self.google_tasks.created), 1)
 
         # 如果返回是 Flask Response：
         # self.assertEqual(result.status_code, 200)
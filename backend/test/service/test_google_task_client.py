@@ -0,0 +1,35 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.http import HttpMockSequence
+
+from backend.app.clients import api_google_task
+from backend.config.config import GoogleTasksConfig
+
+
+class GoogleTaskClientTest(unittest.TestCase):
+    def test_service_uses_given_transport(self):
+        http = HttpMockSequence([({"status": "200"}, json.dumps({"id": "task-1"}))])
+        service = api_google_task.build_tasks_service(AnonymousCredentials(), http=http)
+
+        result = service.tasks().insert(tasklist="@default", body={"title": "Inspection"}).execute()
+
+        self.assertEqual(result, {"id": "task-1"})
+
+    def test_invalid_token_does_not_block_on_browser_flow(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(GoogleTasksConfig, "TOKEN_FILE", os.path.join(tmp, "token.json")), \
+                patch.object(GoogleTasksConfig, "INTERACTIVE_AUTH", False), \
+                patch.dict(api_google_task._credentials, clear=True), \
+                patch("google_auth_oauthlib.flow.InstalledAppFlow.from_client_secrets_file") as flow:
+            with self.assertRaises(RuntimeError):
+                api_google_task.load_credentials()
+        flow.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
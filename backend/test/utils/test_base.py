@@ -0,0 +1,52 @@
+import unittest
+
+from backend.app.models import db
+from backend.app.models.auth_obj.user import User
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.test.base import AppTestCase, get_test_app
+
+
+class AppTestCaseIsolationTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_user("shared@example.com")
+
+    def test_1_writes_are_visible_within_test(self):
+        self.create_user("leak@example.com")
+        headers = self.auth_headers(User.query.filter_by(email="leak@example.com").first())
+        response = self.client.post("/api/form-submit", data={"formType": "test"}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StandardForm.query.count(), 1)
+
+    def test_2_previous_test_rolled_back(self):
+        self.assertIsNone(User.query.filter_by(email="leak@example.com").first())
+        self.assertEqual(StandardForm.query.count(), 0)
+        self.assertIsNotNone(User.query.filter_by(email="shared@example.com").first())
+
+    def test_session_rollback_keeps_earlier_commits(self):
+        self.create_user("kept@example.com")
+        db.session.add(User(email="dropped@example.com", password="x"))
+        db.session.flush()
+        db.session.rollback()
+        emails = {user.email for user in User.query.all()}
+        self.assertIn("kept@example.com", emails)
+        self.assertNotIn("dropped@example.com", emails)
+
+    def test_google_tasks_are_faked(self):
+        headers = self.auth_headers(User.query.filter_by(email="shared@example.com").first())
+        response = self.client.post("/api/form-submit", headers=headers, data={
+            "formType": "inspection", "address": "1 Test St", "appointmentDate": "2030-01-01T10:00"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.google_tasks.created), 1)
+
+
+class AppTestCaseClassIsolationTest(AppTestCase):
+    def test_previous_class_data_rolled_back(self):
+        self.assertEqual(User.query.count(), 0)
+
+    def test_app_shared_within_process(self):
+        self.assertIs(self.app, get_test_app())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import unittest
+
+from sqlalchemy import text
+
+from backend.app.models import db
+from backend.app.models.auth_obj.user import User
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.utils.compressed_text import compress_text, decompress_text, is_compressed
+from backend.test.base import AppTestCase
+
+
+class CompressedTextTest(unittest.TestCase):
+    def test_round_trip(self):
+        value = json.dumps({"name": "张三", "address": "35 Stirling Hwy, Perth WA 6009",
+                            "checklist[]": ["检查水电"] * 20}, ensure_ascii=False)
+        encoded = compress_text(value)
+        self.assertTrue(is_compressed(encoded))
+        self.assertLess(len(encoded), len(value.encode("utf-8")))
+        self.assertEqual(decompress_text(encoded), value)
+        self.assertEqual(decompress_text(memoryview(encoded)), value)
+
+    def test_small_values_stay_plain(self):
+        encoded = compress_text('{"name": "a"}')
+        self.assertEqual(encoded, b'{"name": "a"}')
+        self.assertEqual(decompress_text(encoded), '{"name": "a"}')
+
+    def test_legacy_text_values(self):
+        # 迁移前写入的 TEXT 值可能以 str 或 UTF-8 bytes 返回
+        self.assertEqual(decompress_text('{"a": 1}'), '{"a": 1}')
+        self.assertEqual(decompress_text('{"a": "中"}'.encode("utf-8")), '{"a": "中"}')
+
+
+class CompressedColumnTest(AppTestCase):
+    def test_form_data_is_stored_compressed(self):
+        user = User(email="compressed@example.com", password="x")
+        db.session.add(user)
+        data = {"note": "需要接机 " * 100}
+        form = StandardForm(user.email, "airportPickup", json.dumps(data, ensure_ascii=False))
+        db.session.add(form)
+        db.session.commit()
+        form_id = form.id
+
+        raw = db.session.execute(text("SELECT form_data FROM standard_form WHERE id = :id"),
+                                 {"id": form_id}).scalar()
+        self.assertTrue(is_compressed(raw))
+
+        db.session.expire_all()
+        self.assertEqual(json.loads(db.session.get(StandardForm, form_id).form_data), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import gzip
+import unittest
+
+from flask import Flask, jsonify, Response
+
+from backend.app.utils.compression import Compress
+
+
+class CompressionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        app = Flask(__name__)
+        Compress(app)
+
+        @app.route("/large")
+        def large():
+            response = jsonify({"results": [{"id": i, "form_data": "x" * 100} for i in range(100)]})
+            response.set_etag("abc")
+            return response
+
+        @app.route("/small")
+        def small():
+            return jsonify({"ok": True})
+
+        @app.route("/image")
+        def image():
+            return Response(b"\x89PNG" * 1000, mimetype="image/png")
+
+        @app.route("/stream")
+        def stream():
+            return Response((f'{{"row": {i}}}\n' for i in range(1000)), mimetype="application/json")
+
+        cls.client = app.test_client()
+
+    def test_large_json_gzipped(self):
+        response = self.client.get("/large", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(response.headers["ETag"], 'W/"abc"')
+        self.assertIn(b'"form_data"', gzip.decompress(response.data))
+        self.assertEqual(int(response.headers["Content-Length"]), len(response.data))
+
+    def test_no_accept_encoding_not_compressed(self):
+        response = self.client.get("/large")
+        self.assertNotIn("Content-Encoding", response.headers)
+        # 未压缩的可压缩响应同样需要 Vary，共享缓存才不会把它返回给支持压缩的客户端
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+
+    def test_identity_only_client_gets_vary(self):
+        response = self.client.get("/large", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+
+    def test_unsupported_encoding_falls_back(self):
+        response = self.client.get("/large", headers={"Accept-Encoding": "compress, gzip;q=0.5"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+
+    def test_small_response_not_compressed(self):
+        response = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertNotIn("Vary", response.headers)
+
+    def test_binary_mimetype_not_compressed(self):
+        response = self.client.get("/image", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_streamed_response_compressed(self):
+        response = self.client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        body = gzip.decompress(response.data).decode()
+        self.assertEqual(body.count("\n"), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
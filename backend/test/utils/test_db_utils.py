@@ -0,0 +1,68 @@
+import gc
+import os
+import tempfile
+import unittest
+import weakref
+
+from sqlalchemy import create_engine, text
+
+from backend.app.utils import db_utils
+from backend.app.utils.db_utils import configure_engine
+from backend.config.config import DatabaseConfig, normalize_database_url
+
+
+class SqlitePragmaTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'pragma.db')}")
+        configure_engine(self.engine, {"SQLITE_PRAGMAS": DatabaseConfig.SQLITE_PRAGMAS})
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_pragmas_applied_on_connect(self):
+        """每个新连接都应用 WAL / busy_timeout / synchronous 等设置"""
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+            # synchronous: 1 = NORMAL
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)
+            # temp_store: 2 = MEMORY
+            self.assertEqual(conn.execute(text("PRAGMA temp_store")).scalar(), 2)
+            self.assertEqual(conn.execute(text("PRAGMA cache_size")).scalar(), -65536)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "需要 os.fork")
+    def test_pool_reset_in_forked_child(self):
+        """fork 出的子进程不复用父进程的连接"""
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertEqual(self.engine.pool.checkedin(), 1)
+
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if self.engine.pool.checkedin() == 0 else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertEqual(self.engine.pool.checkedin(), 1)
+
+    def test_fork_hook_does_not_keep_engines_alive(self):
+        """fork 钩子只注册一次，引擎释放后不再被引用"""
+        engine = create_engine("sqlite://")
+        configure_engine(engine, {})
+        configure_engine(engine, {})
+        self.assertIn(engine, db_utils._fork_safe_engines)
+        engine_ref = weakref.ref(engine)
+        del engine
+        gc.collect()
+        self.assertIsNone(engine_ref())
+
+
+class DatabaseUrlTest(unittest.TestCase):
+    def test_normalize_postgres_scheme(self):
+        self.assertEqual(normalize_database_url("postgres://u:p@db/app"), "postgresql://u:p@db/app")
+        self.assertEqual(normalize_database_url("sqlite:///app.db"), "sqlite:///app.db")
+
+
+if __name__ == '__main__':
+    unittest.main()
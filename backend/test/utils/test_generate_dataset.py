@@ -0,0 +1,70 @@
+import argparse
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+
+from backend.app.models.service_obj.standard_form import FormStatus, FormType
+from backend.app.services.form_schema import normalize_form
+from backend.scripts.generate_dataset import DatasetGenerator, generate_dataset
+from backend.test.base import file_app_config
+
+END = datetime(2026, 1, 1)
+
+
+class DatasetGeneratorTest(unittest.TestCase):
+    def test_same_seed_generates_same_forms(self):
+        first = [DatasetGenerator(7, 100, END, 365, "/uploads").form(i)[0] for i in range(50)]
+        second = [DatasetGenerator(7, 100, END, 365, "/uploads").form(i)[0] for i in range(50)]
+        other = [DatasetGenerator(8, 100, END, 365, "/uploads").form(i)[0] for i in range(50)]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_forms_match_schema(self):
+        generator = DatasetGenerator(1, 100, END, 365, "/uploads")
+        rows = [generator.form(i)[0] for i in range(500)]
+
+        self.assertEqual({row["form_type"] for row in rows}, set(FormType.values()))
+        self.assertEqual({row["status"] for row in rows}, set(FormStatus.values()))
+        for row in rows:
+            normalize_form(row["form_type"], json.loads(row["form_data"]))  # 必填字段齐全、日期可解析
+            self.assertLessEqual(row["created_gmt"], row["updated_gmt"])
+            self.assertLessEqual(row["updated_gmt"], END)
+            if row["form_type"] == FormType.INSPECTION.value:
+                self.assertIsNotNone(row["service_date"])
+                self.assertTrue(row["address"])
+
+
+class GenerateDatasetTest(unittest.TestCase):
+    def test_populates_database(self):
+        from backend.app import create_app
+        from backend.app.models import db
+        from backend.app.models.auth_obj.user import User
+        from backend.app.models.service_obj.inspection_obj import RegisterInfo
+        from backend.app.models.service_obj.standard_form import StandardForm
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = file_app_config(tmp)
+            args = argparse.Namespace(
+                database_url=config["SQLALCHEMY_DATABASE_URI"], log_dir=tmp, create_tables=True,
+                users=20, forms=300, role_depth=3, staff_ratio=0.5, days=365, end_date="2026-01-01", seed=3,
+                batch_size=128, password="x" * 8, write_attachments=False, attachment_bytes=16,
+            )
+            with redirect_stdout(StringIO()):
+                generate_dataset(args)
+
+            app = create_app(config)
+            with app.app_context():
+                self.assertEqual(User.query.count(), 20)
+                self.assertEqual(StandardForm.query.count(), 300)
+                inspections = StandardForm.query.filter_by(form_type=FormType.INSPECTION.value).count()
+                self.assertEqual(RegisterInfo.query.count(), inspections)
+                # 每个用户都持有角色链最底层角色，继承到最顶层
+                self.assertTrue(User.query.first().has_role("dataset_role_0"))
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import gc
+import os
+import runpy
+import unittest
+from unittest.mock import MagicMock, patch
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "gunicorn.conf.py")
+
+
+def load_config(**env):
+    with patch.dict(os.environ, env):
+        os.environ.pop("DB_POOL_SIZE", None)
+        try:
+            config = runpy.run_path(CONFIG_FILE)
+            config["db_pool_size"] = os.environ.get("DB_POOL_SIZE")
+            return config
+        finally:
+            gc.enable()
+
+
+class GunicornConfTest(unittest.TestCase):
+    def test_sync_defaults(self):
+        config = load_config(GUNICORN_WORKER_CLASS="sync")
+        self.assertEqual(config["workers"], os.cpu_count() * 2 + 1)
+        self.assertEqual(config["threads"], 1)
+        self.assertTrue(config["preload_app"])
+        self.assertGreater(config["max_requests_jitter"], 0)
+
+    def test_gthread_sizes_pool_for_threads(self):
+        config = load_config(GUNICORN_WORKER_CLASS="gthread", GUNICORN_THREADS="6", GUNICORN_WORKERS="3")
+        self.assertEqual((config["workers"], config["threads"]), (3, 6))
+        self.assertEqual(config["db_pool_size"], "6")
+
+    def test_post_fork_disposes_engines(self):
+        config = load_config()
+        server = MagicMock()
+        with patch("backend.app.utils.db_utils.dispose_engines") as dispose:
+            config["post_fork"](server, MagicMock())
+        dispose.assert_called_once_with(server.app.wsgi.return_value)
+
+
+if __name__ == '__main__':
+    unittest.main()
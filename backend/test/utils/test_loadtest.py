@@ -0,0 +1,45 @@
+import unittest
+
+from backend.benchmarks.loadtest import DEFAULT_MIX, encode_multipart, parse_mix, summarize
+
+
+class LoadTestHelpersTest(unittest.TestCase):
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix("orders=3, login=1"), {"orders": 3, "login": 1})
+        self.assertEqual(parse_mix(",".join(f"{name}=1" for name in DEFAULT_MIX)).keys(), DEFAULT_MIX.keys())
+        with self.assertRaises(ValueError):
+            parse_mix("unknown=1")
+        with self.assertRaises(ValueError):
+            parse_mix("orders=0")
+
+    def test_encode_multipart(self):
+        body, content_type = encode_multipart({"formType": "inspection"}, [("attachment", "a.jpg", b"\x00\x01")])
+        boundary = content_type.split("boundary=")[1]
+        self.assertTrue(body.startswith(f"--{boundary}\r\n".encode()))
+        self.assertTrue(body.endswith(f"--{boundary}--\r\n".encode()))
+        self.assertIn(b'name="formType"\r\n\r\ninspection\r\n', body)
+        self.assertIn(b'filename="a.jpg"', body)
+        self.assertIn(b"\x00\x01\r\n", body)
+
+    def test_summarize(self):
+        samples = {
+            "GET /api/orders": [(0.010, 200)] * 98 + [(0.500, 500), (1.0, 0)],
+            "POST /api/login": [(0.2, 200), (0.4, 302)],
+        }
+        report = summarize(samples, duration=10)
+
+        orders = report["GET /api/orders"]
+        self.assertEqual(orders["requests"], 100)
+        self.assertEqual(orders["throughput_rps"], 10)
+        self.assertEqual(orders["p50_ms"], 10)
+        self.assertEqual(orders["p99_ms"], 1000)
+        self.assertEqual(orders["errors"], 2)
+        self.assertEqual(orders["status_codes"], {"0": 1, "200": 98, "500": 1})
+        # 重定向（未登录）也算错误
+        self.assertEqual(report["POST /api/login"]["error_rate"], 0.5)
+        self.assertEqual(report["_total"]["requests"], 102)
+        self.assertEqual(report["_total"]["errors"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from backend.app.utils.memory_diagnostics import memory_diagnostics
+from backend.test.base import AppTestCase
+
+
+class MemoryDiagnosticsTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_uniquifier = cls.create_user("memory-admin@example.com", roles=["admin"]).fs_uniquifier
+        cls.user_headers = cls.auth_headers(cls.create_user("memory-user@example.com"))
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.diag_dir = tmp.name
+        original = {key: self.app.config[key] for key in ("MEMORY_DIAG_DIR", "MEMORY_MAX_SNAPSHOTS")}
+        self.app.config["MEMORY_DIAG_DIR"] = tmp.name
+        self.addCleanup(self.app.config.update, original)
+        self.addCleanup(memory_diagnostics.stop)
+        self.login_session(self.admin_uniquifier)
+
+    def snapshot(self, **data):
+        response = self.client.post("/admin/diagnostics/memory/snapshots", json=data)
+        self.assertEqual(response.status_code, 200, response.json)
+        return response.json["data"]
+
+    def test_status_reports_process_memory(self):
+        user = self.create_user("alive@example.com")
+        data = self.client.get("/admin/diagnostics/memory?objects=1").json["data"]
+        self.assertEqual(data["pid"], os.getpid())
+        self.assertFalse(data["tracing"])
+        self.assertGreater(data["peak_rss"], 0)
+        self.assertGreaterEqual(data["orm_objects"]["User"], 1)
+        self.assertEqual(user.email, "alive@example.com")
+
+    def test_snapshot_diff_attributes_growth(self):
+        self.assertEqual(self.client.post("/admin/diagnostics/memory/tracing", json={"frames": 2}).status_code, 200)
+        self.assertTrue(tracemalloc.is_tracing())
+        before = self.snapshot(label="before")["snapshot"]["id"]
+        self.retained = [bytearray(1024) for _ in range(2000)]  # 约 2MB
+        after = self.snapshot(label="after")["snapshot"]["id"]
+
+        diff = self.client.get(f"/admin/diagnostics/memory/diff?from={before}&to={after}&group_by=filename").json
+        self.assertTrue(diff["success"])
+        self.assertGreater(diff["data"]["size_diff"], 2 * 1024 * 1024)
+        top = diff["data"]["stats"][0]
+        self.assertIn("test_memory_diagnostics.py", top["location"][0])
+        self.assertGreater(top["size_diff"], 2 * 1024 * 1024)
+
+        stats = self.client.get(f"/admin/diagnostics/memory/snapshots/{after}?limit=5").json["data"]["stats"]
+        self.assertEqual(len(stats), 5)
+
+    def test_dump_writes_report_and_snapshot(self):
+        self.client.post("/admin/diagnostics/memory/tracing")
+        data = self.snapshot(dump=True, limit=3)
+        json_path, snapshot_path = data["files"]
+        self.assertTrue(os.path.isfile(json_path))
+        self.assertEqual(os.path.dirname(json_path), self.diag_dir)
+        self.assertIsInstance(tracemalloc.Snapshot.load(snapshot_path), tracemalloc.Snapshot)
+
+        status_files = self.client.get("/admin/diagnostics/memory?dump=1").json["data"]["files"]
+        self.assertTrue(os.path.isfile(status_files[0]))
+
+    def test_only_recent_snapshots_kept(self):
+        self.app.config["MEMORY_MAX_SNAPSHOTS"] = 2
+        self.client.post("/admin/diagnostics/memory/tracing")
+        ids = [self.snapshot()["snapshot"]["id"] for _ in range(3)]
+        status = self.client.get("/admin/diagnostics/memory").json["data"]
+        self.assertEqual([item["id"] for item in status["snapshots"]], ids[1:])
+        self.assertEqual(self.client.get(f"/admin/diagnostics/memory/snapshots/{ids[0]}").status_code, 404)
+
+    def test_stop_discards_snapshots(self):
+        self.client.post("/admin/diagnostics/memory/tracing")
+        self.snapshot()
+        data = self.client.delete("/admin/diagnostics/memory/tracing").json["data"]
+        self.assertFalse(data["tracing"])
+        self.assertEqual(data["snapshots"], [])
+
+    def test_errors(self):
+        self.assertEqual(self.client.post("/admin/diagnostics/memory/snapshots").status_code, 409)
+        self.client.post("/admin/diagnostics/memory/tracing")
+        self.assertEqual(self.client.post("/admin/diagnostics/memory/snapshots",
+                                          json={"group_by": "module"}).status_code, 400)
+        self.assertEqual(self.client.get("/admin/diagnostics/memory/diff?from=98&to=99").status_code, 404)
+
+    def test_invalid_frames_rejected(self):
+        """frames 不是正整数时返回 400，不启动追踪"""
+        for frames in ("abc", 0, -1, 1.5, [2], True):
+            response = self.client.post("/admin/diagnostics/memory/tracing", json={"frames": frames})
+            self.assertEqual(response.status_code, 400, frames)
+        self.assertFalse(self.client.get("/admin/diagnostics/memory").json["data"]["tracing"])
+        self.assertEqual(self.client.get("/admin/diagnostics/memory/snapshots/1?limit=-5").status_code, 400)
+
+    def test_requires_admin(self):
+        self.client = self.app.test_client()
+        response = self.client.get("/admin/diagnostics/memory", headers=self.user_headers)
+        self.assertNotEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
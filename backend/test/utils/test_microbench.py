@@ -0,0 +1,28 @@
+import unittest
+
+from backend.benchmarks.microbench import BENCHMARKS, compare_results, measure, run
+
+
+class MicrobenchTest(unittest.TestCase):
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = {"a[small]": {"median_us": 10.0}, "b[small]": {"median_us": 10.0}, "gone[small]": {"median_us": 1}}
+        current = {"a[small]": {"median_us": 11.0}, "b[small]": {"median_us": 13.0}, "new[small]": {"median_us": 1}}
+
+        rows = compare_results(baseline, current, threshold=0.15)
+
+        self.assertEqual([(name, regressed) for name, _, _, _, regressed in rows],
+                         [("a[small]", False), ("b[small]", True)])
+        self.assertAlmostEqual(rows[1][3], 0.3)
+
+    def test_measure_calibrates_loops(self):
+        samples, loops = measure(lambda: None, min_time=0.001, repeat=3)
+        self.assertEqual(len(samples), 3)
+        self.assertGreater(loops, 1)
+
+    def test_all_benchmarks_run(self):
+        results = run(["small"], min_time=0, repeat=1)
+        self.assertEqual(set(results), {f"{name}[small]" for name in BENCHMARKS})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+from backend.app.utils.offload import cooperative_runtime, run_blocking
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..", "..", "..")
+
+# 在独立进程中 monkey patch（不能 patch 测试进程本身）：run_blocking 应在系统线程中执行，且保留 Flask 上下文
+_GEVENT_CHECK = """
+from gevent import monkey
+monkey.patch_all()
+import threading
+from flask import Flask, current_app
+from backend.app.utils.offload import cooperative_runtime, run_blocking
+
+app = Flask("offload")
+with app.app_context():
+    worker = run_blocking(lambda: (threading.get_native_id(), current_app.name))
+print(cooperative_runtime(), worker[0] != threading.get_native_id(), worker[1])
+"""
+
+
+class OffloadTest(unittest.TestCase):
+    def test_runs_inline_without_cooperative_runtime(self):
+        self.assertIsNone(cooperative_runtime())
+        result = run_blocking(lambda a, b=0: (threading.get_ident(), a + b), 1, b=2)
+        self.assertEqual(result, (threading.get_ident(), 3))
+
+    def test_propagates_exceptions(self):
+        with self.assertRaises(ZeroDivisionError):
+            run_blocking(lambda: 1 / 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("gevent"), "gevent 未安装")
+    def test_gevent_runs_in_native_thread(self):
+        result = subprocess.run([sys.executable, "-c", _GEVENT_CHECK], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ["gevent", "True", "offload"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from backend.app.utils.profiling import _StackSampler, to_collapsed, to_speedscope
+from backend.test.base import AppTestCase
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class StackSamplerTest(unittest.TestCase):
+    def test_samples_target_thread(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy, args=(stop,))
+        worker.start()
+        sampler = _StackSampler(worker.ident, 0.001)
+        sampler.start()
+        time.sleep(0.05)
+        sampler.stop()
+        stop.set()
+        worker.join()
+
+        self.assertGreater(sum(sampler.stacks.values()), 0)
+        self.assertIn("_busy (test_profiling.py:", to_collapsed(sampler.stacks))
+
+        speedscope = to_speedscope(sampler.stacks, "busy", 1)
+        profile = speedscope["profiles"][0]
+        self.assertEqual(len(profile["samples"]), len(profile["weights"]))
+        self.assertIn("_busy", {frame["name"] for frame in speedscope["shared"]["frames"]})
+
+
+class RequestProfilerTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_uniquifier = cls.create_user("profile-admin@example.com", roles=["admin"]).fs_uniquifier
+        cls.user_headers = cls.auth_headers(cls.create_user("profile-user@example.com"))
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.profile_dir = tmp.name
+        original = dict(self.app.config)
+        self.app.config.update(PROFILE_DIR=tmp.name, PROFILE_INTERVAL_MS=1)
+        self.addCleanup(self.app.config.update, {key: original[key] for key in ("PROFILE_DIR", "PROFILE_INTERVAL_MS",
+                                                                              "PROFILE_MAX_FILES")})
+
+    def test_admin_request_is_profiled(self):
+        self.login_session(self.admin_uniquifier)
+        response = self.client.get("/admin/users?email=x", headers={"X-Profile": "1"})
+        self.assertEqual(response.status_code, 200)
+        profile_id = response.headers["X-Profile-Id"]
+
+        with open(os.path.join(self.profile_dir, profile_id + ".meta.json"), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.assertEqual(meta["path"], "/admin/users")
+        self.assertEqual(meta["query_string"], "email=x")
+        self.assertEqual(meta["user"], "profile-admin@example.com")
+        self.assertEqual(meta["status"], 200)
+
+        listing = self.client.get("/admin/profiles").json["data"]
+        self.assertEqual([item["id"] for item in listing], [profile_id])
+
+        speedscope = self.client.get(f"/admin/profiles/{profile_id}")
+        self.assertEqual(speedscope.status_code, 200)
+        speedscope.direct_passthrough = False
+        self.assertEqual(json.loads(speedscope.data)["profiles"][0]["type"], "sampled")
+        speedscope.close()
+        collapsed = self.client.get(f"/admin/profiles/{profile_id}?format=collapsed")
+        self.assertEqual(collapsed.status_code, 200)
+        self.assertEqual(collapsed.mimetype, "text/plain")
+        collapsed.close()
+
+    def test_query_flag_triggers_profile(self):
+        self.login_session(self.admin_uniquifier)
+        response = self.client.get("/admin/roles?__profile=1")
+        self.assertIn("X-Profile-Id", response.headers)
+
+    def test_not_triggered_without_flag(self):
+        self.login_session(self.admin_uniquifier)
+        response = self.client.get("/admin/users")
+        self.assertNotIn("X-Profile-Id", response.headers)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_non_admin_flag_ignored(self):
+        response = self.client.get("/api/orders?__profile=1", headers={**self.user_headers, "X-Profile": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response.headers)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_only_recent_profiles_kept(self):
+        self.app.config["PROFILE_MAX_FILES"] = 2
+        self.login_session(self.admin_uniquifier)
+        ids = [self.client.get("/admin/roles", headers={"X-Profile": "1"}).headers["X-Profile-Id"] for _ in range(3)]
+        listing = self.client.get("/admin/profiles").json["data"]
+        self.assertEqual(len(listing), 2)
+        self.assertNotIn(min(ids), {item["id"] for item in listing})
+        self.assertEqual(len(os.listdir(self.profile_dir)), 2 * 3)
+
+    def test_unknown_profile_returns_404(self):
+        self.login_session(self.admin_uniquifier)
+        self.assertEqual(self.client.get("/admin/profiles/..%2Fapp").status_code, 404)
+        self.assertEqual(self.client.get("/admin/profiles/20300101T000000-0000abcd").status_code, 404)
+
+    def test_listing_requires_admin(self):
+        self.assertNotEqual(self.client.get("/admin/profiles", headers=self.user_headers).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
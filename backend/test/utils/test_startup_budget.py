@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from backend.benchmarks.importtime_report import (
+    PROJECT_ROOT, parse_importtime, profile_imports, total_import_ms, cold_start_seconds
+)
+
+# 预算按当前实测（导入约 0.6s，冷启动约 0.6s）留出余量，较慢的机器上可用环境变量放宽
+IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", 900))
+COLD_START_BUDGET_S = float(os.getenv("STARTUP_COLD_START_BUDGET_S", 1.0))
+
+# 只在用到时才导入的可选依赖
+LAZY_MODULES = {"googleapiclient", "google_auth_oauthlib", "google", "captcha", "PIL", "alembic", "flask_migrate"}
+
+
+class StartupBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.entries = profile_imports()
+
+    def test_parse_importtime(self):
+        entries = parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     zipimport\n"
+            "import time:       300 |        420 |   backend.app\n"
+        )
+        self.assertEqual([(entry.module, entry.cumulative_us, entry.depth) for entry in entries],
+                         [("zipimport", 120, 2), ("backend.app", 420, 1)])
+
+    def test_optional_integrations_are_lazy(self):
+        imported = {entry.module.split(".")[0] for entry in self.entries}
+        self.assertEqual(imported & LAZY_MODULES, set())
+
+    def test_import_budget(self):
+        self.assertLess(total_import_ms(self.entries), IMPORT_BUDGET_MS)
+
+    def test_cold_start_budget(self):
+        self.assertLess(cold_start_seconds(), COLD_START_BUDGET_S)
+
+    def test_config_import_has_no_output(self):
+        result = subprocess.run([sys.executable, "-c", "import backend.config.config"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual((result.stdout, result.stderr), ("", ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
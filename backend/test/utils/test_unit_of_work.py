@@ -0,0 +1,86 @@
+import io
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.models.service_obj.inspection_obj import RegisterInfo
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.services.standard_form_handler import email_to_folder
+from backend.test.base import AppTestCase
+
+
+class UnitOfWorkSubmitTest(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.headers = cls.auth_headers(cls.create_user("uow@example.com"))
+
+    def setUp(self):
+        super().setUp()
+        # 上传目录为进程内共享且不随事务回滚，测试结束时删除本用户的子目录
+        self.upload_folder = os.path.join(current_app.config["UPLOAD_FOLDER"], email_to_folder("uow@example.com"))
+        self.addCleanup(shutil.rmtree, self.upload_folder, True)
+        self.commits = 0
+        event.listen(Session, "after_commit", self._count_commit)
+
+    def tearDown(self):
+        event.remove(Session, "after_commit", self._count_commit)
+        super().tearDown()
+
+    def _count_commit(self, session):
+        self.commits += 1
+
+    def submit(self):
+        return self.client.post("/api/form-submit", data={
+            "formType": "inspection",
+            "address": "35 Stirling Hwy",
+            "appointmentDate": "2030-05-02T10:00",
+            "attachment": (io.BytesIO(b"photo"), "photo.jpg"),
+        }, headers=self.headers, content_type="multipart/form-data")
+
+    def uploaded_files(self):
+        return [name for _, _, names in os.walk(self.upload_folder) for name in names]
+
+    def count_forms(self):
+        return StandardForm.query.filter_by(email="uow@example.com").count()
+
+    def count_projections(self):
+        return RegisterInfo.query.join(StandardForm, RegisterInfo.standard_form_id == StandardForm.id) \
+            .filter(StandardForm.email == "uow@example.com").count()
+
+    @patch('backend.app.services.inspection_handler.create_google_task')
+    def test_submit_commits_once_before_external_call(self, mock_task):
+        def check_committed(body):
+            # 外部调用发生时表单和投影已经提交
+            self.assertEqual(self.commits, 1)
+        mock_task.side_effect = check_committed
+
+        response = self.submit()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.commits, 1)
+        mock_task.assert_called_once()
+
+    @patch('backend.app.services.inspection_handler.create_google_task', side_effect=RuntimeError("google down"))
+    def test_external_failure_keeps_saved_form(self, mock_task):
+        response = self.submit()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.count_forms(), 1)
+        self.assertEqual(self.count_projections(), 1)
+
+    @patch('backend.app.services.inspection_handler.create_google_task')
+    def test_failed_transaction_rolls_back_everything(self, mock_task):
+        with patch('backend.app.services.standard_form_handler.project_forms', side_effect=RuntimeError("boom")):
+            response = self.submit()
+
+        self.assertEqual(response.status_code, 500)
+        mock_task.assert_not_called()
+        self.assertEqual(self.uploaded_files(), [])
+        self.assertEqual(self.count_forms(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import threading
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import patch
+
+from backend.app.models import db
+from backend.app.models.service_obj.standard_form import StandardForm
+from backend.app.utils.write_coordinator import WriteCoordinator, run_write
+from backend.test.base import FileDatabaseTestCase
+
+
+class WriteCoordinatorTest(FileDatabaseTestCase):
+    # 写线程使用独立引擎，需要真实数据库文件
+    app_config = {"WRITE_COORDINATION": True, "WRITE_BATCH_WINDOW_MS": 20}
+
+    @staticmethod
+    def insert_form(session, email):
+        form = StandardForm(email=email, form_type="test", form_data="{}")
+        session.add(form)
+        session.flush()
+        return form.id
+
+    def test_concurrent_writes_group_committed(self):
+        """多个线程的写入都提交成功，并各自拿到返回值"""
+        ids = []
+
+        def submit(i):
+            with self.app.app_context():
+                ids.append(run_write(self.insert_form, f"writer{i}@example.com"))
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(set(ids)), 20)
+        with self.app.app_context():
+            count = StandardForm.query.filter(StandardForm.email.like("writer%")).count()
+        self.assertEqual(count, 20)
+
+    def test_failed_unit_does_not_affect_batch(self):
+        """单个写入失败只回滚自己的 SAVEPOINT，异常交还给调用方"""
+        def broken(session):
+            session.add(StandardForm(email="broken@example.com", form_type="test", form_data="{}"))
+            session.flush()
+            raise ValueError("boom")
+
+        errors = []
+
+        def submit_broken():
+            with self.app.app_context():
+                try:
+                    run_write(broken)
+                except ValueError as e:
+                    errors.append(e)
+
+        def submit_ok():
+            with self.app.app_context():
+                run_write(self.insert_form, "survivor@example.com")
+
+        threads = [threading.Thread(target=submit_broken), threading.Thread(target=submit_ok)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(errors), 1)
+        with self.app.app_context():
+            self.assertEqual(StandardForm.query.filter_by(email="broken@example.com").count(), 0)
+            self.assertEqual(StandardForm.query.filter_by(email="survivor@example.com").count(), 1)
+
+    def test_inline_mode_commits_in_request_session(self):
+        with self.app.app_context():
+            self.app.config["WRITE_COORDINATION"] = False
+            try:
+                form_id = run_write(self.insert_form, "inline@example.com")
+            finally:
+                self.app.config["WRITE_COORDINATION"] = True
+            self.assertIsNotNone(db.session.get(StandardForm, form_id))
+
+    def test_writer_restarts_after_crash(self):
+        """写线程异常退出后排队的写入立即失败，下一次写入重新启动写线程"""
+        coordinator = WriteCoordinator()
+        with self.app.app_context():
+            with patch.object(WriteCoordinator, "_create_writer_engine", side_effect=RuntimeError("no engine")):
+                with self.assertRaises(RuntimeError):
+                    coordinator.run(self.insert_form, "crash@example.com")
+            form_id = coordinator.run(self.insert_form, "restarted@example.com")
+            self.assertIsNotNone(db.session.get(StandardForm, form_id))
+            self.assertEqual(StandardForm.query.filter_by(email="crash@example.com").count(), 0)
+
+    def test_timed_out_write_is_cancelled(self):
+        """等待超时的写入被取消，不会在调用方收到错误之后提交"""
+        coordinator = WriteCoordinator()
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(session):
+            started.set()
+            release.wait(5)
+            return self.insert_form(session, "blocking@example.com")
+
+        def submit_blocking():
+            with self.app.app_context():
+                coordinator.run(blocking)
+
+        blocker = threading.Thread(target=submit_blocking)
+        blocker.start()
+        self.assertTrue(started.wait(5))
+        with self.app.app_context():
+            self.app.config["WRITE_TIMEOUT"] = 0.2
+            try:
+                with self.assertRaises(FutureTimeoutError):
+                    coordinator.run(self.insert_form, "timeout@example.com")
+            finally:
+                self.app.config["WRITE_TIMEOUT"] = 30
+                release.set()
+                blocker.join()
+            coordinator.run(self.insert_form, "after-timeout@example.com")
+            self.assertEqual(StandardForm.query.filter_by(email="blocking@example.com").count(), 1)
+            self.assertEqual(StandardForm.query.filter_by(email="timeout@example.com").count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -97,6 +97,9 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # SQLite 不支持大部分 ALTER TABLE，使用 batch 模式（复制表）生成迁移；
+        # PostgreSQL 等数据库直接生成普通的 ALTER 语句
+        conf_args.setdefault("render_as_batch", connection.dialect.name == "sqlite")
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
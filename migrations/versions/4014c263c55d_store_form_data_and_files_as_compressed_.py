@@ -0,0 +1,60 @@
+"""Store form_data and files as compressed blobs
+
+Revision ID: 4014c263c55d
+Revises: d2a7b2eae474
+Create Date: 2026-10-19 02:30:02.725104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4014c263c55d'
+down_revision = 'd2a7b2eae474'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = (('form_data', False), ('files', True))
+
+
+def upgrade():
+    # 列类型改为 BLOB / bytea，已有的 JSON 文本原样保留（UTF-8），CompressedText 读取时兼容；
+    # 压缩历史数据见 backend/scripts/compress_form_data.py（分批在线改写）
+    with op.batch_alter_table('standard_form', schema=None) as batch_op:
+        for column, nullable in COLUMNS:
+            batch_op.alter_column(column,
+                   existing_type=sa.TEXT(),
+                   type_=sa.LargeBinary(),
+                   existing_nullable=nullable,
+                   postgresql_using=f"convert_to({column}, 'UTF8')")
+
+
+def downgrade():
+    from backend.app.utils.compressed_text import decompress_text, is_compressed
+
+    # 先把已压缩的值解压回 UTF-8，再改回 TEXT
+    connection = op.get_bind()
+    table = sa.table('standard_form', sa.column('id', sa.Integer()),
+                     *(sa.column(column, sa.LargeBinary()) for column, _ in COLUMNS))
+    for row in connection.execute(sa.select(table)).all():
+        values = {
+            column: decompress_text(row[index + 1]).encode('utf-8')
+            for index, (column, _) in enumerate(COLUMNS)
+            if row[index + 1] is not None and is_compressed(bytes(row[index + 1]))
+        }
+        if values:
+            connection.execute(table.update().where(table.c.id == row.id).values(**values))
+
+    with op.batch_alter_table('standard_form', schema=None) as batch_op:
+        for column, nullable in COLUMNS:
+            batch_op.alter_column(column,
+                   existing_type=sa.LargeBinary(),
+                   type_=sa.TEXT(),
+                   existing_nullable=nullable,
+                   postgresql_using=f"convert_from({column}, 'UTF8')")
+
+    # SQLite 重建表时保留 BLOB 存储类型，统一转回 TEXT
+    for column, _ in COLUMNS:
+        op.execute(f'UPDATE standard_form SET {column} = CAST({column} AS TEXT) WHERE {column} IS NOT NULL')
@@ -0,0 +1,44 @@
+"""use AUTOINCREMENT ids for standard_form on SQLite
+
+Revision ID: 9f41c7a2e6b8
+Revises: cc7d74d48991
+Create Date: 2026-10-19 11:42:37.864210
+
+SQLite 的 INTEGER PRIMARY KEY 会复用已删除的最大 rowid：最新的表单被归档后，新表单拿到相同 id，
+再次归档时与 standard_form_archive 主键冲突。重建表加上 AUTOINCREMENT，
+并把序列起点设为两张表中最大的 id。PostgreSQL 的序列不复用 id，无需处理
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9f41c7a2e6b8'
+down_revision = 'cc7d74d48991'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # 不修改任何列：recreate='always' 强制按新的表参数重建表（SQLite 无法 ALTER 出 AUTOINCREMENT）
+    with op.batch_alter_table('standard_form', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+
+    # 重建后序列只记到 standard_form 现有的最大 id，已归档的更大 id 仍可能被复用
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'standard_form'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'standard_form', "
+        "max(coalesce((SELECT max(id) FROM standard_form), 0), "
+        "coalesce((SELECT max(id) FROM standard_form_archive), 0))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    with op.batch_alter_table('standard_form', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
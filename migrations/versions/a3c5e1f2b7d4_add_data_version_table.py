@@ -0,0 +1,32 @@
+"""Add data_version table for conditional GET
+
+Revision ID: a3c5e1f2b7d4
+Revises: 319814709689
+Create Date: 2026-10-19 10:12:40.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e1f2b7d4'
+down_revision = '319814709689'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_version',
+    sa.Column('scope', sa.String(length=160), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_gmt', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_gmt', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_data_version')),
+    sa.UniqueConstraint('scope', name=op.f('uq_data_version_scope'))
+    )
+
+
+def downgrade():
+    op.drop_table('data_version')